@@ -11,11 +11,11 @@ class SeparatorAdmin(admin.ModelAdmin):
 
 
 class ColumnAdmin(admin.ModelAdmin):
-    list_display = ('id', 'name', 'minimal', 'maximal', 'data_type', 'schema')
+    list_display = ('id', 'name', 'minimal', 'maximal', 'data_type', 'unique', 'schema')
     list_display_links = ('id', 'name')
     search_fields = ('name',)
     list_filter = ('schema__owner', 'data_type', 'schema', 'data_type')
-    fields = ('name', 'minimal', 'maximal', 'data_type', 'schema')
+    fields = ('name', 'minimal', 'maximal', 'data_type', 'unique', 'schema')
 
 
 class SchemaAdmin(admin.ModelAdmin):
@@ -38,13 +38,13 @@ class DataSetAdmin(admin.ModelAdmin):
     list_display_links = ('id',)
     search_fields = ('schema', 'schema__owner')
     list_filter = ('time_create', 'finished')
-    fields = ('schema', 'schema__owner', 'time_create', 'file', 'finished')
-    readonly_fields = ('schema', 'time_create', 'file', 'finished')
+    fields = ('schema', 'schema__owner', 'time_create', 'file', 'finished', 'time_started', 'time_finished', 'error')
+    readonly_fields = ('schema', 'time_create', 'file', 'finished', 'time_started', 'time_finished', 'error')
 
 
 class SourceDataAdmin(admin.ModelAdmin):
-    list_display = ('id', 'source_type', 'source_data')
+    list_display = ('id', 'source_type', 'source_data', 'weight')
     list_display_links = ('id', 'source_data')
     search_fields = ('source_data',)
     list_filter = ('source_type',)
-    fields = ('source_type', 'source_data')
+    fields = ('source_type', 'source_data', 'weight')
@@ -1,9 +1,10 @@
 from functools import wraps
 
-from django.http import JsonResponse
+from django.http import JsonResponse, Http404
 from django.core.exceptions import ObjectDoesNotExist
 
 from mainapp.models import Schema
+from mainapp.pagination import paginate_by_keyset
 
 
 def base_view_for_ajax(allowed_method):
@@ -33,3 +34,24 @@ def base_view_for_ajax(allowed_method):
             return view_func(request, schema)
         return wrapped
     return wrapper
+
+
+class KeysetPaginationMixin:
+    """
+    Mixin for list views, which shows only the first page of list, paginated by keyset.
+    Next pages are loaded by ajax, starting from cursor 'next_cursor' in context.
+    """
+    keyset_ordering = ('pk',)
+    page_size = 50
+
+    def get_page(self, queryset):
+        try:
+            return paginate_by_keyset(queryset, self.keyset_ordering, self.page_size, self.request.GET.get('cursor'))
+        except ValueError:
+            raise Http404('Invalid cursor')
+
+    def get_context_data(self, *, object_list=None, **kwargs):
+        object_list, next_cursor = self.get_page(self.object_list if object_list is None else object_list)
+        context = super().get_context_data(object_list=object_list, **kwargs)
+        context['next_cursor'] = next_cursor
+        return context
@@ -0,0 +1,320 @@
+"""
+Benchmarks of generating of data sets files, used by benchmarking management commands.
+
+Every measurement is repeated several times and the best time is taken, as noise only makes code slower.
+Results of generation benchmarks are plain dicts, so they could be saved to json and compared between commits.
+"""
+import csv
+import io
+import os
+import platform
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from .data_generators.compression import open_compressed
+from .data_generators.data_generators import RowDataGenerator
+from .data_generators.file_generation import iter_csv_chunks, iter_csv_rows_chunks, format_csv_header, \
+    generate_csv_file, FILE_SETTINGS
+from .models import Column, SourceData, Schema, Separator, DataSet
+
+
+def get_representative_columns() -> list[Column]:
+    """
+    Returns not saved columns of every data type, as representative schema for benchmarks.
+    Columns, which need source data, absent in db, are skipped.
+    """
+    limits = {Column.DataType.INTEGER: (1, 100000), Column.DataType.TEXT: (1, 3)}
+    columns = []
+
+    for order, data_type in enumerate(Column.DataType, start=1):
+        source_types = Column.DATA_TYPE_SOURCE_TYPES.get(data_type, [])
+        if not all(SourceData.objects.filter(source_type=source_type).exists() for source_type in source_types):
+            continue
+
+        minimal, maximal = limits.get(data_type, (None, None))
+        columns.append(Column(name=data_type.label, data_type=data_type, minimal=minimal, maximal=maximal,
+                              order=order))
+
+    return columns
+
+
+# Rows of content of benchmarks of writing, which are generated before measuring and repeated up to rows amount.
+# Repeated part is larger than windows of compressors (except the largest levels of xz),
+# so repeating does not make compression better
+SAMPLE_ROWS = 100000
+
+
+class SampleContent:
+    """
+    Content of csv file of rows_amount rows for benchmarks of writing, iterated by chunks of chunk_size rows.
+    Only sample of sample_rows rows is generated and kept in memory, and its chunks are repeated,
+    so files of millions of rows are written chunk by chunk with bounded memory, as files of data sets are.
+    """
+    def __init__(self, columns: list[Column], rows_amount: int, delimiter: str = ',', quotechar: str = '"',
+                 chunk_size: int = FILE_SETTINGS["CHUNK_SIZE"], sample_rows: int = SAMPLE_ROWS):
+        data_generator = RowDataGenerator(columns)
+        self.header = format_csv_header(data_generator.column_names, delimiter, quotechar).encode()
+
+        self.full_chunks_amount = rows_amount // chunk_size
+        sample_chunks_amount = min(self.full_chunks_amount, max(1, sample_rows // chunk_size))
+        self.chunks = [chunk.encode() for chunk in iter_csv_rows_chunks(
+            data_generator, sample_chunks_amount * chunk_size, delimiter, quotechar, chunk_size)]
+        self.last_chunk = ''.join(iter_csv_rows_chunks(data_generator, rows_amount % chunk_size, delimiter,
+                                                       quotechar, chunk_size)).encode()
+
+        self.size = len(self.header) + len(self.last_chunk) + sum(
+            len(self.chunks[i % len(self.chunks)]) for i in range(self.full_chunks_amount))
+
+    def __iter__(self):
+        yield self.header
+        for i in range(self.full_chunks_amount):
+            yield self.chunks[i % len(self.chunks)]
+        if self.last_chunk:
+            yield self.last_chunk
+
+
+def benchmark_compression(columns: list[Column], rows_amount: int, compressions: list[str],
+                          delimiter: str = ',', quotechar: str = '"') -> list[dict]:
+    """
+    Measures time of writing and size of csv file of columns, compressed with every compression
+    (empty compression means file without compression).
+    Content is generated before measuring (see SampleContent), so only writing and compressing is measured.
+    """
+    chunks = SampleContent(columns, rows_amount, delimiter, quotechar)
+    raw_size = chunks.size
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        for compression in compressions:
+            path = os.path.join(directory, f'data_set.csv.{compression}')
+
+            start = time.perf_counter()
+            with open_compressed(path, compression) as file:
+                for chunk in chunks:
+                    file.write(chunk)
+            seconds = time.perf_counter() - start
+
+            size = os.path.getsize(path)
+            results.append({
+                'compression': compression or 'none',
+                'seconds': seconds,
+                'throughput': raw_size / seconds if seconds else float('inf'),
+                'size': size,
+                'ratio': raw_size / size if size else 0,
+            })
+
+    return results
+
+
+def get_write_syscalls() -> [int, None]:
+    """Returns amount of write syscalls, made by this process, or None, if OS does not count them (not Linux)."""
+    try:
+        with open('/proc/self/io') as file:
+            for line in file:
+                name, _, value = line.partition(':')
+                if name == 'syscw':
+                    return int(value)
+    except OSError:
+        pass
+    return None
+
+
+def benchmark_write_buffers(columns: list[Column], rows_amount: int, buffer_sizes: list[int],
+                            compressions: list[str], delimiter: str = ',', quotechar: str = '"') -> list[dict]:
+    """
+    Measures time and amount of write syscalls of writing of csv file of columns with every size of write buffer
+    and every compression (syscalls are None, if OS does not count them).
+    Content is generated before measuring, as in benchmark_compression.
+    """
+    chunks = SampleContent(columns, rows_amount, delimiter, quotechar)
+    raw_size = chunks.size
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        for compression in compressions:
+            for buffer_size in buffer_sizes:
+                path = os.path.join(directory, f'data_set.csv.{compression}')
+
+                syscalls_before = get_write_syscalls()
+                start = time.perf_counter()
+                with open_compressed(path, compression, buffer_size=buffer_size) as file:
+                    for chunk in chunks:
+                        file.write(chunk)
+                seconds = time.perf_counter() - start
+                syscalls_after = get_write_syscalls()
+
+                results.append({
+                    'compression': compression or 'none',
+                    'buffer_size': buffer_size,
+                    'seconds': seconds,
+                    'throughput': raw_size / seconds if seconds else float('inf'),
+                    'write_syscalls': syscalls_after - syscalls_before if syscalls_after is not None else None,
+                })
+
+    return results
+
+
+def _measure(function, repeat: int) -> tuple[float, int]:
+    """Calls function repeat times, returns the best time and amount of bytes, returned by function."""
+    best_seconds = float('inf')
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = function()
+        best_seconds = min(best_seconds, time.perf_counter() - start)
+    return best_seconds, size
+
+
+def _get_result(benchmark: str, name: str, path: str, columns_amount: int, rows_amount: int,
+                seconds: float, size: int) -> dict:
+    return {
+        'benchmark': benchmark,
+        'name': name,
+        'path': path,
+        'columns': columns_amount,
+        'rows': rows_amount,
+        'seconds': seconds,
+        'rows_per_second': rows_amount / seconds if seconds else float('inf'),
+        'megabytes_per_second': size / 1024 ** 2 / seconds if seconds else float('inf'),
+    }
+
+
+def _get_values_size(values: list[str]) -> int:
+    return sum(len(value.encode()) for value in values)
+
+
+def benchmark_data_types(columns: list[Column], rows_amount: int, repeat: int = 3) -> list[dict]:
+    """Measures generating of values of every column, cell by cell (row path) and at once (batch path)."""
+    results = []
+    for column in columns:
+        generator = column.get_data_generator()
+
+        seconds, size = _measure(lambda: _get_values_size([generator() for _ in range(rows_amount)]), repeat)
+        results.append(_get_result('data_type', column.data_type, 'row', 1, rows_amount, seconds, size))
+
+        seconds, size = _measure(lambda: _get_values_size(generator.generate_batch(rows_amount)), repeat)
+        results.append(_get_result('data_type', column.data_type, 'batch', 1, rows_amount, seconds, size))
+
+    return results
+
+
+def get_wide_columns(columns: list[Column], width: int) -> list[Column]:
+    """Returns not saved columns of schema of width columns, types of which are taken from columns by turn."""
+    wide_columns = []
+    for order in range(1, width + 1):
+        column = columns[(order - 1) % len(columns)]
+        wide_columns.append(Column(name=f'{column.name} {order}', data_type=column.data_type, minimal=column.minimal,
+                                   maximal=column.maximal, order=order))
+    return wide_columns
+
+
+def _write_csv_by_rows(columns: list[Column], rows_amount: int) -> int:
+    """Writes csv content row by row with dict writer, as files were generated before batch generation."""
+    data_generator = RowDataGenerator(columns)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=data_generator.column_names)
+    writer.writeheader()
+    for _ in range(rows_amount):
+        writer.writerow(data_generator())
+    return len(buffer.getvalue().encode())
+
+
+def _write_csv_by_chunks(columns: list[Column], rows_amount: int) -> int:
+    return sum(len(chunk.encode()) for chunk in iter_csv_chunks(RowDataGenerator(columns), rows_amount, ',', '"'))
+
+
+@contextmanager
+def temporary_schema(columns: list[Column]):
+    """Creates schema with copies of columns, which is deleted with everything related on exit."""
+    with transaction.atomic():
+        owner = User.objects.create_user(username=f'benchmark_{uuid.uuid4().hex[:16]}')
+        delimiter, _ = Separator.objects.get_or_create(char=',', defaults={'name': 'comma'})
+        quotechar, _ = Separator.objects.get_or_create(char='"', defaults={'name': 'double-quote'})
+        schema = Schema.objects.create(name='benchmark', owner=owner, delimiter=delimiter, quotechar=quotechar)
+        Column.objects.bulk_create([Column(name=column.name, data_type=column.data_type, minimal=column.minimal,
+                                           maximal=column.maximal, order=column.order, schema=schema)
+                                    for column in columns])
+        try:
+            yield schema
+        finally:
+            transaction.set_rollback(True)
+
+
+def _generate_file(schema: Schema, rows_amount: int) -> tuple[float, int]:
+    data_set = DataSet.objects.create(schema=schema)
+    start = time.perf_counter()
+    generate_csv_file(data_set, rows_amount)
+    seconds = time.perf_counter() - start
+
+    if not data_set.file:
+        raise RuntimeError(f"File of {len(schema.columns.all())} columns and {rows_amount} rows was not generated")
+    size = data_set.file.size
+    data_set.file.delete()
+    return seconds, size
+
+
+def benchmark_schemas(columns: list[Column], widths: list[int], rows_amounts: list[int],
+                      repeat: int = 3, with_files: bool = True) -> list[dict]:
+    """
+    Measures generating of csv content of schemas of every width and rows amount:
+    row by row with csv writer (row path), by chunks of columns (batch path),
+    and generating of whole file of data set with generate_csv_file (file path).
+    """
+    results = []
+    for width in widths:
+        wide_columns = get_wide_columns(columns, width)
+        for rows_amount in rows_amounts:
+            seconds, size = _measure(lambda: _write_csv_by_rows(wide_columns, rows_amount), repeat)
+            results.append(_get_result('schema', f'{width} columns', 'row', width, rows_amount, seconds, size))
+
+            seconds, size = _measure(lambda: _write_csv_by_chunks(wide_columns, rows_amount), repeat)
+            results.append(_get_result('schema', f'{width} columns', 'batch', width, rows_amount, seconds, size))
+
+            if with_files:
+                with temporary_schema(wide_columns) as schema:
+                    seconds, size = min(_generate_file(schema, rows_amount) for _ in range(repeat))
+                results.append(_get_result('schema', f'{width} columns', 'file', width, rows_amount, seconds, size))
+
+    return results
+
+
+def get_environment() -> dict:
+    return {
+        'time': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+    }
+
+
+def _get_result_key(result: dict) -> tuple:
+    return result['benchmark'], result['name'], result['path'], result['columns'], result['rows']
+
+
+def compare_results(baseline: list[dict], results: list[dict], threshold: float) -> list[dict]:
+    """
+    Returns comparisons of results with the same benchmarks in baseline, which became slower more than threshold
+    (relative part of baseline rows per second).
+    """
+    baseline = {_get_result_key(result): result for result in baseline}
+    regressions = []
+
+    for result in results:
+        baseline_result = baseline.get(_get_result_key(result))
+        if baseline_result is None:
+            continue
+
+        change = result['rows_per_second'] / baseline_result['rows_per_second'] - 1
+        if change < -threshold:
+            regressions.append({**result, 'baseline_rows_per_second': baseline_result['rows_per_second'],
+                                'change': change})
+
+    return regressions
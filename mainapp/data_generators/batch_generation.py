@@ -0,0 +1,234 @@
+import datetime
+
+import numpy as np
+
+from schemas.settings import DATA_GENERATION_SETTINGS
+from .sampling import choose_values
+
+"""
+Batch versions of functions from data_generation.py, which generate whole column of values at once.
+Function's name must be the name of function for generating one value with suffix '_batch'.
+Function must take numpy random Generator and amount of values as first two parameters,
+and then the same parameters as function for generating one value.
+The function must return list of strings.
+Settings are keyword only parameters, as in data_generation.py, so they are bound once, when generation plan
+of schema is compiled, and are not looked up on every batch.
+Data types without batch function are generated value by value.
+"""
+
+EMAIL_SETTINGS = DATA_GENERATION_SETTINGS["EML"]
+DOMAIN_NAME_SETTINGS = DATA_GENERATION_SETTINGS["DMN"]
+PHONE_NUMBER_SETTINGS = DATA_GENERATION_SETTINGS["PHN"]
+COMPANY_NAME_SETTINGS = DATA_GENERATION_SETTINGS["CNM"]
+TEXT_SETTINGS = DATA_GENERATION_SETTINGS["TXT"]
+ADDRESS_SETTINGS = DATA_GENERATION_SETTINGS["ADR"]
+DATE_SETTINGS = DATA_GENERATION_SETTINGS["DTE"]
+
+first_letter_code = ord('a')
+last_letter_code = ord('z')
+upper_case_shift = ord('a') - ord('A')
+space_code = ord(' ')
+dot_code = ord('.')
+digit_zero_code = ord('0')
+
+
+def _split(text: str, bounds: np.ndarray) -> list[str]:
+    """Splits text to parts, where bounds is array of parts boundaries, starting with 0."""
+    bounds = bounds.tolist()
+    return [text[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def _random_letter_codes(rng: np.random.Generator, total: int) -> np.ndarray:
+    return rng.integers(first_letter_code, last_letter_code + 1, total, dtype=np.uint8)
+
+
+def _generate_words(rng: np.random.Generator, size: int, minimal: int, maximal: int,
+                    capitalize: bool = False) -> list[str]:
+    lengths = rng.integers(minimal, maximal + 1, size)
+    bounds = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(lengths, out=bounds[1:])
+
+    codes = _random_letter_codes(rng, int(bounds[-1]))
+    if capitalize:
+        codes[bounds[:-1][lengths > 0]] -= upper_case_shift
+
+    return _split(codes.tobytes().decode('ascii'), bounds)
+
+
+def _generate_phrases(rng: np.random.Generator, size: int, min_words_amount: int, max_words_amount: int,
+                      min_word_length: int, max_word_length: int, case: str = 'lower',
+                      with_dot: bool = False) -> list[str]:
+    """
+    Generates phrases of random words, separated by spaces.
+    Case may be 'lower', 'upper', 'title' (every word is capitalized) or 'sentence' (first word is capitalized).
+    If with_dot is set - phrase ends with dot (empty phrase is just dot), like in sentence.
+    """
+    words_amounts = rng.integers(min_words_amount, max_words_amount + 1, size)
+    words_bounds = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(words_amounts, out=words_bounds[1:])
+
+    # Every word takes its length and one char after it for separator
+    word_lengths = rng.integers(min_word_length, max_word_length + 1, int(words_bounds[-1]))
+    chars_bounds = np.zeros(len(word_lengths) + 1, dtype=np.int64)
+    np.cumsum(word_lengths + 1, out=chars_bounds[1:])
+
+    codes = _random_letter_codes(rng, int(chars_bounds[-1]))
+    if case == 'upper':
+        codes -= upper_case_shift
+    elif case == 'title':
+        codes[chars_bounds[:-1][word_lengths > 0]] -= upper_case_shift
+    codes[chars_bounds[1:] - 1] = space_code
+
+    not_empty = words_amounts > 0
+    phrases_bounds = chars_bounds[words_bounds]
+    phrases_last_chars = phrases_bounds[1:][not_empty] - 1
+    if case == 'sentence':
+        first_chars = phrases_bounds[:-1][not_empty]
+        first_chars = first_chars[codes[first_chars] != space_code]
+        codes[first_chars] -= upper_case_shift
+    if with_dot:
+        codes[phrases_last_chars] = dot_code
+
+    phrases = _split(codes.tobytes().decode('ascii'), phrases_bounds)
+    if with_dot:
+        return [phrase if phrase else '.' for phrase in phrases]
+    return [phrase[:-1] for phrase in phrases]
+
+
+def _choose(rng: np.random.Generator, size: int, options) -> list[str]:
+    return choose_values(rng, size, options)
+
+
+def _generate_integers(rng: np.random.Generator, size: int, minimal: int, maximal: int) -> list[str]:
+    return list(map(str, rng.integers(minimal, maximal + 1, size).tolist()))
+
+
+def generate_integer_batch(rng: np.random.Generator, size: int, minimal: int, maximal: int) -> list[str]:
+    return _generate_integers(rng, size, minimal, maximal)
+
+
+def generate_full_name_batch(rng: np.random.Generator, size: int,
+                             first_names: list[str], last_names: list[str]) -> list[str]:
+    first_names = _choose(rng, size, first_names)
+    last_names = _choose(rng, size, last_names)
+    return [first_name + ' ' + last_name for first_name, last_name in zip(first_names, last_names)]
+
+
+def generate_job_batch(rng: np.random.Generator, size: int, jobs: list[str]) -> list[str]:
+    return _choose(rng, size, jobs)
+
+
+def generate_email_batch(rng: np.random.Generator, size: int, *,
+                         min_email_name_length: int = EMAIL_SETTINGS["MIN_EMAIL_NAME_LENGTH"],
+                         max_email_name_length: int = EMAIL_SETTINGS["MAX_EMAIL_NAME_LENGTH"],
+                         email_domains: list[str] = EMAIL_SETTINGS["EMAIL_DOMAINS"]) -> list[str]:
+    email_names = _generate_words(rng, size, min_email_name_length, max_email_name_length)
+    email_domains = _choose(rng, size, email_domains)
+
+    return [email_name + '@' + email_domain for email_name, email_domain in zip(email_names, email_domains)]
+
+
+def generate_domain_name_batch(rng: np.random.Generator, size: int, *,
+                               min_domain_name_length: int = DOMAIN_NAME_SETTINGS["MIN_DOMAIN_NAME_LENGTH"],
+                               max_domain_name_length: int = DOMAIN_NAME_SETTINGS["MAX_DOMAIN_NAME_LENGTH"],
+                               top_level_domains: list[str] = DOMAIN_NAME_SETTINGS["TOP_LEVEL_DOMAINS"]) -> list[str]:
+    second_level_domains = _generate_words(rng, size, min_domain_name_length, max_domain_name_length)
+    top_level_domains = _choose(rng, size, top_level_domains)
+
+    return [second_level + '.' + top_level for second_level, top_level in zip(second_level_domains, top_level_domains)]
+
+
+def generate_phone_number_batch(rng: np.random.Generator, size: int, *,
+                                country_codes: list[str] = PHONE_NUMBER_SETTINGS["COUNTRY_CODES"],
+                                digits_total: int = PHONE_NUMBER_SETTINGS["DIGITS_TOTAL"]) -> list[str]:
+    country_code_indexes = rng.integers(0, len(country_codes), size)
+    phone_numbers = np.empty(size, dtype=object)
+
+    for i, country_code in enumerate(country_codes):
+        mask = country_code_indexes == i
+        amount = int(mask.sum())
+        if not amount:
+            continue
+
+        # Matrix of chars, where every row is phone number with country code at the beginning
+        code_length = len(country_code)
+        number_length = digits_total + 1
+        codes = rng.integers(digit_zero_code, digit_zero_code + 10, (amount, number_length), dtype=np.uint8)
+        codes[:, :code_length] = np.frombuffer(country_code.encode('ascii'), dtype=np.uint8)
+
+        bounds = np.arange(0, amount * number_length + 1, number_length)
+        phone_numbers[mask] = _split(codes.tobytes().decode('ascii'), bounds)
+
+    return phone_numbers.tolist()
+
+
+def generate_company_name_batch(rng: np.random.Generator, size: int, *,
+                                min_word_length: int = COMPANY_NAME_SETTINGS["MIN_WORD_LENGTH"],
+                                max_word_length: int = COMPANY_NAME_SETTINGS["MAX_WORD_LENGTH"],
+                                min_words_amount: int = COMPANY_NAME_SETTINGS["MIN_WORDS_AMOUNT"],
+                                max_words_amount: int = COMPANY_NAME_SETTINGS["MAX_WORDS_AMOUNT"]) -> list[str]:
+    return _generate_phrases(rng, size, min_words_amount, max_words_amount, min_word_length, max_word_length,
+                             case='upper')
+
+
+def generate_text_batch(rng: np.random.Generator, size: int, minimal: int, maximal: int, *,
+                        min_word_length: int = TEXT_SETTINGS["MIN_WORD_LENGTH"],
+                        min_sentence_length: int = TEXT_SETTINGS["MIN_SENTENCE_LENGTH"],
+                        max_sentence_length: int = TEXT_SETTINGS["MAX_SENTENCE_LENGTH"]) -> list[str]:
+    sentences_amounts = rng.integers(minimal, maximal + 1, size)
+    sentences_bounds = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(sentences_amounts, out=sentences_bounds[1:])
+
+    # Like in generate_sentence, minimal word length is used as both limits of word length
+    sentences = _generate_phrases(rng, int(sentences_bounds[-1]), min_sentence_length, max_sentence_length,
+                                  min_word_length, min_word_length, case='sentence', with_dot=True)
+
+    sentences_bounds = sentences_bounds.tolist()
+    return [' '.join(sentences[start:end]) for start, end in zip(sentences_bounds[:-1], sentences_bounds[1:])]
+
+
+def generate_address_batch(rng: np.random.Generator, size: int, *,
+                           min_country_name_length: int = ADDRESS_SETTINGS["MIN_COUNTRY_NAME_LENGTH"],
+                           max_country_name_length: int = ADDRESS_SETTINGS["MAX_COUNTRY_NAME_LENGTH"],
+                           min_district_name_length: int = ADDRESS_SETTINGS["MIN_DISTRICT_NAME_LENGTH"],
+                           max_district_name_length: int = ADDRESS_SETTINGS["MAX_DISTRICT_NAME_LENGTH"],
+                           min_city_name_length: int = ADDRESS_SETTINGS["MIN_CITY_NAME_LENGTH"],
+                           max_city_name_length: int = ADDRESS_SETTINGS["MAX_CITY_NAME_LENGTH"],
+                           min_street_words_amount: int = ADDRESS_SETTINGS["MIN_STREET_WORDS_AMOUNT"],
+                           max_street_words_amount: int = ADDRESS_SETTINGS["MAX_STREET_WORDS_AMOUNT"],
+                           min_street_number: int = ADDRESS_SETTINGS["MIN_STREET_NUMBER"],
+                           max_street_number: int = ADDRESS_SETTINGS["MAX_STREET_NUMBER"],
+                           min_building_number: int = ADDRESS_SETTINGS["MIN_BUILDING_NUMBER"],
+                           max_building_number: int = ADDRESS_SETTINGS["MAX_BUILDING_NUMBER"]) -> list[str]:
+    countries = _generate_words(rng, size, min_country_name_length, max_country_name_length, capitalize=True)
+    districts = _generate_words(rng, size, min_district_name_length, max_district_name_length, capitalize=True)
+    cities = _generate_words(rng, size, min_city_name_length, max_city_name_length, capitalize=True)
+
+    # Street is either name of few words, or number with 'street' or 'avenue'
+    streets = np.empty(size, dtype=object)
+    named_streets = rng.integers(0, 2, size).astype(bool)
+    named_streets_amount = int(named_streets.sum())
+    numbered_streets_amount = size - named_streets_amount
+    # Like in generate_address, words of streets have minimal length of words of text
+    streets[named_streets] = _generate_phrases(
+        rng, named_streets_amount, min_street_words_amount, max_street_words_amount,
+        TEXT_SETTINGS["MIN_WORD_LENGTH"], TEXT_SETTINGS["MIN_WORD_LENGTH"], case='title',
+    )
+    streets_numbers = _generate_integers(rng, numbered_streets_amount, min_street_number, max_street_number)
+    streets_kinds = _choose(rng, numbered_streets_amount, ['street', 'avenue'])
+    streets[~named_streets] = [number + ' ' + kind for number, kind in zip(streets_numbers, streets_kinds)]
+
+    buildings = _generate_integers(rng, size, min_building_number, max_building_number)
+
+    return [f"{country}, district {district}, city {city}, street {street}, building {building}"
+            for country, district, city, street, building
+            in zip(countries, districts, cities, streets.tolist(), buildings)]
+
+
+def generate_date_batch(rng: np.random.Generator, size: int, *,
+                        start_date: datetime.date = DATE_SETTINGS["START_DATE"],
+                        end_date: datetime.date = DATE_SETTINGS["END_DATE"]) -> list[str]:
+    max_days = (end_date - start_date).days
+
+    dates = np.datetime64(start_date, 'D') + rng.integers(1, max_days + 1, size)
+    return dates.astype(str).tolist()
@@ -0,0 +1,96 @@
+"""
+Writing of generated data to columnar files - Parquet and Arrow IPC (Feather v2).
+
+Data is written by chunks, every chunk is one row group (record batch), so only one chunk is kept in memory.
+Columns are typed: integers as int64, dates as date32, jobs as dictionary encoded strings, others as strings.
+Columnar formats are available only if package pyarrow is installed.
+"""
+from typing import Iterable
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pa = None
+
+from .progress import ProgressReporter
+
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+# Keys are values of Column.DataType
+INTEGER_DATA_TYPES = ('INT',)
+DATE_DATA_TYPES = ('DTE',)
+DICTIONARY_DATA_TYPES = ('JOB',)
+
+
+def get_available_columnar_formats() -> list[str]:
+    """Returns extensions of columnar formats, which could be used in current environment."""
+    return list(COLUMNAR_FORMATS) if pa is not None else []
+
+
+def get_arrow_types(data_types: list[str], value_options: list[[tuple[str, ...], None]]) -> list['pa.DataType']:
+    """
+    Returns arrow types of columns with data types.
+    Column is dictionary encoded only if all its possible values are known, because arrow file
+    must have the same dictionary in all record batches.
+    """
+    arrow_types = []
+    for data_type, options in zip(data_types, value_options):
+        if data_type in INTEGER_DATA_TYPES:
+            arrow_types.append(pa.int64())
+        elif data_type in DATE_DATA_TYPES:
+            arrow_types.append(pa.date32())
+        elif data_type in DICTIONARY_DATA_TYPES and options is not None:
+            arrow_types.append(pa.dictionary(pa.int32(), pa.string()))
+        else:
+            arrow_types.append(pa.string())
+    return arrow_types
+
+
+def to_record_batch(columns: list[list[str]], arrow_schema: 'pa.Schema',
+                    dictionaries: list[['pa.Array', None]]) -> 'pa.RecordBatch':
+    """
+    Converts generated columns values to record batch of arrow schema.
+    Values are parsed from the same strings, which are written to csv, so seeded files of all formats have equal data.
+    """
+    arrays = []
+    for values, field, dictionary in zip(columns, arrow_schema, dictionaries):
+        array = pa.array(values, type=pa.string())
+        if pa.types.is_dictionary(field.type):
+            indices = pa.compute.index_in(array, value_set=dictionary).cast(pa.int32())
+            array = pa.DictionaryArray.from_arrays(indices, dictionary)
+        elif field.type != pa.string():
+            array = array.cast(field.type)
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, schema=arrow_schema)
+
+
+def write_columnar_file(columns_chunks: Iterable[list[list[str]]], path: str, file_format: str,
+                        column_names: list[str], data_types: list[str],
+                        value_options: list[[tuple[str, ...], None]], progress: ProgressReporter = None) -> None:
+    """
+    Writes chunks of columns values to file of columnar format, every chunk as separate row group.
+    value_options are all possible values of columns (None, if they are unknown), used as dictionaries.
+    If progress is given - rows and in-memory size of every written chunk are added to it.
+    """
+    if file_format not in get_available_columnar_formats():
+        raise ValueError(f"Format {file_format} is not available")
+
+    arrow_types = get_arrow_types(data_types, value_options)
+    arrow_schema = pa.schema([pa.field(name, arrow_type) for name, arrow_type in zip(column_names, arrow_types)])
+    dictionaries = [pa.array(options, type=pa.string()) if pa.types.is_dictionary(arrow_type) else None
+                    for arrow_type, options in zip(arrow_types, value_options)]
+
+    if file_format == 'parquet':
+        writer = pa.parquet.ParquetWriter(path, arrow_schema)
+    else:
+        writer = pa.ipc.new_file(path, arrow_schema)
+
+    with writer:
+        for columns in columns_chunks:
+            batch = to_record_batch(columns, arrow_schema, dictionaries)
+            writer.write_batch(batch)
+            if progress is not None:
+                progress.add(batch.num_rows, batch.nbytes)
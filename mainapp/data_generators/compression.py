@@ -0,0 +1,81 @@
+"""
+Codecs for compressing generated files while they are written.
+
+Every codec writes standard stream, several streams of which, concatenated one after another,
+are decompressed as one file. So parts of file, compressed independently, could be simply concatenated.
+Zstandard is available only if package zstandard is installed.
+"""
+import bz2
+import gzip
+import lzma
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from schemas.settings import DATA_GENERATION_SETTINGS
+
+COMPRESSION_LEVELS = DATA_GENERATION_SETTINGS["FILE"]["COMPRESSION_LEVELS"]
+WRITE_BUFFER_BYTES = DATA_GENERATION_SETTINGS["FILE"]["WRITE_BUFFER_BYTES"]
+
+# Names of codecs in http header Content-Encoding, for codecs, which browsers can decompress by themselves
+HTTP_CONTENT_ENCODINGS = {
+    'gz': 'gzip',
+    'zst': 'zstd',
+}
+
+
+def _open_gzip(file: BinaryIO, level: int) -> BinaryIO:
+    # Zero time of modification makes the same content always compressed to the same bytes
+    return gzip.GzipFile(fileobj=file, mode='wb', compresslevel=level, mtime=0)
+
+
+def _open_bz2(file: BinaryIO, level: int) -> BinaryIO:
+    return bz2.BZ2File(file, mode='wb', compresslevel=level)
+
+
+def _open_lzma(file: BinaryIO, level: int) -> BinaryIO:
+    return lzma.LZMAFile(file, mode='wb', preset=level)
+
+
+def _open_zstd(file: BinaryIO, level: int) -> BinaryIO:
+    return zstandard.ZstdCompressor(level=level).stream_writer(file, closefd=False)
+
+
+CODECS = {
+    'gz': _open_gzip,
+    'bz2': _open_bz2,
+    'xz': _open_lzma,
+    'zst': _open_zstd,
+}
+
+
+def get_available_compressions() -> list[str]:
+    """Returns extensions of compressions, which could be used in current environment."""
+    return [compression for compression in CODECS if compression != 'zst' or zstandard is not None]
+
+
+@contextmanager
+def open_compressed(path: str, compression: str = '', level: [int, None] = None,
+                    buffer_size: int = WRITE_BUFFER_BYTES) -> Iterator[BinaryIO]:
+    """
+    Opens file for binary writing through compressor, chosen by its extension (gz, bz2, xz or zst).
+    If compression is empty - file is written as is. If level is not set - level from settings is used.
+    Small writes (compressors write output by small pieces) are gathered in buffer of buffer_size bytes,
+    so file is written to OS by large writes.
+    """
+    if compression and compression not in get_available_compressions():
+        raise ValueError(f"Compression {compression} is not available")
+
+    with open(path, 'wb', buffering=buffer_size) as file:
+        if not compression:
+            yield file
+            return
+
+        if level is None:
+            level = COMPRESSION_LEVELS[compression]
+        with CODECS[compression](file, level) as compressed_file:
+            yield compressed_file
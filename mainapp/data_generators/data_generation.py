@@ -2,6 +2,8 @@ import datetime
 from random import randint, choice
 
 from schemas.settings import DATA_GENERATION_SETTINGS
+from .sampling import choose_value
+from .text_synthesis import random_letters, random_lengths, random_words, random_sentences
 
 """
 For every data type must be uniq function for data generating.
@@ -14,19 +16,25 @@ as in main dict in json source file.
 The function must return string.
 """
 
-first_letter_code = ord('a')
-last_letter_code = ord('z')
+# Settings are keyword only parameters of functions, named as settings in lowercase,
+# so they are read once, when generation plan of schema is compiled (see GenerationManager.get_settings_kwargs).
+# Defaults are the same settings, read on import.
+EMAIL_SETTINGS = DATA_GENERATION_SETTINGS["EML"]
+DOMAIN_NAME_SETTINGS = DATA_GENERATION_SETTINGS["DMN"]
+PHONE_NUMBER_SETTINGS = DATA_GENERATION_SETTINGS["PHN"]
+COMPANY_NAME_SETTINGS = DATA_GENERATION_SETTINGS["CNM"]
+TEXT_SETTINGS = DATA_GENERATION_SETTINGS["TXT"]
+ADDRESS_SETTINGS = DATA_GENERATION_SETTINGS["ADR"]
+DATE_SETTINGS = DATA_GENERATION_SETTINGS["DTE"]
 
 
 def generate_word(minimal: int, maximal: int) -> str:
-    return ''.join([chr(randint(first_letter_code, last_letter_code)) for _ in range(randint(minimal, maximal))])
+    return random_letters(randint(minimal, maximal))
 
 
-def generate_sentence(minimal: int, maximal: int) -> str:
-    min_word_length = DATA_GENERATION_SETTINGS["TXT"]["MIN_WORD_LENGTH"]
-    max_word_length = DATA_GENERATION_SETTINGS["TXT"]["MIN_WORD_LENGTH"]
-    return ' '.join([generate_word(min_word_length, max_word_length)
-                     for _ in range(randint(minimal, maximal))]).capitalize() + '.'
+def generate_sentence(minimal: int, maximal: int, *, min_word_length: int = TEXT_SETTINGS["MIN_WORD_LENGTH"]) -> str:
+    # Words of sentence always have minimal length
+    return random_sentences([randint(minimal, maximal)], min_word_length)
 
 
 def generate_integer(minimal: int, maximal: int) -> str:
@@ -34,75 +42,78 @@ def generate_integer(minimal: int, maximal: int) -> str:
 
 
 def generate_full_name(first_names: list[str], last_names: list[str]) -> str:
-    first_name = choice(first_names)
-    last_name = choice(last_names)
+    first_name = choose_value(first_names)
+    last_name = choose_value(last_names)
     return first_name + ' ' + last_name
 
 
 def generate_job(jobs: list[str]) -> str:
-    return choice(jobs)
+    return choose_value(jobs)
 
 
-def generate_email() -> str:
-    min_email_name_length = DATA_GENERATION_SETTINGS["EML"]["MIN_EMAIL_NAME_LENGTH"]
-    max_email_name_length = DATA_GENERATION_SETTINGS["EML"]["MAX_EMAIL_NAME_LENGTH"]
-
-    email_name = ''.join([chr(randint(first_letter_code, last_letter_code))
-                          for _ in range(randint(min_email_name_length, max_email_name_length))])
-    email_domain = choice(DATA_GENERATION_SETTINGS["EML"]["EMAIL_DOMAINS"])
+def generate_email(*, min_email_name_length: int = EMAIL_SETTINGS["MIN_EMAIL_NAME_LENGTH"],
+                   max_email_name_length: int = EMAIL_SETTINGS["MAX_EMAIL_NAME_LENGTH"],
+                   email_domains: list[str] = EMAIL_SETTINGS["EMAIL_DOMAINS"]) -> str:
+    email_name = random_letters(randint(min_email_name_length, max_email_name_length))
+    email_domain = choice(email_domains)
 
     return email_name + '@' + email_domain
 
 
-def generate_domain_name() -> str:
-    top_level_domains = DATA_GENERATION_SETTINGS["DMN"]["TOP_LEVEL_DOMAINS"]
-    min_domain_name_length = DATA_GENERATION_SETTINGS["DMN"]["MIN_DOMAIN_NAME_LENGTH"]
-    max_domain_name_length = DATA_GENERATION_SETTINGS["DMN"]["MAX_DOMAIN_NAME_LENGTH"]
-
+def generate_domain_name(*, min_domain_name_length: int = DOMAIN_NAME_SETTINGS["MIN_DOMAIN_NAME_LENGTH"],
+                         max_domain_name_length: int = DOMAIN_NAME_SETTINGS["MAX_DOMAIN_NAME_LENGTH"],
+                         top_level_domains: list[str] = DOMAIN_NAME_SETTINGS["TOP_LEVEL_DOMAINS"]) -> str:
     second_level_domain = generate_word(min_domain_name_length, max_domain_name_length)
     return second_level_domain + '.' + choice(top_level_domains)
 
 
-def generate_phone_number() -> str:
-    country_code = choice(DATA_GENERATION_SETTINGS["PHN"]["COUNTRY_CODES"])
-    return country_code + ''.join([generate_integer(0, 9)
-                                   for _ in range(DATA_GENERATION_SETTINGS["PHN"]["DIGITS_TOTAL"]-len(country_code)+1)])
-
-
-def generate_company_name() -> str:
-    min_word_length = DATA_GENERATION_SETTINGS["CNM"]["MIN_WORD_LENGTH"]
-    max_word_length = DATA_GENERATION_SETTINGS["CNM"]["MAX_WORD_LENGTH"]
-    min_words_amount = DATA_GENERATION_SETTINGS["CNM"]["MIN_WORDS_AMOUNT"]
-    max_words_amount = DATA_GENERATION_SETTINGS["CNM"]["MAX_WORDS_AMOUNT"]
-    return ' '.join([generate_word(min_word_length, max_word_length).upper()
-                     for _ in range(randint(min_words_amount, max_words_amount))])
-
-
-def generate_text(minimal: int, maximal: int) -> str:
-    min_sentence_length = DATA_GENERATION_SETTINGS["TXT"]["MIN_SENTENCE_LENGTH"]
-    max_sentence_length = DATA_GENERATION_SETTINGS["TXT"]["MAX_SENTENCE_LENGTH"]
-    return ' '.join([generate_sentence(min_sentence_length, max_sentence_length)
-                     for _ in range(randint(minimal, maximal))])
-
-
-def generate_address() -> str:
-    settings = DATA_GENERATION_SETTINGS["ADR"]
-
-    country = generate_word(settings["MIN_COUNTRY_NAME_LENGTH"], settings["MAX_COUNTRY_NAME_LENGTH"]).capitalize()
-    district = generate_word(settings["MIN_DISTRICT_NAME_LENGTH"], settings["MAX_DISTRICT_NAME_LENGTH"]).capitalize()
-    city = generate_word(settings["MIN_CITY_NAME_LENGTH"], settings["MAX_CITY_NAME_LENGTH"]).capitalize()
+def generate_phone_number(*, country_codes: list[str] = PHONE_NUMBER_SETTINGS["COUNTRY_CODES"],
+                          digits_total: int = PHONE_NUMBER_SETTINGS["DIGITS_TOTAL"]) -> str:
+    country_code = choice(country_codes)
+    return country_code + ''.join([generate_integer(0, 9) for _ in range(digits_total - len(country_code) + 1)])
+
+
+def generate_company_name(*, min_word_length: int = COMPANY_NAME_SETTINGS["MIN_WORD_LENGTH"],
+                          max_word_length: int = COMPANY_NAME_SETTINGS["MAX_WORD_LENGTH"],
+                          min_words_amount: int = COMPANY_NAME_SETTINGS["MIN_WORDS_AMOUNT"],
+                          max_words_amount: int = COMPANY_NAME_SETTINGS["MAX_WORDS_AMOUNT"]) -> str:
+    words_amount = randint(min_words_amount, max_words_amount)
+    return random_words(random_lengths(words_amount, min_word_length, max_word_length)).upper()
+
+
+def generate_text(minimal: int, maximal: int, *, min_word_length: int = TEXT_SETTINGS["MIN_WORD_LENGTH"],
+                  min_sentence_length: int = TEXT_SETTINGS["MIN_SENTENCE_LENGTH"],
+                  max_sentence_length: int = TEXT_SETTINGS["MAX_SENTENCE_LENGTH"]) -> str:
+    sentences_amount = randint(minimal, maximal)
+    return random_sentences(random_lengths(sentences_amount, min_sentence_length, max_sentence_length),
+                            min_word_length)
+
+
+def generate_address(*, min_country_name_length: int = ADDRESS_SETTINGS["MIN_COUNTRY_NAME_LENGTH"],
+                     max_country_name_length: int = ADDRESS_SETTINGS["MAX_COUNTRY_NAME_LENGTH"],
+                     min_district_name_length: int = ADDRESS_SETTINGS["MIN_DISTRICT_NAME_LENGTH"],
+                     max_district_name_length: int = ADDRESS_SETTINGS["MAX_DISTRICT_NAME_LENGTH"],
+                     min_city_name_length: int = ADDRESS_SETTINGS["MIN_CITY_NAME_LENGTH"],
+                     max_city_name_length: int = ADDRESS_SETTINGS["MAX_CITY_NAME_LENGTH"],
+                     min_street_words_amount: int = ADDRESS_SETTINGS["MIN_STREET_WORDS_AMOUNT"],
+                     max_street_words_amount: int = ADDRESS_SETTINGS["MAX_STREET_WORDS_AMOUNT"],
+                     min_street_number: int = ADDRESS_SETTINGS["MIN_STREET_NUMBER"],
+                     max_street_number: int = ADDRESS_SETTINGS["MAX_STREET_NUMBER"],
+                     min_building_number: int = ADDRESS_SETTINGS["MIN_BUILDING_NUMBER"],
+                     max_building_number: int = ADDRESS_SETTINGS["MAX_BUILDING_NUMBER"]) -> str:
+    country = generate_word(min_country_name_length, max_country_name_length).capitalize()
+    district = generate_word(min_district_name_length, max_district_name_length).capitalize()
+    city = generate_word(min_city_name_length, max_city_name_length).capitalize()
     street = choice([
-        generate_sentence(settings["MIN_STREET_WORDS_AMOUNT"], settings["MAX_STREET_WORDS_AMOUNT"])[:-1].title(),
-        generate_integer(settings["MIN_STREET_NUMBER"], settings["MAX_STREET_NUMBER"]) +
-        ' ' + choice(['street', 'avenue']),
+        generate_sentence(min_street_words_amount, max_street_words_amount)[:-1].title(),
+        generate_integer(min_street_number, max_street_number) + ' ' + choice(['street', 'avenue']),
     ])
-    building = generate_integer(settings["MIN_BUILDING_NUMBER"], settings["MAX_BUILDING_NUMBER"])
+    building = generate_integer(min_building_number, max_building_number)
 
     return f"{country}, district {district}, city {city}, street {street}, building {building}"
 
 
-def generate_date() -> str:
-    start_date = DATA_GENERATION_SETTINGS["DTE"]["START_DATE"]
-    end_date = DATA_GENERATION_SETTINGS["DTE"]["END_DATE"]
+def generate_date(*, start_date: datetime.date = DATE_SETTINGS["START_DATE"],
+                  end_date: datetime.date = DATE_SETTINGS["END_DATE"]) -> str:
     max_days = (end_date - start_date).days
     return str(start_date + datetime.timedelta(days=randint(1, max_days)))
@@ -1,23 +1,130 @@
+import copy
+from functools import partial
+
+import numpy as np
+
+from .generation_plan import GenerationPlan
 from .managers import GenerationManager
+from .unique_generation import check_unique_capacity
 
 
 class CellDataGenerator:
-    """Class for generating data of cell based on column's type and limitations, if needed"""
-    def __init__(self, data_type, have_limits, minimal=None, maximal=None, source_data=None):
-        self._generation_method = GenerationManager.get_generation_method(data_type.name)
-        self._generation_kwargs = GenerationManager.get_generation_kwargs(have_limits=have_limits,
-                                                                          minimal=minimal,
-                                                                          maximal=maximal,
-                                                                          source_data=source_data)
+    """
+    Class for generating data of cell based on column's type and limitations, if needed.
+    Generation functions are bound with their arguments and settings once, on creation of generator.
+    If unique is set - values, generated by batches, are distinct in data set, which is prepared by prepare_unique.
+    Cells, generated one by one, are not unique.
+    """
+    def __init__(self, data_type, have_limits, minimal=None, maximal=None, source_data=None, unique=False):
+        generation_method = GenerationManager.get_generation_method(data_type.name)
+        batch_generation_method = GenerationManager.get_batch_generation_method(data_type.name)
+        generation_kwargs = GenerationManager.get_generation_kwargs(have_limits=have_limits,
+                                                                    minimal=minimal,
+                                                                    maximal=maximal,
+                                                                    source_data=source_data)
+
+        self.generate = partial(generation_method, **generation_kwargs,
+                                **GenerationManager.get_settings_kwargs(data_type.name, generation_method))
+        self._generate_batch = None
+        if batch_generation_method is not None:
+            self._generate_batch = partial(batch_generation_method, **generation_kwargs,
+                                           **GenerationManager.get_settings_kwargs(data_type.name,
+                                                                                   batch_generation_method))
+        self._source_data = source_data or {}
+        self._rng = np.random.default_rng()
+
+        self.unique = unique
+        self._generate_unique = None
+        self._unique_rows_amount = None
+        self._unique_seed_sequence = None
+        if unique:
+            unique_generation_method = GenerationManager.get_unique_generation_method(data_type.name)
+            if unique_generation_method is None:
+                raise ValueError(f"Values of type {data_type.label} can not be unique")
+            self._generate_unique = partial(unique_generation_method, **generation_kwargs,
+                                            **GenerationManager.get_settings_kwargs(data_type.name,
+                                                                                    unique_generation_method))
+            self.unique_capacity = GenerationManager.get_unique_capacity(data_type.name, have_limits, minimal, maximal)
 
     def __call__(self):
-        return self._generation_method(**self._generation_kwargs)
+        return self.generate()
+
+    def prepare_unique(self, rows_amount: int, seed_sequence: np.random.SeedSequence, column_name: str = '') -> None:
+        """
+        Prepares unique generator for data set of rows_amount rows: values are permuted by key from seed_sequence.
+        Raises ValueError, if data type with its limits has less distinct values than rows.
+        """
+        check_unique_capacity(column_name, self.unique_capacity, rows_amount)
+        self._unique_rows_amount = rows_amount
+        self._unique_seed_sequence = seed_sequence
+
+    def generate_batch(self, size: int, start: int = 0) -> list[str]:
+        """
+        Generates data of size cells at once. If data type has no batch function - generates cell by cell.
+        Unique values depend on position of the first cell in data set (start).
+        """
+        if self._generate_unique is not None:
+            if self._unique_rows_amount is None:
+                raise RuntimeError("Unique generator is not prepared for data set")
+            positions = np.arange(start, start + size, dtype=np.uint64)
+            return self._generate_unique(self._rng, positions, self._unique_rows_amount, self._unique_seed_sequence)
+        if self._generate_batch is None:
+            return [self.generate() for _ in range(size)]
+        return self._generate_batch(self._rng, size)
+
+    @property
+    def value_options(self) -> [tuple[str, ...], None]:
+        """All possible values of cell, if they are taken from the only source data type, else None."""
+        if len(self._source_data) != 1:
+            return None
+        return tuple(dict.fromkeys(*self._source_data.values()))
+
+    def reseed(self, seed: [int, np.random.SeedSequence, None]) -> None:
+        """Sets new random generator for batch generation, seeded with seed (fresh entropy if None)."""
+        self._rng = np.random.default_rng(seed)
+
+    def copy(self) -> 'CellDataGenerator':
+        """Returns generator with the same bound functions, but with its own random generator."""
+        generator = copy.copy(self)
+        generator.reseed(None)
+        return generator
 
 
 class RowDataGenerator:
     """Class for generating data of one row in schema, in dict format {column_name: value_in_this_row}"""
-    def __init__(self, schema_columns):
-        self._cell_generators = {column.name: column.get_data_generator() for column in schema_columns}
+    def __init__(self, schema_columns=None, plan: GenerationPlan = None):
+        """Generator is made from compiled plan of schema. If plan is not given, it is compiled from schema_columns."""
+        self.plan = plan if plan is not None else GenerationPlan(schema_columns)
+        self.column_names = self.plan.column_names
+        self.data_types = self.plan.data_types
+        # Cell generators of plan could be shared, so random generators of batch generation are not
+        self._cell_generators = [gen.copy() for gen in self.plan.cell_generators]
 
     def __call__(self):
-        return {field_name: gen() for field_name, gen in self._cell_generators.items()}
+        return self.plan.generate_row()
+
+    def generate_columns(self, size: int, start: int = 0) -> list[list[str]]:
+        """
+        Generates data of size rows at once, as list of columns values in order of columns.
+        start is position of the first row in data set, it defines values of unique columns.
+        """
+        return [gen.generate_batch(size, start) for gen in self._cell_generators]
+
+    def prepare_unique(self, rows_amount: int, seed_sequence: np.random.SeedSequence) -> None:
+        """
+        Prepares unique columns for generating of data set of rows_amount rows, every column gets its own key,
+        spawned from seed_sequence. Raises ValueError, if some unique column can not have rows_amount distinct values.
+        """
+        unique_generators = [(name, gen) for name, gen in zip(self.column_names, self._cell_generators) if gen.unique]
+        for (name, gen), column_seed_sequence in zip(unique_generators, seed_sequence.spawn(len(unique_generators))):
+            gen.prepare_unique(rows_amount, column_seed_sequence, name)
+
+    @property
+    def value_options(self) -> list[[tuple[str, ...], None]]:
+        """Possible values of every column, None for columns, which values are not taken from source data."""
+        return [gen.value_options for gen in self._cell_generators]
+
+    def reseed(self, seed_sequence: np.random.SeedSequence) -> None:
+        """Gives every column independent random generator, spawned from seed_sequence."""
+        for gen, column_seed_sequence in zip(self._cell_generators, seed_sequence.spawn(len(self._cell_generators))):
+            gen.reseed(column_seed_sequence)
@@ -0,0 +1,114 @@
+import logging
+import os
+import shutil
+
+from schemas.settings import MEDIA_ROOT, DATA_GENERATION_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+FILE_CACHE_SETTINGS = DATA_GENERATION_SETTINGS["FILE_CACHE"]
+
+
+class GeneratedFileCache:
+    """
+    Content addressed cache of generated files, stored in directory by their fingerprints.
+    Files are hard linked between cache and data sets (or copied, if linking is not possible),
+    so deletion of data set's file does not affect cache and vice versa.
+    Total size of cache is bounded, least recently used files are evicted first.
+    Cached file shares its inode with files of data sets, so its time of modification (which is in their ETag and
+    Last-Modified) never changes: time of last usage is time of modification of separate empty marker file.
+    """
+    # Subdirectory of markers of usage of cached files
+    MARKERS_DIRECTORY = 'used'
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+
+    def _get_path(self, fingerprint: str) -> str:
+        return os.path.join(self.directory, fingerprint)
+
+    def _get_marker_path(self, fingerprint: str) -> str:
+        return os.path.join(self.directory, self.MARKERS_DIRECTORY, fingerprint)
+
+    def _mark_used(self, fingerprint: str) -> None:
+        marker_path = self._get_marker_path(fingerprint)
+        os.makedirs(os.path.dirname(marker_path), exist_ok=True)
+        with open(marker_path, 'a'):
+            pass
+        os.utime(marker_path)
+
+    @staticmethod
+    def _link(source_path: str, destination_path: str) -> None:
+        try:
+            os.link(source_path, destination_path)
+        except FileExistsError:
+            raise
+        except OSError:
+            shutil.copyfile(source_path, destination_path)
+
+    def get(self, fingerprint: str, destination_path: str) -> bool:
+        """
+        Places cached file with fingerprint to destination path, replacing file there, if it exists.
+        Returns False if there is no such file.
+        """
+        cached_path = self._get_path(fingerprint)
+        # Link can not replace existing file, so it is linked to temporary path first, and renamed then
+        temporary_path = f'{destination_path}.link'
+        try:
+            self._link(cached_path, temporary_path)
+        except FileNotFoundError:
+            return False
+        os.replace(temporary_path, destination_path)
+
+        self._mark_used(fingerprint)
+        return True
+
+    def put(self, fingerprint: str, source_path: str) -> None:
+        """Adds file to cache and evicts least recently used files, if cache became too large."""
+        os.makedirs(self.directory, exist_ok=True)
+        cached_path = self._get_path(fingerprint)
+        try:
+            self._link(source_path, cached_path)
+        except FileExistsError:
+            pass
+        self._mark_used(fingerprint)
+        self.evict()
+
+    def get_entries(self) -> list[tuple[str, int]]:
+        """Returns paths and sizes of cached files, from least to most recently used."""
+        if not os.path.isdir(self.directory):
+            return []
+
+        with os.scandir(self.directory) as entries:
+            stats = [(entry.path, entry.stat()) for entry in entries if entry.is_file()]
+
+        def get_used_time(item: tuple[str, os.stat_result]) -> float:
+            # File without marker (e.g. its marker was not written) is used when it was made
+            try:
+                return os.stat(self._get_marker_path(os.path.basename(item[0]))).st_mtime
+            except FileNotFoundError:
+                return item[1].st_mtime
+
+        return [(path, stat.st_size) for path, stat in sorted(stats, key=get_used_time)]
+
+    def evict(self) -> None:
+        entries = self.get_entries()
+        total_size = sum(size for _, size in entries)
+
+        for path, size in entries:
+            if total_size <= self.max_size:
+                break
+            for removed_path in (path, self._get_marker_path(os.path.basename(path))):
+                try:
+                    os.remove(removed_path)
+                except FileNotFoundError:
+                    pass
+            total_size -= size
+            logger.info("Generated file %s was evicted from cache.", os.path.basename(path))
+
+
+generated_file_cache = GeneratedFileCache(
+    directory=os.path.join(MEDIA_ROOT, 'csv_files', FILE_CACHE_SETTINGS["DIRECTORY"]),
+    max_size=FILE_CACHE_SETTINGS["MAX_SIZE"],
+)
@@ -1,42 +1,419 @@
 import csv
+import io
+import logging
+import math
 import os
+import re
+import shutil
+import uuid
+import zlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from contextlib import ExitStack
+from typing import Iterator
 
-from schemas.settings import MEDIA_ROOT
+import numpy as np
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils import timezone
+from django.utils.text import slugify
 
+from schemas.settings import MEDIA_ROOT, DATA_GENERATION_SETTINGS
+from .columnar_generation import COLUMNAR_FORMATS, write_columnar_file
+from .compression import open_compressed
+from .file_cache import generated_file_cache
+from .progress import ProgressReporter
 
-def generate_csv_file(data_set, rows_amount: int) -> None:
-    # Generating uniq filename
-    filename = f'{data_set.schema.name}_data_set.csv'
-    i = 1
-    while os.path.isfile(os.path.abspath(os.path.join(MEDIA_ROOT, 'csv_files', filename))):
-        filename = f'{data_set.schema.name}_data_set({i}).csv'
-        i += 1
-    path = os.path.join('csv_files', filename)
-    absolute_path = os.path.abspath(os.path.join(MEDIA_ROOT, 'csv_files', filename))
+logger = logging.getLogger(__name__)
+
+FILE_SETTINGS = DATA_GENERATION_SETTINGS["FILE"]
+
+# Same line terminator, as csv writer uses by default
+LINE_TERMINATOR = '\r\n'
+
+# Directory of files of data sets, relative to MEDIA_ROOT
+DATA_SETS_DIRECTORY = 'csv_files'
+
+# Spawn key of seed sequence of unique columns, it is never an index of chunk, so keys do not repeat seeds of chunks
+UNIQUE_SPAWN_KEY = 2 ** 64 - 1
+# Spawn key of seed sequence of rows, which are generated to estimate size of rows
+SIZE_PROBE_SPAWN_KEY = 2 ** 64 - 2
+
+
+def _need_quoting(columns: list[list[str]], delimiter: str, quotechar: str) -> bool:
+    special_chars = (delimiter, quotechar, '\r', '\n')
+    for column in columns:
+        column_text = ''.join(column)
+        if any(char in column_text for char in special_chars):
+            return True
+
+    # Csv writer quotes empty value, if it is the only value in row
+    return len(columns) == 1 and '' in columns[0]
+
+
+def format_csv_rows(columns: list[list[str]], delimiter: str, quotechar: str) -> str:
+    """
+    Formats rows, given as list of columns values, to csv text.
+    If no value needs quoting, rows are joined directly, else csv writer is used.
+    Both ways give the same result as csv writer with minimal quoting.
+    """
+    rows = zip(*columns)
+
+    if not _need_quoting(columns, delimiter, quotechar):
+        return LINE_TERMINATOR.join(map(delimiter.join, rows)) + LINE_TERMINATOR
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter, quotechar=quotechar, quoting=csv.QUOTE_MINIMAL)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def format_csv_header(column_names: list[str], delimiter: str, quotechar: str) -> str:
+    return format_csv_rows([[column_name] for column_name in column_names], delimiter, quotechar)
+
+
+def iter_columns_chunks(data_generator, rows_amount: int, chunk_size: int = FILE_SETTINGS["CHUNK_SIZE"],
+                        entropy: [int, None] = None, first_chunk_index: int = 0) -> Iterator[list[list[str]]]:
+    """
+    Yields generated rows by chunks up to chunk_size rows, as lists of columns values.
+    If entropy is set - random generators of every chunk are seeded by entropy and index of chunk,
+    so chunk with the same index is the same, no matter in which process, shard or file format it is generated.
+    Values of unique columns are defined by positions of rows in data set, so they are distinct in all chunks.
+    """
+    for chunk_index, rows_generated in enumerate(range(0, rows_amount, chunk_size), start=first_chunk_index):
+        if entropy is not None:
+            data_generator.reseed(np.random.SeedSequence(entropy, spawn_key=(chunk_index,)))
+        yield data_generator.generate_columns(min(chunk_size, rows_amount - rows_generated),
+                                              start=chunk_index * chunk_size)
+
+
+def iter_csv_rows_chunks(data_generator, rows_amount: int, delimiter: str, quotechar: str,
+                         chunk_size: int = FILE_SETTINGS["CHUNK_SIZE"], entropy: [int, None] = None,
+                         first_chunk_index: int = 0) -> Iterator[str]:
+    """Yields csv rows by chunks up to chunk_size rows, without header. Chunks are seeded as in iter_columns_chunks."""
+    for columns in iter_columns_chunks(data_generator, rows_amount, chunk_size, entropy, first_chunk_index):
+        yield format_csv_rows(columns, delimiter, quotechar)
+
+
+def iter_csv_chunks(data_generator, rows_amount: int, delimiter: str, quotechar: str,
+                    chunk_size: int = FILE_SETTINGS["CHUNK_SIZE"], entropy: [int, None] = None) -> Iterator[str]:
+    """Yields content of csv file by chunks: header first, and then chunks up to chunk_size rows."""
+    yield format_csv_header(data_generator.column_names, delimiter, quotechar)
+    yield from iter_csv_rows_chunks(data_generator, rows_amount, delimiter, quotechar, chunk_size, entropy)
+
+
+def iter_sized_csv_chunks(data_generator, rows_amount: int, delimiter: str, quotechar: str,
+                          chunk_bytes: int = FILE_SETTINGS["STREAM_CHUNK_BYTES"]) -> Iterator[str]:
+    """
+    Yields content of csv file by chunks of about chunk_bytes size: header first, and then rows.
+    Amount of rows in chunk is adjusted to average size of rows, generated before.
+    """
+    data_generator.prepare_unique(rows_amount, np.random.SeedSequence())
+    yield format_csv_header(data_generator.column_names, delimiter, quotechar)
+
+    rows_generated = 0
+    chars_generated = 0
+    chunk_size = min(rows_amount, 1000)
+    while rows_generated < rows_amount:
+        chunk = format_csv_rows(data_generator.generate_columns(chunk_size, start=rows_generated),
+                                delimiter, quotechar)
+        yield chunk
+
+        rows_generated += chunk_size
+        chars_generated += len(chunk)
+        chunk_size = min(rows_amount - rows_generated, max(1, chunk_bytes * rows_generated // chars_generated))
+
+
+def limit_chunk_size(data_generator, rows_amount: int, chunk_size: int, delimiter: str, quotechar: str,
+                     entropy: int, chunk_bytes: int = FILE_SETTINGS["CHUNK_BYTES"],
+                     probe_rows: int = FILE_SETTINGS["CHUNK_PROBE_ROWS"]) -> int:
+    """
+    Returns amount of rows in chunk, not more than chunk_size, so csv text of chunk is not larger than about chunk_bytes.
+    Size of row is estimated by probe_rows rows, seeded by entropy, so seeded data set has the same chunks every time.
+    Unique columns must be prepared for rows_amount already.
+    """
+    probe_rows = min(probe_rows, chunk_size, rows_amount)
+    if not chunk_bytes or not probe_rows:
+        return chunk_size
+
+    data_generator.reseed(np.random.SeedSequence(entropy, spawn_key=(SIZE_PROBE_SPAWN_KEY,)))
+    probe = format_csv_rows(data_generator.generate_columns(probe_rows), delimiter, quotechar).encode()
+    return max(1, min(chunk_size, chunk_bytes * probe_rows // len(probe)))
+
+
+def gzip_chunks(chunks: Iterator[str], level: int = FILE_SETTINGS["STREAM_GZIP_LEVEL"]) -> Iterator[bytes]:
+    """Compresses text chunks to one gzip stream, chunk by chunk."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk.encode())
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def split_to_shards(rows_amount: int, workers: int, min_shard_rows: int, chunk_size: int) -> list[int]:
+    """
+    Splits rows amount to amounts of rows in shards, which could be generated in parallel.
+    Every shard, except the last one, consists of whole chunks.
+    """
+    chunks_amount = math.ceil(rows_amount / chunk_size)
+    shards_amount = max(1, min(workers, rows_amount // max(min_shard_rows, 1), chunks_amount))
+    chunks_per_shard = math.ceil(chunks_amount / shards_amount)
+
+    shard_rows = chunks_per_shard * chunk_size
+    return [min(shard_rows, rows_amount - start) for start in range(0, rows_amount, shard_rows)]
+
+
+def _write_csv_part(data_generator, path: str, rows_amount: int, delimiter: str, quotechar: str, chunk_size: int,
+                    entropy: int, first_chunk_index: int, compression: str, shards_progress=None,
+                    shard_index: int = 0) -> None:
+    """
+    Writes rows of one shard to part file, compressed as separate stream. Runs in separate process.
+    If shards_progress is given - rows and bytes, written by shard, are set to it by shard_index after every chunk.
+    """
+    rows_written = 0
+    bytes_written = 0
+    with open_compressed(path, compression) as part_file:
+        for columns in iter_columns_chunks(data_generator, rows_amount, chunk_size, entropy, first_chunk_index):
+            chunk = format_csv_rows(columns, delimiter, quotechar).encode()
+            part_file.write(chunk)
+            rows_written += len(columns[0])
+            bytes_written += len(chunk)
+            if shards_progress is not None:
+                shards_progress[shard_index] = (rows_written, bytes_written)
+
+
+def _write_csv_file_by_shards(data_generator, absolute_path: str, shards: list[int], delimiter: str, quotechar: str,
+                              chunk_size: int, entropy: int, compression: str,
+                              progress: ProgressReporter = None) -> None:
+    parts_paths = [f'{absolute_path}.part{i}' for i in range(len(shards))]
+    # Shards, except the last one, consist of whole chunks
+    first_chunks_indexes = [sum(shards[:i]) // chunk_size for i in range(len(shards))]
+
+    try:
+        with ExitStack() as stack:
+            # Shards report their progress through shared dict, and it is summed up here, while they are running
+            shards_progress = stack.enter_context(multiprocessing.Manager()).dict() if progress is not None else None
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=len(shards)))
+            futures = [executor.submit(_write_csv_part, data_generator, part_path, shard_rows, delimiter, quotechar,
+                                       chunk_size, entropy, first_chunk_index, compression, shards_progress, i)
+                       for i, (part_path, shard_rows, first_chunk_index)
+                       in enumerate(zip(parts_paths, shards, first_chunks_indexes))]
+            not_done = futures
+            while not_done:
+                _, not_done = wait(not_done, timeout=progress.interval if progress is not None else None)
+                if progress is not None:
+                    shards_written = list(shards_progress.values())
+                    progress.set(sum(rows for rows, _ in shards_written), sum(size for _, size in shards_written))
+            for future in futures:
+                future.result()
+
+        # Concatenating parts after the only header, compressed streams are concatenated as well
+        with open_compressed(absolute_path, compression) as header_file:
+            header_file.write(format_csv_header(data_generator.column_names, delimiter, quotechar).encode())
+        with open(absolute_path, 'ab') as csvfile:
+            for part_path in parts_paths:
+                with open(part_path, 'rb', buffering=0) as part_file:
+                    shutil.copyfileobj(part_file, csvfile, FILE_SETTINGS["WRITE_BUFFER_BYTES"])
+                os.remove(part_path)
+    finally:
+        for part_path in parts_paths:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+
+
+def sync_file(path: str) -> None:
+    """Writes data of file, which are written to OS already, to disk."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def sync_directory(path: str) -> None:
+    """Writes entries of directory (e.g. renamed file) to disk, if OS supports syncing of directories."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_file(data_set, absolute_path: str, rows_amount: int, chunk_size: int, workers: int,
+                min_shard_rows: int, progress: ProgressReporter = None,
+                fsync_bytes: int = FILE_SETTINGS["FSYNC_BYTES"]) -> None:
+    data_generator = data_set.schema.get_data_generator()
+    delimiter = data_set.schema.delimiter.char
+    quotechar = data_set.schema.quotechar.char
+    entropy = data_set.seed if data_set.seed is not None else np.random.SeedSequence().entropy
+    # Keys of unique columns are prepared once for the whole data set, and are sent to processes of shards with it
+    data_generator.prepare_unique(rows_amount, np.random.SeedSequence(entropy, spawn_key=(UNIQUE_SPAWN_KEY,)))
+    # Chunk of large rows is made smaller, so every process of shard holds not more than CHUNK_BYTES of rows
+    chunk_size = limit_chunk_size(data_generator, rows_amount, chunk_size, delimiter, quotechar, entropy)
+    shards = split_to_shards(rows_amount, workers, min_shard_rows, chunk_size)
+
+    if data_set.file_format in COLUMNAR_FORMATS:
+        # Columnar file can not be concatenated from parts, so it is always generated in one process
+        chunks = iter_columns_chunks(data_generator, rows_amount, chunk_size, entropy)
+        write_columnar_file(chunks, absolute_path, data_set.file_format, data_generator.column_names,
+                            data_generator.data_types, data_generator.value_options, progress)
+    elif len(shards) > 1:
+        _write_csv_file_by_shards(data_generator, absolute_path, shards, delimiter, quotechar, chunk_size, entropy,
+                                  data_set.compression, progress)
+    else:
+        unsynced_bytes = 0
+        with open_compressed(absolute_path, data_set.compression) as csvfile:
+            csvfile.write(format_csv_header(data_generator.column_names, delimiter, quotechar).encode())
+            for columns in iter_columns_chunks(data_generator, rows_amount, chunk_size, entropy):
+                chunk = format_csv_rows(columns, delimiter, quotechar).encode()
+                csvfile.write(chunk)
+                if progress is not None:
+                    progress.add(len(columns[0]), len(chunk))
+
+                # Syncing by large batches, so dirty pages do not pile up till the end, but disk is not waited often.
+                # Buffers are not flushed, as flushing of compressor would change compressed content
+                unsynced_bytes += len(chunk)
+                if fsync_bytes and unsynced_bytes >= fsync_bytes:
+                    sync_file(absolute_path)
+                    unsynced_bytes = 0
+
+
+def get_data_set_file_path(data_set, suffix: str = '') -> str:
+    """
+    Returns path of file of data set relative to MEDIA_ROOT: name of file is made of name of schema and pk of data set,
+    and files are spread by pk to DIRECTORY_SHARDS subdirectories, so no directory grows too large.
+    Name of schema is slugified, so it has only ascii letters, digits, '-' and '_', and can not lead to other directory.
+    Data set without pk gets random name instead.
+    """
+    extension = data_set.file_format
+    if data_set.compression:
+        extension += f'.{data_set.compression}'
+
+    if data_set.pk is not None:
+        key, name = data_set.pk, data_set.pk
+    else:
+        key = uuid.uuid4().int
+        name = f'{key:032x}'
+    shard = f'{key % FILE_SETTINGS["DIRECTORY_SHARDS"]:02x}'
+    schema_name = slugify(data_set.schema.name)
+    prefix = f'{schema_name}_' if schema_name else ''
+    return os.path.join(DATA_SETS_DIRECTORY, shard, f'{prefix}data_set_{name}{suffix}.{extension}')
+
+
+def allocate_data_set_file(data_set) -> str:
+    """
+    Creates empty file of data set and returns its path relative to MEDIA_ROOT.
+    File is created atomically (with O_EXCL), so concurrent generators never get the same file.
+    If file is already there (e.g. left by data set of other db with the same pk) - random suffix is added to name.
+    Raises SuspiciousFileOperation, if path is not inside directory of data sets files, before creating anything.
+    """
+    data_sets_directory = os.path.abspath(os.path.join(MEDIA_ROOT, DATA_SETS_DIRECTORY))
+    path = get_data_set_file_path(data_set)
+    while True:
+        absolute_path = os.path.abspath(os.path.join(MEDIA_ROOT, path))
+        if os.path.commonpath([data_sets_directory, os.path.dirname(absolute_path)]) != data_sets_directory:
+            raise SuspiciousFileOperation(f'File {path} of data set is outside of {DATA_SETS_DIRECTORY} directory')
+        os.makedirs(os.path.dirname(absolute_path), exist_ok=True)
+        try:
+            os.close(os.open(absolute_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+        except FileExistsError:
+            path = get_data_set_file_path(data_set, suffix=f'_{uuid.uuid4().hex[:8]}')
+        else:
+            return path
+
+
+def remove_data_set_leftovers(data_set) -> int:
+    """
+    Removes files, left by generating of data set, which was interrupted (e.g. its worker crashed):
+    its allocated empty files, and temporary, part and link files beside them. Returns amount of removed files.
+    Complete (not empty) files are never removed, as they could belong to data set of other db with the same pk.
+    """
+    absolute_path = os.path.abspath(os.path.join(MEDIA_ROOT, get_data_set_file_path(data_set)))
+    directory, name = os.path.split(absolute_path)
+    # Name of schema is slugified, so the first dot separates extension. Allocated name can have random suffix
+    stem, _, extension = name.partition('.')
+    pattern = re.compile(re.escape(stem) + r'(_[0-9a-f]{8})?\.' + re.escape(extension) +
+                         r'(?P<leftover>\.tmp(\.part\d+)?|\.link)?')
+
+    removed = 0
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                match = pattern.fullmatch(entry.name)
+                if match and entry.is_file() and (match.group('leftover') or not entry.stat().st_size):
+                    os.remove(entry.path)
+                    removed += 1
+    except FileNotFoundError:
+        pass
+    return removed
+
+
+def generate_csv_file(data_set, rows_amount: int, chunk_size: int = FILE_SETTINGS["CHUNK_SIZE"],
+                      workers: int = FILE_SETTINGS["SHARD_WORKERS"],
+                      min_shard_rows: int = FILE_SETTINGS["MIN_SHARD_ROWS"],
+                      progress_interval: float = FILE_SETTINGS["PROGRESS_INTERVAL"],
+                      fsync_bytes: int = FILE_SETTINGS["FSYNC_BYTES"]) -> None:
+    """
+    Generates csv file of data set.
+    If there are several workers, and rows amount is large enough -
+    rows are split to shards, generated in separate processes, and then concatenated.
+    If data set has seed - the same file is generated for the same seed, chunk size and schema,
+    no matter how many workers are used. Chunks of large rows are made smaller by limit_chunk_size.
+    If data set has fingerprint - file is taken from cache of generated files, when it is possible,
+    so fingerprint must be got for the same chunk size (see DataSet.generate_file).
+    If data set has compression - file is compressed while it is written, and has extension of compression.
+    If data set has columnar format (parquet or arrow) - file of this format is generated instead of csv.
+    File is placed by allocate_data_set_file, so name of it is got without probing of existing files.
+    Content is written to temporary file beside, synced to disk every fsync_bytes, and renamed to the final name
+    only when it is complete, so half-written file is never seen under the final name.
+    While file is generated, rows and bytes written and throughput are saved to data set
+    not more often than once per progress_interval seconds.
+    If generating fails - reason of failure is saved to data set, time of finish is saved in any case.
+    """
+    path = allocate_data_set_file(data_set)
+    absolute_path = os.path.abspath(os.path.join(MEDIA_ROOT, path))
+
+    temporary_path = f'{absolute_path}.tmp'
 
     try:
         # Generating file
-        with open(absolute_path, 'w', newline='') as csvfile:
-            writer = csv.DictWriter(
-                csvfile,
-                fieldnames=data_set.schema.column_headers,
-                delimiter=data_set.schema.delimiter.char,
-                quotechar=data_set.schema.quotechar.char,
-                quoting=csv.QUOTE_MINIMAL,
-            )
-            writer.writeheader()
-
-            data_generator = data_set.schema.get_data_generator()
-            for _ in range(rows_amount):
-                writer.writerow(data_generator())
-    except:
-        # Deleting file from file system, if failed to write content in it
-        if os.path.exists(absolute_path):
-            os.remove(absolute_path)
+        if data_set.fingerprint and generated_file_cache.get(data_set.fingerprint, absolute_path):
+            data_set.from_cache = True
+            data_set.rows_written = rows_amount
+            data_set.bytes_written = os.path.getsize(absolute_path)
+        else:
+            progress = ProgressReporter(data_set.save_progress, progress_interval)
+            _write_file(data_set, temporary_path, rows_amount, chunk_size, workers, min_shard_rows, progress,
+                        fsync_bytes)
+            sync_file(temporary_path)
+            os.replace(temporary_path, absolute_path)
+            sync_directory(os.path.dirname(absolute_path))
+            progress.flush()
+
+            if data_set.fingerprint:
+                try:
+                    generated_file_cache.put(data_set.fingerprint, absolute_path)
+                except OSError:
+                    logger.exception("Generated file %s was not added to cache.", path)
+    except Exception as e:
+        logger.exception("Generating of file %s failed.", path)
+        data_set.error = f'{type(e).__name__}: {e}'
     else:
-        # Setting new file ti FileField of Data Set
+        # Setting new file to FileField of Data Set
         data_set.file.name = path
     finally:
+        # Deleting files from file system, if failed to generate content
+        if not data_set.file:
+            for file_path in (temporary_path, absolute_path):
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+
         # Writing to db that file generating process is finished
         data_set.finished = True
+        data_set.time_finished = timezone.now()
         data_set.save()
@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+
+class GenerationPlan:
+    """
+    Compiled plan of generating rows of schema: ordered columns, their data types and cell generators,
+    with generation functions bound to limits, source data and settings.
+    Plan does not change after compiling, so it is shared by all data generators of schema in process.
+    """
+    def __init__(self, schema_columns):
+        schema_columns = list(schema_columns)
+        # Source data is loaded once for all columns, that use it
+        loaded_source_data = {}
+        self.column_names = [column.name for column in schema_columns]
+        self.data_types = [column.data_type for column in schema_columns]
+        self.cell_generators = [column.get_data_generator(loaded_source_data) for column in schema_columns]
+        self.source_types = list(loaded_source_data)
+        self._generation_functions = [gen.generate for gen in self.cell_generators]
+
+    def generate_row(self) -> dict:
+        """Generates data of one row in dict format {column_name: value_in_this_row}."""
+        return dict(zip(self.column_names, [generate() for generate in self._generation_functions]))
+
+
+class GenerationPlanCache:
+    """
+    Process level cache of compiled generation plans, keyed by schemas.
+    Every plan is stored with version of columns of schema and versions of source data, used by plan.
+    If any of them changes - plan is compiled again. Least recently used plans are evicted, when cache is full.
+    """
+    def __init__(self, max_size: int = 128):
+        self.max_size = max_size
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_plan(self, schema_pk: int, columns_version: str, compile_plan: Callable,
+                 get_source_version: Callable) -> GenerationPlan:
+        """
+        Returns plan of schema, compiling it with compile_plan, if there is no actual plan in cache.
+        compile_plan must return plan and versions of its source data, read before source data was loaded.
+        """
+        with self._lock:
+            cached = self._plans.get(schema_pk)
+            if cached is not None:
+                self._plans.move_to_end(schema_pk)
+
+        if cached is not None:
+            cached_columns_version, source_versions, plan = cached
+            if cached_columns_version == columns_version and all(
+                    get_source_version(source_type) == version for source_type, version in source_versions.items()):
+                return plan
+
+        plan, source_versions = compile_plan()
+        with self._lock:
+            self._plans[schema_pk] = (columns_version, source_versions, plan)
+            self._plans.move_to_end(schema_pk)
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+        return plan
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+
+generation_plan_cache = GenerationPlanCache()
@@ -1,9 +1,22 @@
+import inspect
 from typing import Callable
 
-from . import data_generation
+from schemas.settings import DATA_GENERATION_SETTINGS
+from . import data_generation, batch_generation, unique_generation
 
 
 class GenerationManager:
+    # Sections of DATA_GENERATION_SETTINGS with settings of data types
+    SETTINGS_SECTIONS = {
+        'EMAIL': 'EML',
+        'DOMAIN_NAME': 'DMN',
+        'PHONE_NUMBER': 'PHN',
+        'COMPANY_NAME': 'CNM',
+        'TEXT': 'TXT',
+        'ADDRESS': 'ADR',
+        'DATE': 'DTE',
+    }
+
     @staticmethod
     def get_generation_method(data_type_name: str) -> Callable:
         method_name = 'generate_' + data_type_name.lower()
@@ -12,6 +25,25 @@ class GenerationManager:
             raise AttributeError(f"Data generator with name {method_name} was not found")
         return generation_method
 
+    @staticmethod
+    def get_batch_generation_method(data_type_name: str) -> [Callable, None]:
+        method_name = 'generate_' + data_type_name.lower() + '_batch'
+        return getattr(batch_generation, method_name, None)
+
+    @staticmethod
+    def get_unique_generation_method(data_type_name: str) -> [Callable, None]:
+        method_name = 'generate_' + data_type_name.lower() + '_unique'
+        return getattr(unique_generation, method_name, None)
+
+    @classmethod
+    def get_unique_capacity(cls, data_type_name: str, have_limits: bool, minimal: [int, None],
+                            maximal: [int, None]) -> int:
+        """Returns amount of distinct values of data type with limits, 0 if its values can not be unique."""
+        capacity_method = getattr(unique_generation, 'get_' + data_type_name.lower() + '_unique_capacity', None)
+        if capacity_method is None:
+            return 0
+        return capacity_method(**cls.get_generation_kwargs(have_limits, minimal, maximal, None))
+
     @classmethod
     def get_generation_kwargs(cls, have_limits: bool, minimal: [int, None], maximal: [int, None],
                               source_data: [dict, None]) -> dict:
@@ -27,3 +59,15 @@ class GenerationManager:
             kwargs.update(source_data)
 
         return kwargs
+
+    @classmethod
+    def get_settings_kwargs(cls, data_type_name: str, generation_method: Callable) -> dict:
+        """
+        Returns current values of settings of data type, which generation method takes as keyword only parameters
+        (named as settings in lowercase), so they could be bound to method once.
+        """
+        section = DATA_GENERATION_SETTINGS.get(cls.SETTINGS_SECTIONS.get(data_type_name), {})
+        parameters = inspect.signature(generation_method).parameters
+
+        return {name.lower(): value for name, value in section.items()
+                if name.lower() in parameters and parameters[name.lower()].kind == inspect.Parameter.KEYWORD_ONLY}
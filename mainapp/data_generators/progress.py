@@ -0,0 +1,35 @@
+import time
+from typing import Callable
+
+
+class ProgressReporter:
+    """
+    Accumulates amounts of rows and bytes, written while generating of file, and reports them with throughput
+    not more often than once per interval (in seconds), so reporting costs almost nothing, however often it is called.
+    Report function takes rows written, bytes written and rows per second.
+    """
+    def __init__(self, report: Callable[[int, int, float], None], interval: float):
+        self._report = report
+        self.interval = interval
+        self.rows_written = 0
+        self.bytes_written = 0
+        self._start = time.monotonic()
+        self._last_report = self._start
+
+    def add(self, rows: int, size: int) -> None:
+        self.set(self.rows_written + rows, self.bytes_written + size)
+
+    def set(self, rows_written: int, bytes_written: int) -> None:
+        self.rows_written = rows_written
+        self.bytes_written = bytes_written
+
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self.flush()
+
+    def flush(self) -> None:
+        """Reports current progress regardless of interval."""
+        seconds = time.monotonic() - self._start
+        rows_per_second = self.rows_written / seconds if seconds > 0 else 0.0
+        self._report(self.rows_written, self.bytes_written, rows_per_second)
@@ -0,0 +1,102 @@
+"""
+Sampling of values of source data, with optional weights (relative frequencies of values).
+
+Weighted values are sampled by Walker's alias method: tables are built once, when values are loaded to cache,
+and then every value is taken in O(1), no matter how many values there are - one by one or by whole batch.
+Values without weights (or with equal weights) are sampled uniformly, the same way as plain lists.
+"""
+from random import choice, random
+from typing import Iterable, Sequence
+
+import numpy as np
+
+
+def build_alias_tables(weights: Sequence[float]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns tables of alias method (Vose's version) for weights: probabilities of keeping of every index and aliases.
+    Index i is taken with probability probabilities[i], else alias[i] is taken instead.
+    """
+    amount = len(weights)
+    scaled = np.asarray(weights, dtype=np.float64) * amount / np.sum(weights)
+    probabilities = np.ones(amount)
+    aliases = np.arange(amount)
+
+    small = [i for i in range(amount) if scaled[i] < 1]
+    large = [i for i in range(amount) if scaled[i] >= 1]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        probabilities[less] = scaled[less]
+        aliases[less] = more
+        # The large one gives the rest of probability of the small one's column
+        scaled[more] -= 1 - scaled[less]
+        (small if scaled[more] < 1 else large).append(more)
+    # Rest ones have probability 1 up to rounding errors
+    return probabilities, aliases
+
+
+class SourceValues(tuple):
+    """
+    Tuple of values of source data with their weights. Weights are None, if all values are equally likely.
+    Sampling tables are built once on creation, so values should be created once per loading of source data.
+    """
+    def __new__(cls, values: Iterable[str], weights: [Iterable[float], None] = None):
+        return super().__new__(cls, values)
+
+    def __init__(self, values: Iterable[str], weights: [Iterable[float], None] = None):
+        super().__init__()
+        weights = list(weights) if weights is not None else None
+        if weights is not None:
+            if len(weights) != len(self):
+                raise ValueError("Amount of weights must be equal to amount of values")
+            if any(weight < 0 for weight in weights) or (self and not sum(weights) > 0):
+                raise ValueError("Weights must be not negative, and at least one of them positive")
+            if len(set(weights)) <= 1:
+                weights = None
+        self.weights = weights
+        self.array = np.asarray(self, dtype=object)
+
+        self._probabilities = self._aliases = None
+        if weights is not None:
+            self._probabilities, self._aliases = build_alias_tables(weights)
+            self._probabilities_list = self._probabilities.tolist()
+            self._aliases_list = self._aliases.tolist()
+
+    def __reduce__(self):
+        # Values are pickled to processes of shards with weights, tables are built there again
+        return self.__class__, (tuple(self), self.weights)
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[tuple[str, float]]) -> 'SourceValues':
+        pairs = list(pairs)
+        return cls([value for value, _ in pairs], [weight for _, weight in pairs])
+
+    def choice(self) -> str:
+        if self.weights is None:
+            return choice(self)
+
+        # One random number gives both index and probability of keeping it
+        position = random() * len(self)
+        i = int(position)
+        if position - i >= self._probabilities_list[i]:
+            i = self._aliases_list[i]
+        return self[i]
+
+    def choose_batch(self, rng: np.random.Generator, size: int) -> list[str]:
+        indexes = rng.integers(0, len(self), size)
+        if self.weights is not None:
+            indexes = np.where(rng.random(size) < self._probabilities[indexes], indexes, self._aliases[indexes])
+        return self.array[indexes].tolist()
+
+
+def choose_value(values: Sequence[str]) -> str:
+    """Returns random value of values, taking their weights into account, if they are SourceValues."""
+    if isinstance(values, SourceValues):
+        return values.choice()
+    return choice(values)
+
+
+def choose_values(rng: np.random.Generator, size: int, values: Sequence[str]) -> list[str]:
+    """Returns size random values of values by numpy random generator, taking weights into account, as choose_value."""
+    if isinstance(values, SourceValues):
+        return values.choose_batch(rng, size)
+    return np.asarray(values, dtype=object)[rng.integers(0, len(values), size)].tolist()
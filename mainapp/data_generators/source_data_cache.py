@@ -0,0 +1,32 @@
+import threading
+from typing import Callable
+
+
+class SourceDataCache:
+    """
+    Process level cache of source data values, stored as tuples (or SourceValues with weights), keyed by source type.
+    Every value is stored with version of source data, for which it was loaded.
+    If version changes - values are loaded again.
+    """
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def get_values(self, source_type: str, version: str, load_values: Callable) -> tuple[str, ...]:
+        cached = self._values.get(source_type)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        values = load_values()
+        if not isinstance(values, tuple):
+            values = tuple(values)
+        with self._lock:
+            self._values[source_type] = (version, values)
+        return values
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+source_data_cache = SourceDataCache()
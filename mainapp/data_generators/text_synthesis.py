@@ -0,0 +1,76 @@
+"""
+Fast synthesis of random ascii text for functions of data_generation.py.
+
+Letters are made from random bytes by translation table in bulk, instead of choosing every letter separately,
+and lengths of all words are drawn by one call. Random bytes and lengths are taken from generator of module random,
+so values are random the same way, as they were, when every letter was chosen by randint.
+"""
+from random import choices, randbytes
+
+LETTERS = b'abcdefghijklmnopqrstuvwxyz'
+
+# Every byte is mapped to letter by remainder of division, bytes after the last whole set of letters are deleted,
+# so all letters are equally likely
+_LETTERS_TABLE = bytes(LETTERS[byte % len(LETTERS)] for byte in range(256))
+_DELETED_BYTES = bytes(range(256 - 256 % len(LETTERS), 256))
+
+
+def _random_letter_bytes(amount: int) -> bytes:
+    letters = randbytes(amount).translate(_LETTERS_TABLE, _DELETED_BYTES)
+    while len(letters) < amount:
+        # About 9% of bytes are deleted, so missing letters are drawn with a margin
+        missing = amount - len(letters)
+        letters += randbytes(missing + missing // 8 + 1).translate(_LETTERS_TABLE, _DELETED_BYTES)
+    return letters[:amount]
+
+
+def random_letters(amount: int) -> str:
+    """Returns string of amount random lowercase letters."""
+    return _random_letter_bytes(amount).decode('ascii')
+
+
+def random_lengths(amount: int, minimal: int, maximal: int) -> list[int]:
+    """Returns amount random lengths from minimal to maximal, both included."""
+    if amount and minimal > maximal:
+        raise ValueError(f"Empty range of lengths ({minimal}, {maximal})")
+    return choices(range(minimal, maximal + 1), k=amount)
+
+
+def random_words(lengths: list[int], separator: str = ' ') -> str:
+    """Returns random words of given lengths, joined by separator."""
+    letters = random_letters(sum(lengths))
+    if len(lengths) == 1:
+        return letters
+
+    bounds = [0] * (len(lengths) + 1)
+    for i, length in enumerate(lengths):
+        bounds[i + 1] = bounds[i] + length
+    return separator.join(letters[start:end] for start, end in zip(bounds, bounds[1:]))
+
+
+def random_sentences(words_amounts: list[int], word_length: int) -> str:
+    """
+    Returns sentences with given amounts of words of word_length letters, separated by spaces.
+    Sentence starts with capital letter and ends with dot (sentence without words is just dot).
+    """
+    step = word_length + 1
+    words_total = sum(words_amounts)
+    letters = _random_letter_bytes(words_total * word_length)
+    # Every word takes its letters and one separator after them
+    text = bytearray(b' ') * (words_total * step)
+    for offset in range(word_length):
+        text[offset::step] = letters[offset::word_length]
+
+    # Sentences are processed from the end, so dots of empty sentences can be inserted without moving next positions
+    end = len(text)
+    for words_amount in reversed(words_amounts):
+        if not words_amount:
+            text[end:end] = b'.'
+            continue
+        start = end - words_amount * step
+        text[end - 1] = ord('.')
+        if word_length:
+            text[start] -= ord('a') - ord('A')
+        end = start
+    # Every dot is followed by space, which separates sentences, except the last one
+    return text.replace(b'.', b'. ')[:-1].decode('ascii')
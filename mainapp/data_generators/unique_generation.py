@@ -0,0 +1,138 @@
+import numpy as np
+
+from schemas.settings import DATA_GENERATION_SETTINGS
+from .batch_generation import _choose, _generate_words
+
+"""
+Generating of values of unique columns, which are distinct in the whole data set.
+Value of row is made from position of row in data set, permuted by keyed pseudo random permutation,
+so values are distinct without storing of generated ones, and every chunk (in any process) is generated independently.
+Function's name must be the name of function for generating one value with suffix '_unique'.
+Function must take numpy random Generator, positions of rows, rows amount of data set and seed sequence of column
+as first four parameters, and then limits, if data type has them, and settings as keyword only parameters,
+as in batch_generation.py. The function must return list of strings.
+For every such function must be function with name with prefix 'get_' and suffix '_unique_capacity' instead,
+which takes limits and returns amount of distinct values, which data type can have.
+"""
+
+first_letter_code = ord('a')
+letters_amount = 26
+
+EMAIL_SETTINGS = DATA_GENERATION_SETTINGS["EML"]
+DOMAIN_NAME_SETTINGS = DATA_GENERATION_SETTINGS["DMN"]
+
+
+class FeistelPermutation:
+    """
+    Keyed pseudo random permutation of integers from 0 to size - 1.
+    Balanced Feistel network permutes integers of the smallest even amount of bits, which covers size,
+    and values out of range are permuted again (cycle walking), so it stays bijection of range.
+    Only round keys are stored, no matter how large range is.
+    """
+    ROUNDS = 4
+
+    def __init__(self, size: int, seed_sequence: np.random.SeedSequence):
+        if not 0 < size <= 2 ** 63:
+            raise ValueError(f"Size of permutation must be from 1 to 2 ** 63, not {size}")
+        self.size = size
+        self.half_bits = np.uint64((max(2, (size - 1).bit_length()) + 1) // 2)
+        self.mask = np.uint64((1 << int(self.half_bits)) - 1)
+        self.keys = seed_sequence.generate_state(self.ROUNDS, dtype=np.uint64)
+
+    def _round(self, right: np.ndarray, key: np.uint64) -> np.ndarray:
+        # Mixing function of splitmix64, integers wrap on overflow
+        x = (right + key) * np.uint64(0x9E3779B97F4A7C15)
+        x ^= x >> np.uint64(30)
+        x *= np.uint64(0xBF58476D1CE4E5B9)
+        x ^= x >> np.uint64(27)
+        return x & self.mask
+
+    def _permute(self, values: np.ndarray) -> np.ndarray:
+        left, right = values >> self.half_bits, values & self.mask
+        for key in self.keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self.half_bits) | right
+
+    def __call__(self, positions: np.ndarray) -> np.ndarray:
+        values = self._permute(np.asarray(positions, dtype=np.uint64))
+        out_of_range = np.flatnonzero(values >= np.uint64(self.size))
+        while out_of_range.size:
+            values[out_of_range] = self._permute(values[out_of_range])
+            out_of_range = out_of_range[values[out_of_range] >= np.uint64(self.size)]
+        return values
+
+
+def check_unique_capacity(column_name: str, capacity: int, rows_amount: int) -> None:
+    if rows_amount > capacity:
+        raise ValueError(f"Column {column_name} can have only {capacity} distinct values, "
+                         f"which is less than {rows_amount} rows")
+
+
+def _get_counter_width(rows_amount: int) -> int:
+    """Returns amount of letters, enough to write rows_amount different counters."""
+    width = 1
+    while letters_amount ** width < rows_amount:
+        width += 1
+    return width
+
+
+def _generate_words_with_counters(rng: np.random.Generator, positions: np.ndarray, rows_amount: int,
+                                  seed_sequence: np.random.SeedSequence, minimal: int, maximal: int) -> list[str]:
+    """
+    Generates words, which are distinct for different positions: every word ends with permuted position, written
+    by letters with fixed width, after random letters. Words are not shorter than width of counter.
+    """
+    width = _get_counter_width(rows_amount)
+    counters = FeistelPermutation(letters_amount ** width, seed_sequence)(positions)
+
+    codes = np.empty((len(counters), width), dtype=np.uint8)
+    for i in reversed(range(width)):
+        codes[:, i] = counters % np.uint64(letters_amount) + np.uint64(first_letter_code)
+        counters //= np.uint64(letters_amount)
+    counters_letters = codes.tobytes().decode('ascii')
+
+    prefixes = _generate_words(rng, len(positions), max(0, minimal - width), maximal - width)
+    return [prefix + counters_letters[i * width:(i + 1) * width] for i, prefix in enumerate(prefixes)]
+
+
+def get_integer_unique_capacity(minimal: int, maximal: int) -> int:
+    return max(0, maximal - minimal + 1)
+
+
+def generate_integer_unique(rng: np.random.Generator, positions: np.ndarray, rows_amount: int,
+                            seed_sequence: np.random.SeedSequence, minimal: int, maximal: int) -> list[str]:
+    values = FeistelPermutation(get_integer_unique_capacity(minimal, maximal), seed_sequence)(positions)
+    return list(map(str, (values.astype(np.int64) + minimal).tolist()))
+
+
+def get_email_unique_capacity() -> int:
+    return letters_amount ** EMAIL_SETTINGS["MAX_EMAIL_NAME_LENGTH"]
+
+
+def generate_email_unique(rng: np.random.Generator, positions: np.ndarray, rows_amount: int,
+                          seed_sequence: np.random.SeedSequence, *,
+                          min_email_name_length: int = EMAIL_SETTINGS["MIN_EMAIL_NAME_LENGTH"],
+                          max_email_name_length: int = EMAIL_SETTINGS["MAX_EMAIL_NAME_LENGTH"],
+                          email_domains: list[str] = EMAIL_SETTINGS["EMAIL_DOMAINS"]) -> list[str]:
+    # Names are distinct, so emails are distinct with any domains
+    email_names = _generate_words_with_counters(rng, positions, rows_amount, seed_sequence,
+                                                min_email_name_length, max_email_name_length)
+    email_domains = _choose(rng, len(positions), email_domains)
+
+    return [email_name + '@' + email_domain for email_name, email_domain in zip(email_names, email_domains)]
+
+
+def get_domain_name_unique_capacity() -> int:
+    return letters_amount ** DOMAIN_NAME_SETTINGS["MAX_DOMAIN_NAME_LENGTH"]
+
+
+def generate_domain_name_unique(rng: np.random.Generator, positions: np.ndarray, rows_amount: int,
+                                seed_sequence: np.random.SeedSequence, *,
+                                min_domain_name_length: int = DOMAIN_NAME_SETTINGS["MIN_DOMAIN_NAME_LENGTH"],
+                                max_domain_name_length: int = DOMAIN_NAME_SETTINGS["MAX_DOMAIN_NAME_LENGTH"],
+                                top_level_domains: list[str] = DOMAIN_NAME_SETTINGS["TOP_LEVEL_DOMAINS"]) -> list[str]:
+    second_level_domains = _generate_words_with_counters(rng, positions, rows_amount, seed_sequence,
+                                                         min_domain_name_length, max_domain_name_length)
+    top_level_domains = _choose(rng, len(positions), top_level_domains)
+
+    return [second_level + '.' + top_level for second_level, top_level in zip(second_level_domains, top_level_domains)]
@@ -0,0 +1,205 @@
+"""
+Serving of generated files for downloading.
+
+Files are served either by web server (nginx by X-Accel-Redirect, Apache or lighttpd by X-Sendfile), if offload is
+set in DATA_GENERATION_SETTINGS["DOWNLOAD"], so Django only checks permissions, or by Django itself,
+with strong ETag, Last-Modified and single byte range, so interrupted downloads can be resumed,
+and download managers can fetch parts of file in parallel.
+Under ASGI streaming responses are sent by async iterators, so their content is never held in memory as a whole.
+"""
+import mimetypes
+import os
+from typing import AsyncIterator, Iterable
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+from schemas.settings import DATA_GENERATION_SETTINGS, MEDIA_ROOT
+
+DOWNLOAD_SETTINGS = DATA_GENERATION_SETTINGS["DOWNLOAD"]
+
+OFFLOAD_X_ACCEL_REDIRECT = 'x-accel-redirect'
+OFFLOAD_X_SENDFILE = 'x-sendfile'
+
+
+def get_content_type(filename: str) -> str:
+    """Guesses content type by name of file. Compressed files are typed as archives, as FileResponse does."""
+    content_type, encoding = mimetypes.guess_type(filename)
+    content_type = {
+        'bzip2': 'application/x-bzip',
+        'gzip': 'application/gzip',
+        'xz': 'application/x-xz',
+    }.get(encoding, content_type)
+    return content_type or 'application/octet-stream'
+
+
+def get_etag(stat: os.stat_result, content_encoding: str = '') -> str:
+    """Strong ETag by time of modification and size of file, file sent with content encoding has its own ETag."""
+    etag = f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+    if content_encoding:
+        etag += f'-{content_encoding}'
+    return f'"{etag}"'
+
+
+def parse_range(header: str, size: int) -> [tuple[int, int], None]:
+    """
+    Returns first and last positions of single byte range from header Range, limited by size of file.
+    Returns None, if header is not single valid byte range, so the whole file must be sent.
+    Raises ValueError, if range can not be satisfied: it starts after the end of file, or is empty suffix.
+    """
+    unit, _, ranges = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in ranges:
+        return None
+
+    first, _, last = ranges.strip().partition('-')
+    try:
+        first = int(first) if first else None
+        last = int(last) if last else None
+    except ValueError:
+        return None
+
+    if first is None:
+        # Suffix range: last bytes of file
+        if last is None or last < 0:
+            return None
+        if last == 0 or size == 0:
+            raise ValueError('Range is not satisfiable')
+        return max(0, size - last), size - 1
+
+    if first < 0 or (last is not None and last < first):
+        return None
+    if first >= size:
+        raise ValueError('Range is not satisfiable')
+    return first, size - 1 if last is None else min(last, size - 1)
+
+
+def if_range_matches(header: [str, None], etag: str, last_modified: int) -> bool:
+    """
+    Checks header If-Range: range is sent only if file is not changed since client got its part,
+    that is its ETag is the same (strong comparison), or time of its modification is the same.
+    """
+    if header is None:
+        return True
+    header = header.strip()
+    if header.startswith(('"', 'W/')):
+        return header == etag
+    return parse_http_date_safe(header) == last_modified
+
+
+def iter_file_range(file, first: int, length: int, chunk_bytes: int = FileResponse.block_size):
+    file.seek(first)
+    while length > 0:
+        chunk = file.read(min(chunk_bytes, length))
+        if not chunk:
+            break
+        length -= len(chunk)
+        yield chunk
+
+
+def _read_part(iterator, part_bytes: int) -> bytes:
+    part = bytearray()
+    for chunk in iterator:
+        part += chunk
+        if len(part) >= part_bytes:
+            break
+    return bytes(part)
+
+
+async def iter_async(chunks: Iterable[bytes],
+                     part_bytes: int = DOWNLOAD_SETTINGS["ASYNC_PART_BYTES"]) -> AsyncIterator[bytes]:
+    """Yields content of sync iterable by parts of about part_bytes, read in thread, so event loop is not blocked."""
+    iterator = iter(chunks)
+    read_part = sync_to_async(_read_part, thread_sensitive=False)
+    while part := await read_part(iterator, part_bytes):
+        yield part
+
+
+def adapt_streaming_response(request, response: HttpResponse) -> HttpResponse:
+    """
+    Under ASGI Django reads sync iterator of streaming response to list, before sending it, so multi-GB file
+    would be held in memory: content of streaming response is given to it by async iterator instead.
+    Under WSGI response is not changed, as Django would read async iterator to list as well.
+    """
+    if isinstance(request, ASGIRequest) and response.streaming and not response.is_async:
+        response.streaming_content = iter_async(response.streaming_content)
+    return response
+
+
+def _send_file(request, path: str, filename: str, content_type: str, size: int,
+               byte_range: [tuple[int, int], None]) -> HttpResponse:
+    first, last = byte_range if byte_range is not None else (0, size - 1)
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+    else:
+        file = open(path, 'rb')
+        response = FileResponse(file, as_attachment=True, filename=filename, content_type=content_type)
+        if byte_range is not None:
+            response.streaming_content = iter_file_range(file, first, last - first + 1)
+
+    response['Content-Length'] = last - first + 1
+    if byte_range is not None:
+        response.status_code = 206
+        response['Content-Range'] = f'bytes {first}-{last}/{size}'
+    return response
+
+
+def _offload_file(path: str, filename: str, content_type: str, offload: str) -> HttpResponse:
+    """
+    Returns response, which tells web server to send file at path.
+    Path is percent-encoded, so header is ascii (Django would MIME-encode not ascii header) and is valid URI:
+    nginx decodes URI of X-Accel-Redirect, and Apache decodes X-Sendfile (XSendFileUnescape is on by default).
+    Names of generated files are ascii without spaces already, so their paths stay the same.
+    """
+    response = HttpResponse(content_type=content_type)
+    if offload == OFFLOAD_X_ACCEL_REDIRECT:
+        relative_path = os.path.relpath(path, MEDIA_ROOT).replace(os.sep, '/')
+        response['X-Accel-Redirect'] = DOWNLOAD_SETTINGS["OFFLOAD_URL"].rstrip('/') + '/' + quote(relative_path)
+    else:
+        response['X-Sendfile'] = quote(path)
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    return response
+
+
+def serve_file(request, path: str, filename: str, content_type: str = None, content_encoding: str = '',
+               offload: str = None) -> HttpResponse:
+    """
+    Returns response with file at path as attachment with filename.
+    If content_encoding is set - file is sent with header Content-Encoding, so browser decodes it by itself.
+    If offload is set (by default it is taken from settings) - file is sent by web server,
+    else by Django with support of conditional, range (with If-Range) and HEAD requests.
+    """
+    content_type = content_type or get_content_type(filename)
+    if offload is None:
+        offload = DOWNLOAD_SETTINGS["OFFLOAD"]
+
+    if offload:
+        response = _offload_file(path, filename, content_type, offload)
+    else:
+        stat = os.stat(path)
+        etag = get_etag(stat, content_encoding)
+        last_modified = int(stat.st_mtime)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            try:
+                byte_range = None
+                if if_range_matches(request.headers.get('If-Range'), etag, last_modified):
+                    byte_range = parse_range(request.headers.get('Range', ''), stat.st_size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{stat.st_size}'
+            else:
+                response = _send_file(request, path, filename, content_type, stat.st_size, byte_range)
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Accept-Ranges'] = 'bytes'
+
+    if content_encoding:
+        response['Content-Encoding'] = content_encoding
+    return adapt_streaming_response(request, response)
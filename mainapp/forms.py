@@ -67,6 +67,8 @@ class BaseColumnInlineFormSet(forms.BaseInlineFormSet):
     deletion_widget = forms.HiddenInput
 
     def save(self, commit=True):
+        # Every saving, deletion and bulk update of columns changes version of columns of schema,
+        # so cached generation plan of schema is compiled again
         instances = super().save(commit=True)
 
         columns_with_changed_order = []
@@ -89,18 +91,20 @@ class BaseColumnInlineFormSet(forms.BaseInlineFormSet):
 ColumnFormSet = forms.inlineformset_factory(
     Schema, Column,
     formset=BaseColumnInlineFormSet,
-    fields=('name', 'data_type', 'minimal', 'maximal'),
+    fields=('name', 'data_type', 'minimal', 'maximal', 'unique'),
     labels={
         'name': 'Column name',
         'data_type': 'Type',
         'minimal': 'From',
         'maximal': 'To',
+        'unique': 'Unique',
     },
     widgets={
         'name': forms.TextInput(attrs={'class': 'form-control form-control-sm'}),
         'data_type': forms.Select(attrs={'class': 'form-select form-select-sm'}),
         'minimal': forms.NumberInput(attrs={'class': 'form-control form-control-sm'}),
         'maximal': forms.NumberInput(attrs={'class': 'form-control form-control-sm'}),
+        'unique': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
     },
     extra=0,
     can_order=True,
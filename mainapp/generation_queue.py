@@ -0,0 +1,251 @@
+"""
+Local queue of data sets, waiting for generating of their files.
+
+Queue is stored in db: data set is queued, when it is not finished and time of its start is not set.
+Worker claims data set by setting time of start with conditional update, so several workers
+(even running in different processes) never generate the same data set twice.
+While data set is generated, its worker updates its time of update (heartbeat), so data sets of crashed workers
+are found by stale time of update, and other workers keep running, while they are recovered.
+"""
+import logging
+import multiprocessing
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Optional
+
+from django.contrib.auth.models import User
+from django.db import connection, connections, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from schemas.settings import DATA_GENERATION_SETTINGS
+from .data_generators.columnar_generation import get_available_columnar_formats
+from .data_generators.compression import get_available_compressions
+from .data_generators.file_generation import remove_data_set_leftovers
+from .models import DataSet
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SETTINGS = DATA_GENERATION_SETTINGS["QUEUE"]
+
+
+def clean_generation_options(rows, seed=None, compression: str = '', file_format: str = '') -> dict:
+    """
+    Returns valid options of generating of data set: rows amount, seed, compression and file format.
+    Raises ValueError with description, if any of them is invalid.
+    """
+    try:
+        rows_amount = int(rows)
+    except (TypeError, ValueError):
+        raise ValueError('Rows amount is not set')
+    if rows_amount < 1:
+        raise ValueError('Rows amount must be positive')
+
+    # Seed is optional, it makes generated file reproducible
+    if seed is not None and seed != '':
+        try:
+            seed = int(seed)
+        except (TypeError, ValueError):
+            raise ValueError('Seed must be integer')
+        if not 0 <= seed < 2 ** 63:
+            raise ValueError('Seed must be in range [0, 2^63)')
+    else:
+        seed = None
+
+    compression = compression or ''
+    if compression and compression not in get_available_compressions():
+        raise ValueError(f'Compression {compression} is not available')
+
+    # Columnar files are compressed by their own format, so only csv can be compressed
+    file_format = file_format or DataSet.FileFormat.CSV
+    if file_format != DataSet.FileFormat.CSV:
+        if file_format not in get_available_columnar_formats():
+            raise ValueError(f'Format {file_format} is not available')
+        if compression:
+            raise ValueError('Only csv files can be compressed')
+
+    return {'rows_amount': rows_amount, 'seed': seed, 'compression': compression, 'file_format': file_format}
+
+
+def enqueue_data_set(schema, rows_amount: int, seed: [int, None] = None, compression: str = '',
+                     file_format: str = DataSet.FileFormat.CSV) -> DataSet:
+    """Creates new data set of schema, which would be generated by one of workers."""
+    return DataSet.objects.create(schema=schema, rows_amount=rows_amount, seed=seed, compression=compression,
+                                  file_format=file_format)
+
+
+def enqueue_data_sets(jobs: list[tuple]) -> list[DataSet]:
+    """
+    Creates data sets by one query, for jobs given as pairs (schema, options from clean_generation_options).
+    Data sets are queued grouped by schemas, so worker generates data sets of schema one after another,
+    with compiled generation plan and loaded source data of schema, cached in its process.
+    Data sets are returned in order of jobs.
+    """
+    order = sorted(range(len(jobs)), key=lambda i: jobs[i][0].pk)
+    data_sets = DataSet.objects.bulk_create([DataSet(schema=jobs[i][0], **jobs[i][1]) for i in order])
+
+    ordered_data_sets = [None] * len(jobs)
+    for i, data_set in zip(order, data_sets):
+        ordered_data_sets[i] = data_set
+    return ordered_data_sets
+
+
+def _get_busy_owners(max_jobs_per_user: int):
+    """Subquery of users, who already have max_jobs_per_user data sets in processing."""
+    return DataSet.objects.filter(finished=False, time_started__isnull=False).\
+        values('schema__owner').annotate(jobs=Count('id')).filter(jobs__gte=max_jobs_per_user).\
+        values('schema__owner')
+
+
+def _claim_data_set(pk: int, owner_pk: int, max_jobs_per_user: int) -> bool:
+    """Marks queued data set as started, if its owner has less than max_jobs_per_user data sets in processing."""
+    with transaction.atomic():
+        if connection.features.has_select_for_update:
+            # Workers, claiming data sets of the same user, wait for each other, so only one of them checks limit
+            # at a time. Without SELECT FOR UPDATE (SQLite) writes are serialized by database itself
+            list(User.objects.select_for_update().filter(pk=owner_pk).values_list('pk', flat=True))
+        # Limit is checked by the same statement, that claims data set
+        return bool(DataSet.objects.filter(pk=pk, finished=False, time_started__isnull=True).
+                    exclude(schema__owner__in=_get_busy_owners(max_jobs_per_user)).
+                    update(time_started=timezone.now()))
+
+
+def claim_next_data_set(max_jobs_per_user: int, pks: Optional[list[int]] = None) -> Optional[DataSet]:
+    """
+    Marks the oldest queued data set as started and returns it.
+    Data sets of users, who already have max_jobs_per_user data sets in processing, are skipped.
+    If pks are given - only data sets with these pks are claimed.
+    Returns None if there is nothing to generate.
+    """
+    queued = DataSet.objects.filter(finished=False, time_started__isnull=True).\
+        exclude(schema__owner__in=_get_busy_owners(max_jobs_per_user))
+    if pks is not None:
+        queued = queued.filter(pk__in=pks)
+
+    for pk, owner_pk in queued.order_by('pk').values_list('pk', 'schema__owner')[:10]:
+        if _claim_data_set(pk, owner_pk, max_jobs_per_user):
+            return DataSet.objects.select_related('schema__delimiter', 'schema__quotechar').get(pk=pk)
+
+    return None
+
+
+def recover_orphaned_data_sets(stale_after: float = QUEUE_SETTINGS["STALE_AFTER"]) -> tuple[int, int]:
+    """
+    Handles data sets, which were left unfinished by crashed workers: they were not updated for stale_after seconds,
+    while workers update data sets in processing every HEARTBEAT_INTERVAL seconds.
+    Data sets with known rows amount are returned to queue, the rest are marked as failed.
+    Files, left by their generating, are removed, so requeued data set gets its file by pk again.
+    """
+    stale = DataSet.objects.filter(finished=False, time_update__lt=timezone.now() - timedelta(seconds=stale_after))
+    to_requeue = stale.filter(time_started__isnull=False, rows_amount__isnull=False)
+    to_fail = stale.filter(rows_amount__isnull=True)
+
+    for data_set in (to_requeue | to_fail).select_related('schema'):
+        removed = remove_data_set_leftovers(data_set)
+        if removed:
+            logger.info("Removed %s files, left by generating of data set %s.", removed, data_set.pk)
+
+    requeued = to_requeue.update(time_started=None)
+    failed = to_fail.update(finished=True, time_finished=timezone.now(),
+                            error='Generating was interrupted, worker stopped before file was complete')
+    return requeued, failed
+
+
+@contextmanager
+def heartbeat(data_set_pk: int, interval: float = QUEUE_SETTINGS["HEARTBEAT_INTERVAL"]):
+    """Updates time of update of data set every interval seconds in background thread, while context is active."""
+    stopped = threading.Event()
+
+    def beat():
+        try:
+            while not stopped.wait(interval):
+                DataSet.objects.filter(pk=data_set_pk, finished=False).update(time_update=timezone.now())
+        except Exception:
+            logger.exception("Heartbeat of data set %s failed.", data_set_pk)
+        finally:
+            # Connections are per thread, so only connection of this thread is closed
+            connections.close_all()
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def process_data_set(data_set: DataSet) -> None:
+    try:
+        with heartbeat(data_set.pk):
+            data_set.generate_file(data_set.rows_amount)
+    except Exception as e:
+        logger.exception("Generating of data set %s failed.", data_set.pk)
+        DataSet.objects.filter(pk=data_set.pk).update(finished=True, time_finished=timezone.now(),
+                                                      error=f'{type(e).__name__}: {e}')
+
+
+def run_worker(max_jobs_per_user: int = QUEUE_SETTINGS["MAX_JOBS_PER_USER"],
+               poll_interval: float = QUEUE_SETTINGS["POLL_INTERVAL"],
+               burst: bool = False, pks: Optional[list[int]] = None) -> None:
+    """
+    Generates queued data sets one by one, only data sets with pks, if they are given.
+    In burst mode worker stops, when queue is empty, otherwise it waits for new data sets forever.
+    """
+    while True:
+        data_set = claim_next_data_set(max_jobs_per_user, pks)
+
+        if data_set is None:
+            if burst:
+                return
+            time.sleep(poll_interval)
+            continue
+
+        process_data_set(data_set)
+
+
+def _run_worker_process(max_jobs_per_user, poll_interval, burst, pks):
+    # Connections inherited from parent process must not be used by child
+    connections.close_all()
+    run_worker(max_jobs_per_user=max_jobs_per_user, poll_interval=poll_interval, burst=burst, pks=pks)
+
+
+def run_worker_pool(workers: int = QUEUE_SETTINGS["WORKERS"],
+                    max_jobs_per_user: int = QUEUE_SETTINGS["MAX_JOBS_PER_USER"],
+                    poll_interval: float = QUEUE_SETTINGS["POLL_INTERVAL"],
+                    burst: bool = False, recover: bool = True, pks: Optional[list[int]] = None) -> None:
+    """
+    Recovers orphaned data sets (if recover is set) and starts workers. Single worker runs in current process.
+    Only stale data sets are recovered, so pool can be started, while other pools are running.
+    If pks are given - workers generate only data sets with these pks, and leave the rest of queue to other pools.
+    """
+    if workers < 1:
+        raise ValueError("Workers amount must be positive")
+
+    if recover:
+        requeued, failed = recover_orphaned_data_sets()
+        if requeued or failed:
+            logger.warning("Recovered orphaned data sets: %s requeued, %s marked as failed.", requeued, failed)
+
+    if workers == 1:
+        run_worker(max_jobs_per_user=max_jobs_per_user, poll_interval=poll_interval, burst=burst, pks=pks)
+        return
+
+    connections.close_all()
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=_run_worker_process, args=(max_jobs_per_user, poll_interval, burst, pks))
+                 for _ in range(workers)]
+
+    for process in processes:
+        process.start()
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
@@ -0,0 +1,50 @@
+from django.core.management import BaseCommand, CommandError
+
+from ...benchmarks import benchmark_compression, benchmark_write_buffers, get_representative_columns
+from ...data_generators.compression import get_available_compressions
+from ...models import Schema
+
+
+class Command(BaseCommand):
+    help = "Command for comparing throughput of writing and size of csv files, compressed with different codecs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("-r", "--rows", type=int, default=100000,
+                            help="Amount of rows in benchmarked file. Default is small, so slow codecs (xz) are "
+                                 "measured quickly, use 1000000 and more to measure files of production size: "
+                                 "sample of rows is repeated, so memory does not grow with rows amount.")
+        parser.add_argument("-s", "--schema", type=str,
+                            help="Slug of schema to benchmark, schema with columns of every type is used by default.")
+        parser.add_argument("-b", "--buffer-sizes", type=int, nargs="+",
+                            help="Sizes of write buffer in KB, to compare write syscalls and throughput with them.")
+
+    def handle(self, *args, **options):
+        if options['schema']:
+            try:
+                schema = Schema.objects.select_related('delimiter', 'quotechar').get(slug=options['schema'])
+            except Schema.DoesNotExist:
+                raise CommandError(f"Schema {options['schema']} does not exist.")
+            columns, delimiter, quotechar = list(schema.columns.all()), schema.delimiter.char, schema.quotechar.char
+        else:
+            columns, delimiter, quotechar = get_representative_columns(), ',', '"'
+
+        results = benchmark_compression(columns, options['rows'], ['', *get_available_compressions()],
+                                        delimiter, quotechar)
+
+        self.stdout.write(f"{'codec':<6}{'seconds':>10}{'MB/s':>10}{'size, MB':>12}{'ratio':>8}")
+        for result in results:
+            self.stdout.write(f"{result['compression']:<6}{result['seconds']:>10.3f}"
+                              f"{result['throughput'] / 1024 ** 2:>10.1f}{result['size'] / 1024 ** 2:>12.2f}"
+                              f"{result['ratio']:>8.2f}")
+
+        if options['buffer_sizes']:
+            results = benchmark_write_buffers(columns, options['rows'],
+                                              [size * 1024 for size in options['buffer_sizes']],
+                                              ['', *get_available_compressions()], delimiter, quotechar)
+
+            self.stdout.write(f"\n{'codec':<6}{'buffer, KB':>12}{'seconds':>10}{'MB/s':>10}{'writes':>10}")
+            for result in results:
+                writes = result['write_syscalls'] if result['write_syscalls'] is not None else '-'
+                self.stdout.write(f"{result['compression']:<6}{result['buffer_size'] // 1024:>12}"
+                                  f"{result['seconds']:>10.3f}{result['throughput'] / 1024 ** 2:>10.1f}"
+                                  f"{writes:>10}")
@@ -0,0 +1,58 @@
+import json
+
+from django.core.management import BaseCommand, CommandError
+
+from ...benchmarks import benchmark_data_types, benchmark_schemas, compare_results, get_environment, \
+    get_representative_columns
+
+
+class Command(BaseCommand):
+    help = "Command for measuring speed of generating of data by types of data, widths of schemas and rows amounts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("-t", "--type-rows", type=int, default=100000,
+                            help="Amount of values generated for every type of data.")
+        parser.add_argument("-w", "--widths", type=int, nargs="+", default=[1, 10, 50],
+                            help="Amounts of columns in benchmarked schemas.")
+        parser.add_argument("-r", "--rows", type=int, nargs="+", default=[1000, 100000],
+                            help="Amounts of rows in benchmarked schemas.")
+        parser.add_argument("-n", "--repeat", type=int, default=3, help="Times every benchmark is repeated.")
+        parser.add_argument("--no-files", action="store_true",
+                            help="Do not benchmark generating of files of data sets (it writes to db and media).")
+        parser.add_argument("-o", "--output", type=str, help="Path to json file for results.")
+        parser.add_argument("-c", "--compare", type=str,
+                            help="Path to json file with results of previous run, to compare with.")
+        parser.add_argument("--threshold", type=float, default=0.1,
+                            help="Part of speed, loss of which is reported as regression.")
+
+    def handle(self, *args, **options):
+        columns = get_representative_columns()
+        if not columns:
+            raise CommandError("No columns to benchmark.")
+
+        results = benchmark_data_types(columns, options['type_rows'], options['repeat'])
+        results += benchmark_schemas(columns, options['widths'], options['rows'], options['repeat'],
+                                     with_files=not options['no_files'])
+
+        self.stdout.write(f"{'benchmark':<10}{'name':<12}{'path':<7}{'rows':>9}{'rows/s':>14}{'MB/s':>9}")
+        for result in results:
+            self.stdout.write(f"{result['benchmark']:<10}{result['name']:<12}{result['path']:<7}{result['rows']:>9}"
+                              f"{result['rows_per_second']:>14.0f}{result['megabytes_per_second']:>9.2f}")
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump({'environment': get_environment(), 'results': results}, file, indent=2)
+
+        if options['compare']:
+            with open(options['compare']) as file:
+                baseline = json.load(file)['results']
+
+            regressions = compare_results(baseline, results, options['threshold'])
+            for regression in regressions:
+                self.stdout.write(f"Regression: {regression['benchmark']} {regression['name']} {regression['path']} "
+                                  f"{regression['rows']} rows - {regression['rows_per_second']:.0f} rows/s instead of "
+                                  f"{regression['baseline_rows_per_second']:.0f} ({regression['change']:.1%})")
+
+            if regressions:
+                raise CommandError(f"{len(regressions)} benchmarks became slower.")
+            self.stdout.write("No regressions.")
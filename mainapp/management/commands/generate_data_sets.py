@@ -0,0 +1,55 @@
+import json
+import sys
+
+from django.core.management import BaseCommand, CommandError
+
+from ...generation_queue import clean_generation_options, enqueue_data_sets, run_worker_pool, QUEUE_SETTINGS
+from ...models import Schema
+
+
+class Command(BaseCommand):
+    help = "Command for queueing of many data sets at once. Jobs are read from json file (or stdin, if it is '-'): " \
+           "list of objects with keys schema (slug), rows, and optional seed, file_format and compression. " \
+           "Ids of queued data sets are printed as json in order of jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("jobs_file", type=str, help="Path to json file with jobs, '-' for stdin.")
+        parser.add_argument("-w", "--workers", type=int, default=0,
+                            help="Generate queued data sets by pool of this amount of workers, "
+                                 "which generate only data sets of these jobs and stop, when none of them is left "
+                                 "in queue (by default data sets are only queued).")
+
+    def handle(self, *args, **options):
+        if options['jobs_file'] == '-':
+            jobs = json.load(sys.stdin)
+        else:
+            with open(options['jobs_file']) as file:
+                jobs = json.load(file)
+
+        if isinstance(jobs, dict):
+            jobs = jobs.get('jobs')
+        if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+            raise CommandError("Jobs must be list of objects.")
+
+        schemas = Schema.objects.filter(slug__in={job.get('schema') for job in jobs}).in_bulk(field_name='slug')
+        cleaned_jobs = []
+        for i, job in enumerate(jobs):
+            schema = schemas.get(job.get('schema'))
+            if schema is None:
+                raise CommandError(f"Job {i}: schema {job.get('schema')} does not exist.")
+            try:
+                generation_options = clean_generation_options(job.get('rows'), job.get('seed'), job.get('compression'),
+                                                              job.get('file_format'))
+                schema.check_unique_capacity(generation_options['rows_amount'])
+            except ValueError as e:
+                raise CommandError(f"Job {i}: {e}.")
+            cleaned_jobs.append((schema, generation_options))
+
+        data_sets = enqueue_data_sets(cleaned_jobs)
+        self.stdout.write(json.dumps([data_set.pk for data_set in data_sets]))
+
+        if options['workers'] > 0:
+            # Workers generate only data sets of these jobs, and do not recover data sets of other running workers
+            run_worker_pool(workers=options['workers'], max_jobs_per_user=max(QUEUE_SETTINGS["MAX_JOBS_PER_USER"],
+                                                                                options['workers']),
+                            burst=True, recover=False, pks=[data_set.pk for data_set in data_sets])
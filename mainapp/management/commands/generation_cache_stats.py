@@ -0,0 +1,24 @@
+from django.core.management import BaseCommand
+from django.db.models import Count, Q
+
+from ...data_generators.file_cache import generated_file_cache
+from ...models import DataSet
+
+
+class Command(BaseCommand):
+    help = "Command for reporting hit rate and size of cache of generated files."
+
+    def handle(self, *args, **options):
+        counts = DataSet.objects.exclude(fingerprint='').filter(finished=True).\
+            aggregate(requests=Count('id'), hits=Count('id', filter=Q(from_cache=True)))
+        requests, hits = counts['requests'], counts['hits']
+        hit_rate = hits / requests * 100 if requests else 0
+
+        entries = generated_file_cache.get_entries()
+        cache_size = sum(size for _, size in entries)
+
+        self.stdout.write(f"Seeded data sets: {requests}")
+        self.stdout.write(f"Taken from cache: {hits} ({hit_rate:.1f}%)")
+        self.stdout.write(f"Generated: {requests - hits}")
+        self.stdout.write(f"Cached files: {len(entries)}, "
+                          f"{cache_size / 1024 ** 2:.1f} of {generated_file_cache.max_size / 1024 ** 2:.1f} MB")
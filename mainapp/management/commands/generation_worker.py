@@ -0,0 +1,27 @@
+from django.core.management import BaseCommand
+
+from ...generation_queue import run_worker_pool, QUEUE_SETTINGS
+
+
+class Command(BaseCommand):
+    help = "Command for running pool of workers, which generate files of queued data sets."
+
+    def add_arguments(self, parser):
+        parser.add_argument("-w", "--workers", type=int, default=QUEUE_SETTINGS["WORKERS"],
+                            help="Amount of worker processes.")
+        parser.add_argument("-u", "--max-jobs-per-user", type=int, default=QUEUE_SETTINGS["MAX_JOBS_PER_USER"],
+                            help="Maximal amount of data sets of one user, generating at the same time.")
+        parser.add_argument("-i", "--poll-interval", type=float, default=QUEUE_SETTINGS["POLL_INTERVAL"],
+                            help="Seconds between checks of empty queue.")
+        parser.add_argument("-b", "--burst", action="store_true",
+                            help="Stop workers, when queue is empty.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Starting {options['workers']} generation worker(s)...")
+        run_worker_pool(
+            workers=options['workers'],
+            max_jobs_per_user=options['max_jobs_per_user'],
+            poll_interval=options['poll_interval'],
+            burst=options['burst'],
+        )
+        self.stdout.write("Generation workers stopped.")
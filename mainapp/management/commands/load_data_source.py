@@ -1,13 +1,16 @@
 import json
-from typing import List
+from typing import Dict, List, Union
 
 from django.core.management import BaseCommand
+from django.db import transaction
 
 from ...models import SourceData
 
 
 class Command(BaseCommand):
-    help = "Command for load source data for generating data, that need source, from json file to db."
+    help = "Command for load source data for generating data, that need source, from json file to db. " \
+           "Values of every type are list of strings, or object with values as keys and their weights " \
+           "(relative frequencies) as values."
 
     def add_arguments(self, parser):
         parser.add_argument("file_names", nargs="+", type=str, help="Paths to source files.")
@@ -36,20 +39,33 @@ class Command(BaseCommand):
             self._load_source_data_for_type(source_type, values, force)
             self.stdout.write(f"loading {source_type} to db was finished.")
 
-    def _load_source_data_for_type(self, source_type: str, values: List[str], force: bool):
+    def _load_source_data_for_type(self, source_type: str, values: Union[List[str], Dict[str, float]], force: bool):
         if not values:
             raise ValueError("No values for inserting.")
 
-        if not isinstance(values, list) or not all(map(lambda v: isinstance(v, str), values)):
-            raise TypeError("Values must be list of strings.")
+        if isinstance(values, dict):
+            if not all(isinstance(weight, (int, float)) and not isinstance(weight, bool)
+                       for weight in values.values()):
+                raise TypeError("Weights of values must be numbers.")
+            if any(weight < 0 for weight in values.values()) or not sum(values.values()) > 0:
+                raise ValueError("Weights of values must be not negative, and at least one of them positive.")
+            weights = list(values.values())
+            values = list(values)
+        elif not isinstance(values, list) or not all(map(lambda v: isinstance(v, str), values)):
+            raise TypeError("Values must be list of strings, or object with weights of values.")
+        else:
+            weights = [1] * len(values)
 
-        if SourceData.objects.filter(source_type=source_type).exists():
-            if force:
-                SourceData.objects.filter(source_type=source_type).delete()
-            else:
-                self.stdout.write(f"Source data of type {source_type} already exists in db."
-                                  f" If you want to rewrite it use option --force.")
-                return
+        # Every deletion and insertion changes version of source data, so it is done in one transaction
+        with transaction.atomic():
+            if SourceData.objects.filter(source_type=source_type).exists():
+                if force:
+                    SourceData.objects.filter(source_type=source_type).delete()
+                else:
+                    self.stdout.write(f"Source data of type {source_type} already exists in db."
+                                      f" If you want to rewrite it use option --force.")
+                    return
 
-        source_data_instances = [SourceData(source_type=source_type, source_data=value) for value in values]
-        SourceData.objects.bulk_create(source_data_instances)
+            source_data_instances = [SourceData(source_type=source_type, source_data=value, weight=weight)
+                                     for value, weight in zip(values, weights)]
+            SourceData.objects.bulk_create(source_data_instances)
@@ -0,0 +1,51 @@
+import os
+
+from django.core.management import BaseCommand
+
+from schemas.settings import MEDIA_ROOT
+from ...data_generators.file_generation import allocate_data_set_file, get_data_set_file_path
+from ...models import DataSet
+
+
+class Command(BaseCommand):
+    help = "Command for moving files of data sets, generated before, to directories by pk of data sets, " \
+           "in which new files are generated."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Only print files, which would be moved.")
+
+    def handle(self, *args, **options):
+        moved = 0
+        missing = 0
+        data_sets = DataSet.objects.exclude(file='').select_related('schema').only('file', 'compression',
+                                                                                  'file_format', 'schema__name')
+        for data_set in data_sets.iterator():
+            old_path = data_set.file.name
+            if os.path.dirname(old_path) == os.path.dirname(get_data_set_file_path(data_set)):
+                continue
+
+            old_absolute_path = os.path.abspath(os.path.join(MEDIA_ROOT, old_path))
+            if not os.path.isfile(old_absolute_path):
+                missing += 1
+                self.stderr.write(f"File {old_path} of data set {data_set.pk} does not exist.")
+                continue
+
+            if options['dry_run']:
+                self.stdout.write(f"{old_path} -> {os.path.dirname(get_data_set_file_path(data_set))}")
+                moved += 1
+                continue
+
+            new_path = allocate_data_set_file(data_set)
+            new_absolute_path = os.path.abspath(os.path.join(MEDIA_ROOT, new_path))
+            # Renaming replaces the empty allocated file, so no other file can take its name meanwhile
+            os.replace(old_absolute_path, new_absolute_path)
+            try:
+                DataSet.objects.filter(pk=data_set.pk).update(file=new_path)
+            except Exception:
+                os.replace(new_absolute_path, old_absolute_path)
+                raise
+            moved += 1
+            self.stdout.write(f"{old_path} -> {new_path}")
+
+        self.stdout.write(f"{'Files to move' if options['dry_run'] else 'Moved files'}: {moved}, missing: {missing}")
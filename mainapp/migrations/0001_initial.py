@@ -0,0 +1,121 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:44
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import django_extensions.db.fields
+import mainapp.models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Separator',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=32)),
+                ('char', models.CharField(max_length=1, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SourceData',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_type', models.CharField(db_index=True, max_length=25)),
+                ('source_data', models.CharField(max_length=60)),
+                ('weight', models.FloatField(default=1, help_text='Relative frequency of value among values of the same type', validators=[django.core.validators.MinValueValidator(0)])),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SourceDataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_type', models.CharField(max_length=25, unique=True)),
+                ('version', models.CharField(max_length=32)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Schema',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64)),
+                ('slug', django_extensions.db.fields.AutoSlugField(blank=True, editable=False, populate_from='name', unique=True)),
+                ('time_update', models.DateField(auto_now=True, verbose_name='modified')),
+                ('columns_version', models.CharField(default=mainapp.models.new_version, editable=False, help_text='Changes on every change of columns of schema', max_length=32)),
+                ('delimiter', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='schemas_with_delimiter', to='mainapp.separator')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schemas', to=settings.AUTH_USER_MODEL)),
+                ('quotechar', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='schemas_with_quotechar', to='mainapp.separator')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DataSet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('time_create', models.DateField(auto_now_add=True, verbose_name='created')),
+                ('file', models.FileField(blank=True, max_length=255, upload_to='', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['csv', 'parquet', 'arrow', 'gz', 'bz2', 'xz', 'zst'])], verbose_name='data set file')),
+                ('finished', models.BooleanField(default=False, verbose_name='generating csv file is finished')),
+                ('rows_amount', models.PositiveIntegerField(blank=True, null=True, verbose_name='rows')),
+                ('time_started', models.DateTimeField(blank=True, null=True, verbose_name='generating started')),
+                ('seed', models.PositiveBigIntegerField(blank=True, help_text='The same seed gives the same file for the same schema', null=True)),
+                ('fingerprint', models.CharField(blank=True, db_index=True, help_text='Hash of everything, that defines content of file of seeded data set', max_length=64)),
+                ('from_cache', models.BooleanField(default=False, verbose_name='file is taken from cache')),
+                ('compression', models.CharField(blank=True, choices=[('', 'none'), ('gz', 'gzip'), ('bz2', 'bzip2'), ('xz', 'xz'), ('zst', 'zstd')], default='', max_length=3)),
+                ('file_format', models.CharField(choices=[('csv', 'CSV'), ('parquet', 'Parquet'), ('arrow', 'Arrow IPC (Feather)')], default='csv', max_length=7, verbose_name='format')),
+                ('rows_written', models.PositiveBigIntegerField(default=0, verbose_name='rows written')),
+                ('bytes_written', models.PositiveBigIntegerField(default=0, help_text='Size of written data before compression', verbose_name='bytes written')),
+                ('rows_per_second', models.FloatField(blank=True, null=True, verbose_name='throughput')),
+                ('time_progress', models.DateTimeField(blank=True, null=True, verbose_name='progress updated')),
+                ('time_update', models.DateTimeField(auto_now=True, verbose_name='updated')),
+                ('time_finished', models.DateTimeField(blank=True, null=True, verbose_name='generating finished')),
+                ('error', models.TextField(blank=True, verbose_name='reason of failure')),
+                ('schema', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='data_sets', to='mainapp.schema')),
+            ],
+            options={
+                'verbose_name': 'Data set',
+                'verbose_name_plural': 'Data sets',
+                'ordering': ['time_create'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Column',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64)),
+                ('minimal', models.PositiveIntegerField(blank=True, null=True)),
+                ('maximal', models.PositiveIntegerField(blank=True, null=True)),
+                ('data_type', models.CharField(choices=[('INT', 'Integer'), ('FNM', 'Full Name'), ('JOB', 'Job'), ('EML', 'Email'), ('DMN', 'Domain Name'), ('PHN', 'Phone Number'), ('CMN', 'Company Name'), ('TXT', 'Text'), ('ADR', 'Address'), ('DTE', 'Date')], max_length=3)),
+                ('unique', models.BooleanField(default=False, help_text='All values of column in data set are distinct')),
+                ('order', models.PositiveSmallIntegerField(default=1)),
+                ('schema', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='columns', to='mainapp.schema')),
+            ],
+            options={
+                'verbose_name': 'Schema column',
+                'verbose_name_plural': 'Schema columns',
+                'ordering': ['schema', 'order'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='schema',
+            index=models.Index(fields=['owner', 'id'], name='mainapp_sch_owner_i_0a2bd3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dataset',
+            index=models.Index(fields=['schema', 'finished'], name='mainapp_dat_schema__6c1edb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dataset',
+            index=models.Index(fields=['schema', 'time_update'], name='mainapp_dat_schema__c4cc5a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dataset',
+            index=models.Index(fields=['schema', 'time_create', 'id'], name='mainapp_dat_schema__dc3abd_idx'),
+        ),
+    ]
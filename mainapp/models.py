@@ -1,12 +1,51 @@
+import hashlib
+import json
+import uuid
+
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
-from django.core.validators import FileExtensionValidator
+from django.core.validators import FileExtensionValidator, MinValueValidator
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 from django_extensions.db.fields import AutoSlugField
 from django.contrib.auth.models import User
 
+from schemas.settings import DATA_GENERATION_SETTINGS
+
 from .data_generators.data_generators import CellDataGenerator, RowDataGenerator
-from .data_generators.file_generation import generate_csv_file
+from .data_generators.generation_plan import GenerationPlan, generation_plan_cache
+from .data_generators.managers import GenerationManager
+from .data_generators.file_generation import generate_csv_file, FILE_SETTINGS
+from .data_generators.sampling import SourceValues
+from .data_generators.unique_generation import check_unique_capacity
+from .data_generators.source_data_cache import source_data_cache
+
+
+def new_version() -> str:
+    return uuid.uuid4().hex
+
+
+class ColumnQuerySet(models.QuerySet):
+    """Bulk operations, which do not send signals, change versions of columns of schemas by themselves."""
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        Schema.bump_columns_version(*{obj.schema_id for obj in objs})
+        return objs
+
+    def bulk_update(self, objs, *args, **kwargs):
+        rows = super().bulk_update(objs, *args, **kwargs)
+        Schema.bump_columns_version(*{obj.schema_id for obj in objs})
+        return rows
+
+    def update(self, **kwargs):
+        schema_ids = set(self.values_list('schema_id', flat=True))
+        rows = super().update(**kwargs)
+        # Columns could be moved to other schema
+        new_schema = kwargs.get('schema_id', kwargs.get('schema'))
+        if new_schema is not None:
+            schema_ids.add(getattr(new_schema, 'pk', new_schema))
+        Schema.bump_columns_version(*schema_ids)
+        return rows
 
 
 class Column(models.Model):
@@ -20,6 +59,8 @@ class Column(models.Model):
             2.2 If your data type uses source data for generating - function should take this source data lists as
             arguments, named as source data types.
         3. If your data type have limits, you also should add it to LIMITED_DATA_TYPES collection below.
+        3.1 If values of your data type can be unique, add functions for generating of unique values and getting of
+            amount of distinct values to file unique_generation.py, and add data type to UNIQUE_DATA_TYPES below.
         4. If your data type uses source data, you also should:
             4.1 Add it to DATA_TYPE_SOURCE_TYPES dictionary below as key, with value of list with source data types.
             4.2 Add this data to data base via model SourceData using one of methods - manage.py shell,
@@ -42,15 +83,19 @@ class Column(models.Model):
         DATE = "DTE"
 
     LIMITED_DATA_TYPES = (DataType.INTEGER, DataType.TEXT)
+    UNIQUE_DATA_TYPES = (DataType.INTEGER, DataType.EMAIL, DataType.DOMAIN_NAME)
     DATA_TYPE_SOURCE_TYPES = {DataType.FULL_NAME: ["first_names", "last_names"], DataType.JOB: ["jobs"]}
 
     name = models.CharField(max_length=64)
-    minimal = models.PositiveSmallIntegerField(blank=True, null=True)
-    maximal = models.PositiveSmallIntegerField(blank=True, null=True)
+    minimal = models.PositiveIntegerField(blank=True, null=True)
+    maximal = models.PositiveIntegerField(blank=True, null=True)
     data_type = models.CharField(max_length=3, choices=DataType.choices)
+    unique = models.BooleanField(default=False, help_text='All values of column in data set are distinct')
     schema = models.ForeignKey('Schema', on_delete=models.CASCADE, related_name='columns')
     order = models.PositiveSmallIntegerField(default=1)
 
+    objects = ColumnQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Schema column'
         verbose_name_plural = 'Schema columns'
@@ -63,35 +108,52 @@ class Column(models.Model):
     def data_have_limits(self):
         return self.data_type in self.LIMITED_DATA_TYPES
 
-    def _get_source_data(self):
+    def _get_source_data(self, loaded_source_data=None):
+        """
+        Returns source data of column, taken from source data cache.
+        loaded_source_data is dict of source data, already taken for other columns of the same generation run,
+        it is filled with source data of this column.
+        """
         source_types = self.DATA_TYPE_SOURCE_TYPES.get(self.data_type)
+        loaded_source_data = {} if loaded_source_data is None else loaded_source_data
         data = {}
 
         if source_types is not None:
             for source_type in source_types:
-                source_data_list = list(
-                    SourceData.objects.filter(source_type=source_type).values_list('source_data', flat=True),
-                )
+                if source_type not in loaded_source_data:
+                    loaded_source_data[source_type] = SourceData.get_cached_values(source_type)
+                source_data_values = loaded_source_data[source_type]
 
-                if not source_data_list:
+                if not source_data_values:
                     raise ObjectDoesNotExist(f"Not Found Source Data with type {source_type}.")
 
                 data.update(
-                    {source_type: source_data_list},
+                    {source_type: source_data_values},
                 )
 
         return data
 
-    def get_data_generator(self):
+    def get_data_generator(self, loaded_source_data=None):
         return CellDataGenerator(
             data_type=self.DataType(self.data_type),
             have_limits=self.data_have_limits,
             minimal=self.minimal,
             maximal=self.maximal,
-            source_data=self._get_source_data(),
+            source_data=self._get_source_data(loaded_source_data),
+            unique=self.unique,
         )
 
+    def get_unique_capacity(self) -> int:
+        """Returns amount of distinct values, which column can have, 0 if its values can not be unique."""
+        if self.data_type not in self.UNIQUE_DATA_TYPES:
+            return 0
+        return GenerationManager.get_unique_capacity(self.DataType(self.data_type).name, self.data_have_limits,
+                                                     self.minimal, self.maximal)
+
     def clean(self):
+        if self.unique and self.data_type not in self.UNIQUE_DATA_TYPES:
+            raise ValidationError('Values of this Type of column can not be unique')
+
         if self.data_type in self.LIMITED_DATA_TYPES:
 
             if self.minimal is None or self.maximal is None:
@@ -100,6 +162,11 @@ class Column(models.Model):
             if self.minimal > self.maximal:
                 raise ValidationError('From should be less number then To, or equal')
 
+            # Only integers can have large limits, limits of text are amounts of sentences in one cell
+            max_sentences_amount = DATA_GENERATION_SETTINGS["TXT"]["MAX_SENTENCES_AMOUNT"]
+            if self.data_type == self.DataType.TEXT and self.maximal > max_sentences_amount:
+                raise ValidationError(f'To should not be more than {max_sentences_amount} for this Type of column')
+
     def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
         if not self.data_have_limits:
             self.minimal = None
@@ -107,10 +174,75 @@ class Column(models.Model):
         super().save()
 
 
+class SourceDataQuerySet(models.QuerySet):
+    """Bulk operations, which do not send signals, change versions of source data by themselves."""
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        for source_type in {obj.source_type for obj in objs}:
+            SourceDataVersion.bump(source_type)
+        return objs
+
+    def update(self, **kwargs):
+        source_types = set(self.values_list('source_type', flat=True))
+        rows = super().update(**kwargs)
+        for source_type in source_types | {kwargs.get('source_type')} - {None}:
+            SourceDataVersion.bump(source_type)
+        return rows
+
+    def delete(self):
+        source_types = set(self.values_list('source_type', flat=True).distinct())
+        # Source data has no delete signals, so rows are deleted by one query, without fetching of them
+        result = super().delete()
+        for source_type in source_types:
+            SourceDataVersion.bump(source_type)
+        return result
+
+
 class SourceData(models.Model):
     """Model for storing source data for generating data types, that needs source."""
     source_type = models.CharField(max_length=25, db_index=True)
     source_data = models.CharField(max_length=60)
+    weight = models.FloatField(default=1, validators=[MinValueValidator(0)],
+                               help_text='Relative frequency of value among values of the same type')
+
+    objects = SourceDataQuerySet.as_manager()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        SourceDataVersion.bump(self.source_type)
+        return result
+
+    @classmethod
+    def get_cached_values(cls, source_type: str) -> SourceValues:
+        """
+        Returns all source data values of type with their weights from process level cache,
+        loading them only if they changed.
+        """
+        return source_data_cache.get_values(
+            source_type,
+            version=SourceDataVersion.get_version(source_type),
+            load_values=lambda: SourceValues.from_pairs(
+                cls.objects.filter(source_type=source_type).order_by('pk').values_list('source_data', 'weight')),
+        )
+
+
+class SourceDataVersion(models.Model):
+    """
+    Version of source data of some type, it changes on every change of this source data.
+    Versions are random, so they never repeat, even after rollback of transaction.
+    """
+    source_type = models.CharField(max_length=25, unique=True)
+    version = models.CharField(max_length=32)
+
+    @classmethod
+    def get_version(cls, source_type: str) -> str:
+        return cls.objects.filter(source_type=source_type).values_list('version', flat=True).first() or ''
+
+    @classmethod
+    def bump(cls, source_type: str) -> None:
+        version = new_version()
+        if not cls.objects.filter(source_type=source_type).update(version=version):
+            cls.objects.update_or_create(source_type=source_type, defaults={'version': version})
 
 
 class Schema(models.Model):
@@ -121,6 +253,13 @@ class Schema(models.Model):
     delimiter = models.ForeignKey('Separator', on_delete=models.PROTECT, related_name='schemas_with_delimiter')
     quotechar = models.ForeignKey('Separator', on_delete=models.PROTECT, related_name='schemas_with_quotechar')
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='schemas')
+    columns_version = models.CharField(max_length=32, default=new_version, editable=False,
+                                       help_text='Changes on every change of columns of schema')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner', 'id']),
+        ]
 
     def __str__(self):
         return self.name
@@ -128,8 +267,38 @@ class Schema(models.Model):
     def get_absolute_url(self):
         return reverse('schema-data-sets', kwargs={'schema_slug': self.slug})
 
+    @classmethod
+    def bump_columns_version(cls, *schema_ids: int) -> None:
+        """Changes versions of columns of schemas, so their cached generation plans are compiled again."""
+        if schema_ids:
+            cls.objects.filter(pk__in=schema_ids).update(columns_version=new_version())
+
+    def _compile_generation_plan(self) -> tuple[GenerationPlan, dict]:
+        columns = list(self.columns.all())
+        source_types = {source_type for column in columns
+                        for source_type in Column.DATA_TYPE_SOURCE_TYPES.get(column.data_type, [])}
+        # Versions are read before source data is loaded, so plan would never be newer than its versions
+        source_versions = {source_type: SourceDataVersion.get_version(source_type) for source_type in source_types}
+        return GenerationPlan(columns), source_versions
+
+    def get_generation_plan(self) -> GenerationPlan:
+        """Returns compiled generation plan of schema from process level cache, compiling it only if it changed."""
+        # Version is taken from db, as columns could be changed after this schema instance was loaded
+        self.columns_version = Schema.objects.filter(pk=self.pk).values_list('columns_version', flat=True).first()
+        return generation_plan_cache.get_plan(
+            self.pk,
+            columns_version=self.columns_version,
+            compile_plan=self._compile_generation_plan,
+            get_source_version=SourceDataVersion.get_version,
+        )
+
     def get_data_generator(self):
-        return RowDataGenerator(self.columns.all())
+        return RowDataGenerator(plan=self.get_generation_plan())
+
+    def check_unique_capacity(self, rows_amount: int) -> None:
+        """Raises ValueError, if some unique column of schema can not have rows_amount distinct values."""
+        for column in self.columns.filter(unique=True):
+            check_unique_capacity(column.name, column.get_unique_capacity(), rows_amount)
 
     @property
     def column_headers(self):
@@ -150,23 +319,141 @@ class Separator(models.Model):
         return f"{self.name} ({self.char})"
 
 
+class DataSetQuerySet(models.QuerySet):
+    """Updates, which do not call save, change time of update of data sets by themselves."""
+    def update(self, **kwargs):
+        kwargs.setdefault('time_update', timezone.now())
+        return super().update(**kwargs)
+
+
 class DataSet(models.Model):
     """
     Representation of data set.
+    If generating of csv file is queued: finished status is False, and time of start is not set.
     If generating of csv file is processing: finished status is False, and it links to no file.
     If file generating was successful: finished status would be True and field 'file' contains link to csv file.
     If file generating fails: finished status would be True, but field 'file' links to no file.
     """
+
+    class Compression(models.TextChoices):
+        """Compressions of csv file, values are extensions of compressed files."""
+        NONE = '', 'none'
+        GZIP = 'gz', 'gzip'
+        BZIP2 = 'bz2', 'bzip2'
+        LZMA = 'xz', 'xz'
+        ZSTD = 'zst', 'zstd'
+
+    class FileFormat(models.TextChoices):
+        """Formats of file, values are extensions of files. Compression is applicable only to csv files."""
+        CSV = 'csv', 'CSV'
+        PARQUET = 'parquet', 'Parquet'
+        ARROW = 'arrow', 'Arrow IPC (Feather)'
+
     time_create = models.DateField(auto_now_add=True, verbose_name="created")
-    file = models.FileField(validators=[FileExtensionValidator(allowed_extensions=['csv'])], blank=True,
-                            verbose_name='csv file')
+    file = models.FileField(validators=[FileExtensionValidator(
+                                allowed_extensions=[*FileFormat.values, *Compression.values[1:]])],
+                            blank=True, max_length=255, verbose_name='data set file')
     schema = models.ForeignKey('Schema', on_delete=models.CASCADE, related_name='data_sets')
     finished = models.BooleanField(default=False, verbose_name='generating csv file is finished')
+    rows_amount = models.PositiveIntegerField(blank=True, null=True, verbose_name='rows')
+    time_started = models.DateTimeField(blank=True, null=True, verbose_name='generating started')
+    seed = models.PositiveBigIntegerField(blank=True, null=True,
+                                          help_text='The same seed gives the same file for the same schema')
+    fingerprint = models.CharField(max_length=64, blank=True, db_index=True,
+                                   help_text='Hash of everything, that defines content of file of seeded data set')
+    from_cache = models.BooleanField(default=False, verbose_name='file is taken from cache')
+    compression = models.CharField(max_length=3, choices=Compression.choices, blank=True, default=Compression.NONE)
+    file_format = models.CharField(max_length=7, choices=FileFormat.choices, default=FileFormat.CSV,
+                                   verbose_name='format')
+    rows_written = models.PositiveBigIntegerField(default=0, verbose_name='rows written')
+    bytes_written = models.PositiveBigIntegerField(default=0, verbose_name='bytes written',
+                                                   help_text='Size of written data before compression')
+    rows_per_second = models.FloatField(blank=True, null=True, verbose_name='throughput')
+    time_progress = models.DateTimeField(blank=True, null=True, verbose_name='progress updated')
+    time_update = models.DateTimeField(auto_now=True, verbose_name='updated')
+    time_finished = models.DateTimeField(blank=True, null=True, verbose_name='generating finished')
+    error = models.TextField(blank=True, verbose_name='reason of failure')
+
+    objects = DataSetQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Data set'
         verbose_name_plural = 'Data sets'
         ordering = ['time_create']
+        indexes = [
+            models.Index(fields=['schema', 'finished']),
+            models.Index(fields=['schema', 'time_update']),
+            models.Index(fields=['schema', 'time_create', 'id']),
+        ]
+
+    # Sections of DATA_GENERATION_SETTINGS, which do not affect content of generated files
+    SERVICE_SETTINGS = ('FILE', 'FILE_CACHE', 'QUEUE', 'DOWNLOAD', 'EVENTS')
+
+    def get_fingerprint(self, rows_amount: int, chunk_size: int = FILE_SETTINGS["CHUNK_SIZE"]) -> str:
+        """
+        Returns hash of schema columns, separators, source data versions, settings of data types, seed, rows amount,
+        chunk size and compression. Files of data sets with the same fingerprint are identical.
+        """
+        columns = list(self.schema.columns.values_list('name', 'data_type', 'minimal', 'maximal', 'unique', 'order'))
+        source_types = sorted({source_type for _, data_type, *_ in columns
+                               for source_type in Column.DATA_TYPE_SOURCE_TYPES.get(data_type, [])})
+        content = {
+            'columns': columns,
+            'delimiter': self.schema.delimiter.char,
+            'quotechar': self.schema.quotechar.char,
+            'source_data_versions': {source_type: SourceDataVersion.get_version(source_type)
+                                     for source_type in source_types},
+            'settings': {name: section for name, section in DATA_GENERATION_SETTINGS.items()
+                         if name not in self.SERVICE_SETTINGS},
+            'seed': self.seed,
+            'rows_amount': rows_amount,
+            # Chunks are seeded by their indexes, so the same seed gives the same file only with the same chunk size,
+            # which is limited by chunk bytes
+            'chunk_size': chunk_size,
+            'chunk_bytes': (FILE_SETTINGS["CHUNK_BYTES"], FILE_SETTINGS["CHUNK_PROBE_ROWS"]),
+            'compression': self.compression,
+            'compression_level': FILE_SETTINGS["COMPRESSION_LEVELS"].get(self.compression),
+            'file_format': self.file_format,
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+    def generate_file(self, rows_amount, chunk_size: int = FILE_SETTINGS["CHUNK_SIZE"], **options):
+        """Generates file of data set, options are passed to generate_csv_file."""
+        # Only seeded data sets are reproducible, so only they can be cached
+        if self.seed is not None:
+            self.fingerprint = self.get_fingerprint(rows_amount, chunk_size)
+        generate_csv_file(self, rows_amount=rows_amount, chunk_size=chunk_size, **options)
+
+    def save_progress(self, rows_written: int, bytes_written: int, rows_per_second: float) -> None:
+        """Writes progress of generating file to db, without saving of other fields."""
+        self.rows_written = rows_written
+        self.bytes_written = bytes_written
+        self.rows_per_second = rows_per_second
+        self.time_progress = self.time_update = timezone.now()
+        DataSet.objects.filter(pk=self.pk).update(rows_written=rows_written, bytes_written=bytes_written,
+                                                  rows_per_second=rows_per_second, time_progress=self.time_progress,
+                                                  time_update=self.time_update)
 
-    def generate_file(self, rows_amount):
-        generate_csv_file(self, rows_amount=rows_amount)
+    @property
+    def percent_complete(self) -> [float, None]:
+        if not self.rows_amount:
+            return None
+        return min(100.0, self.rows_written * 100 / self.rows_amount)
+
+    @property
+    def generation_seconds(self) -> [float, None]:
+        """Seconds, which generating of file took, if it is finished."""
+        if self.time_started is None or self.time_finished is None:
+            return None
+        return (self.time_finished - self.time_started).total_seconds()
+
+    @property
+    def eta_seconds(self) -> [float, None]:
+        """Estimated seconds till file is generated, by throughput at the last progress update."""
+        if self.finished:
+            return 0.0
+        if not self.rows_amount or not self.rows_per_second or self.time_progress is None:
+            return None
+        seconds_left = (self.rows_amount - self.rows_written) / self.rows_per_second
+        seconds_passed = (timezone.now() - self.time_progress).total_seconds()
+        return max(0.0, seconds_left - seconds_passed)
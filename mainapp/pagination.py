@@ -0,0 +1,63 @@
+"""
+Keyset (cursor) pagination.
+
+Page is taken by condition on values of ordering fields of the last item of previous page, instead of offset,
+so every page costs the same, using index on ordering fields, no matter how far it is.
+Ordering must be unique, so the last field is usually primary key.
+"""
+import base64
+import binascii
+import json
+from typing import Optional
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, QuerySet
+
+
+def encode_cursor(obj, ordering: tuple[str, ...]) -> str:
+    values = [getattr(obj, field.lstrip('-')) for field in ordering]
+    return base64.urlsafe_b64encode(json.dumps(values, cls=DjangoJSONEncoder).encode()).decode()
+
+
+def decode_cursor(cursor: str, ordering: tuple[str, ...]) -> list:
+    """Returns values of ordering fields, encoded in cursor. Raises ValueError, if cursor is invalid."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeError, json.JSONDecodeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def get_after_condition(ordering: tuple[str, ...], values: list) -> Q:
+    """Returns condition of items, which go after item with values of ordering fields."""
+    condition = Q()
+    for i, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        equal_before = {previous.lstrip('-'): value for previous, value in zip(ordering[:i], values[:i])}
+        condition |= Q(**equal_before, **{f'{name}__{lookup}': values[i]})
+    return condition
+
+
+def paginate_by_keyset(queryset: QuerySet, ordering: tuple[str, ...], page_size: int,
+                       cursor: Optional[str] = None) -> tuple[list, Optional[str]]:
+    """
+    Returns page of page_size items of queryset in given ordering, going after cursor (the first page, if None),
+    and cursor of the next page (None, if it is the last page). Raises ValueError, if cursor is invalid.
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, ordering)
+        try:
+            queryset = queryset.filter(get_after_condition(ordering, values))
+        except (ValidationError, TypeError) as e:
+            raise ValueError('Invalid cursor') from e
+
+    # One more item shows, whether there is next page
+    items = list(queryset[:page_size + 1])
+    if len(items) <= page_size:
+        return items, None
+    return items[:page_size], encode_cursor(items[page_size - 1], ordering)
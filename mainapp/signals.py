@@ -1,10 +1,27 @@
-from django.db.models.signals import pre_delete
+from django.db.models.signals import pre_delete, post_save, post_delete
 from django.dispatch import receiver
 
-from .models import DataSet
+from .models import DataSet, SourceData, SourceDataVersion, Column, Schema
+from .status_events import status_hub
 
 
 @receiver(pre_delete, sender=DataSet)
 def date_set_delete(sender, instance, **kwargs):
     if instance.file:
         instance.file.delete()
+
+
+@receiver(post_save, sender=DataSet)
+def data_set_saved(sender, instance, **kwargs):
+    status_hub.notify(instance.schema_id)
+
+
+@receiver(post_save, sender=SourceData)
+def source_data_changed(sender, instance, **kwargs):
+    SourceDataVersion.bump(instance.source_type)
+
+
+@receiver(post_save, sender=Column)
+@receiver(post_delete, sender=Column)
+def column_changed(sender, instance, **kwargs):
+    Schema.bump_columns_version(instance.schema_id)
@@ -1,24 +1,22 @@
-schemaSlugs.forEach((slug) => {
-    const deletionLink = document.getElementById(`link-deletion-schema-${slug}`);
+// Links of deletion are handled by document, so links of schemas on loaded pages work as well
+$(document).on('click', '.link-deletion-schema', function(event) {
+    event.preventDefault();
+    const deletionLink = this;
 
-    deletionLink.addEventListener('click', function(event) {
-        event.preventDefault();
+    const confirmDelete = window.confirm("Are you sure you want to delete Schema?")
 
-        const confirmDelete = window.confirm("Are you sure you want to delete Schema?")
-
-        if (confirmDelete) {
-            $.ajax({
-                type: 'POST',
-                url: deleteSchemaUrl,
-                data: {
-                    csrfmiddlewaretoken:$('input[name=csrfmiddlewaretoken]').val(),
-                    schema: slug,
-                },
-                success: function() {
-                    const schemaRow = deletionLink.parentNode.parentNode.parentNode;
-                    schemaRow.parentNode.removeChild(schemaRow);
-                }
-            });
-        }
-    });
+    if (confirmDelete) {
+        $.ajax({
+            type: 'POST',
+            url: deleteSchemaUrl,
+            data: {
+                csrfmiddlewaretoken:$('input[name=csrfmiddlewaretoken]').val(),
+                schema: deletionLink.dataset.slug,
+            },
+            success: function() {
+                const schemaRow = deletionLink.parentNode.parentNode.parentNode;
+                schemaRow.parentNode.removeChild(schemaRow);
+            }
+        });
+    }
 });
\ No newline at end of file
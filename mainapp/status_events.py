@@ -0,0 +1,175 @@
+"""
+Pushing of statuses of data sets to pages of data sets by server-sent events.
+
+Files are generated by workers in other processes, so changes of data sets are found in db.
+Every process keeps hub, in which every schema with open pages is watched by the only task: it queries data sets
+of schema, updated since the previous query, once per interval and publishes their statuses to all subscribed pages.
+So amount of queries does not depend on amount of open pages, and size of them - on history of schema.
+Saves of data sets in this process wake watchers immediately.
+Events need running under ASGI, under WSGI pages fall back to polling.
+"""
+import asyncio
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, AsyncIterator
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+
+from schemas.settings import DATA_GENERATION_SETTINGS
+from .models import DataSet
+
+logger = logging.getLogger(__name__)
+
+EVENTS_SETTINGS = DATA_GENERATION_SETTINGS["EVENTS"]
+
+STATUS_FIELDS = ('finished', 'file', 'rows_amount', 'rows_written', 'bytes_written', 'rows_per_second',
+                 'time_progress')
+
+
+def get_data_sets_statuses(data_sets) -> dict:
+    """
+    Returns statuses of data sets: for finished - whether file is generated,
+    for not finished - progress with percent complete and ETA in seconds (or null).
+    """
+    info = {}
+    progress = {}
+    for data_set in data_sets:
+        if data_set.finished:
+            info[data_set.id] = {'file_generated': bool(data_set.file)}
+        else:
+            progress[data_set.id] = {
+                'percent': data_set.percent_complete,
+                'eta': data_set.eta_seconds,
+                'rows_written': data_set.rows_written,
+                'bytes_written': data_set.bytes_written,
+                'rows_per_second': data_set.rows_per_second,
+            }
+    return {'info': info, 'progress': progress}
+
+
+def get_schema_statuses(schema_pk: int, ids: list[int] = None, since: datetime = None) -> dict:
+    """
+    Returns statuses of data sets of schema: only of data sets with given ids, if ids are set,
+    and only of data sets, updated since given time, if it is set.
+    """
+    data_sets = DataSet.objects.filter(schema_id=schema_pk)
+    if ids is not None:
+        data_sets = data_sets.filter(pk__in=ids)
+    if since is not None:
+        data_sets = data_sets.filter(time_update__gte=since)
+    return get_data_sets_statuses(data_sets.only(*STATUS_FIELDS))
+
+
+class _SchemaWatcher:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.subscribers = set()
+        self.wake = asyncio.Event()
+        self.task = None
+
+
+class DataSetStatusHub:
+    """
+    In-process hub of statuses of data sets, by schemas.
+    Schema is watched only while it has subscribers, every subscriber gets statuses of changed data sets in queue.
+    """
+    def __init__(self, get_changes: Callable = get_schema_statuses,
+                 interval: float = EVENTS_SETTINGS["WATCH_INTERVAL"]):
+        self._get_changes = get_changes
+        self.interval = interval
+        self._watchers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, schema_pk: int) -> asyncio.Queue:
+        """Returns queue of statuses of changed data sets of schema. Must be called in running event loop."""
+        queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            watcher = self._watchers.get((schema_pk, loop))
+            if watcher is None:
+                watcher = self._watchers[(schema_pk, loop)] = _SchemaWatcher(loop)
+                watcher.task = loop.create_task(self._watch(schema_pk, watcher))
+            watcher.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, schema_pk: int, queue: asyncio.Queue) -> None:
+        """Stops publishing to queue. Schema is not watched anymore, if it has no subscribers left."""
+        with self._lock:
+            for (pk, loop), watcher in list(self._watchers.items()):
+                if pk == schema_pk and queue in watcher.subscribers:
+                    watcher.subscribers.discard(queue)
+                    if not watcher.subscribers:
+                        del self._watchers[(pk, loop)]
+                        watcher.task.cancel()
+
+    def notify(self, schema_pk: int) -> None:
+        """Wakes watchers of schema, so changes are published without waiting. Can be called from any thread."""
+        with self._lock:
+            watchers = [watcher for (pk, _), watcher in self._watchers.items() if pk == schema_pk]
+        for watcher in watchers:
+            try:
+                watcher.loop.call_soon_threadsafe(watcher.wake.set)
+            except RuntimeError:
+                # Loop is closed already
+                pass
+
+    def get_subscribers_amount(self, schema_pk: int) -> int:
+        with self._lock:
+            return sum(len(watcher.subscribers) for (pk, _), watcher in self._watchers.items() if pk == schema_pk)
+
+    async def _watch(self, schema_pk: int, watcher: _SchemaWatcher) -> None:
+        # Changes before start of watching are sent by subscribers themselves
+        since = timezone.now()
+        while True:
+            watcher.wake.clear()
+            try:
+                cursor = timezone.now()
+                statuses = await sync_to_async(self._get_changes)(schema_pk, since=since)
+                since = cursor
+            except Exception:
+                logger.exception("Statuses of data sets of schema %s are not queried.", schema_pk)
+            else:
+                if statuses['info'] or statuses['progress']:
+                    for queue in list(watcher.subscribers):
+                        queue.put_nowait(statuses)
+
+            try:
+                await asyncio.wait_for(watcher.wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+status_hub = DataSetStatusHub()
+
+
+def format_event(statuses: dict) -> str:
+    return f'data: {json.dumps(statuses)}\n\n'
+
+
+async def iter_status_events(schema_pk: int, hub: DataSetStatusHub = status_hub,
+                             heartbeat_interval: float = EVENTS_SETTINGS["HEARTBEAT_INTERVAL"],
+                             max_seconds: float = EVENTS_SETTINGS["MAX_CONNECTION_SECONDS"]) -> AsyncIterator[str]:
+    """
+    Yields server-sent events: statuses of all data sets of schema first, and then statuses of changed ones.
+    Comments are sent, if nothing changes for heartbeat_interval. Stream ends after max_seconds,
+    and browser connects again, so streams of disconnected clients do not live forever.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+    # Subscribing before the first query, so no change is missed between them
+    queue = hub.subscribe(schema_pk)
+    try:
+        yield format_event(await sync_to_async(get_schema_statuses)(schema_pk))
+
+        while (seconds_left := deadline - loop.time()) > 0:
+            try:
+                statuses = await asyncio.wait_for(queue.get(), min(heartbeat_interval, seconds_left))
+            except asyncio.TimeoutError:
+                yield ': heartbeat\n\n'
+            else:
+                yield format_event(statuses)
+    finally:
+        hub.unsubscribe(schema_pk, queue)
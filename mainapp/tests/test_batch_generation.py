@@ -0,0 +1,91 @@
+import datetime
+import re
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from ..data_generators.batch_generation import generate_integer_batch, generate_full_name_batch, \
+    generate_job_batch, generate_email_batch, generate_domain_name_batch, generate_phone_number_batch, \
+    generate_company_name_batch, generate_text_batch, generate_address_batch, generate_date_batch
+
+
+class TestBatchDataGeneration(SimpleTestCase):
+    minimal = 3
+    maximal = 10
+    size = 1000
+
+    def setUp(self):
+        self.rng = np.random.default_rng(12345)
+
+    def assertAllMatch(self, regex, values):
+        self.assertEqual(len(values), self.size)
+        for value in values:
+            self.assertTrue(isinstance(value, str))
+            self.assertTrue(re.fullmatch(regex, value), value)
+
+    def test_generate_integer_batch(self):
+        integers = generate_integer_batch(self.rng, self.size, self.minimal, self.maximal)
+
+        self.assertAllMatch(re.compile(r'\d+'), integers)
+        self.assertTrue(all(self.minimal <= int(integer) <= self.maximal for integer in integers))
+        self.assertEqual(set(integers), set(map(str, range(self.minimal, self.maximal + 1))))
+
+    def test_generate_full_name_batch(self):
+        first_names = ['Hanna', 'Alice', 'Bone']
+        last_names = ['Smith', 'Anderson', 'Johnson']
+
+        full_names = generate_full_name_batch(self.rng, self.size, first_names, last_names)
+
+        self.assertAllMatch(re.compile(r'[A-Z][a-z]+ [A-Z][a-z]+'), full_names)
+        for full_name in full_names:
+            self.assertIn(full_name.split()[0], first_names)
+            self.assertIn(full_name.split()[1], last_names)
+
+    def test_generate_job_batch(self):
+        jobs = ['plumber', 'tractor driver', 'farmer', 'python developer']
+
+        self.assertEqual(set(generate_job_batch(self.rng, self.size, jobs)), set(jobs))
+
+    def test_generate_email_batch(self):
+        self.assertAllMatch(re.compile(r'[a-z]{5,12}@gmail\.com'), generate_email_batch(self.rng, self.size))
+
+    def test_generate_domain_name_batch(self):
+        self.assertAllMatch(re.compile(r'[a-z]{3,15}\.[a-z]{2,4}'), generate_domain_name_batch(self.rng, self.size))
+
+    def test_generate_phone_number_batch(self):
+        self.assertAllMatch(re.compile(r'\+380\d{9}'), generate_phone_number_batch(self.rng, self.size))
+
+    def test_generate_company_name_batch(self):
+        self.assertAllMatch(re.compile(r'[A-Z]{5,15}(?: [A-Z]{5,15}){0,4}'),
+                            generate_company_name_batch(self.rng, self.size))
+
+    def test_generate_text_batch(self):
+        regex = re.compile(r'[A-Z][a-z]{2,9}(?: [a-z]{3,10}){2,9}\.(?: [A-Z][a-z]{2,9}(?: [a-z]{3,10}){2,9}\.){2,9}')
+
+        self.assertAllMatch(regex, generate_text_batch(self.rng, self.size, self.minimal, self.maximal))
+
+    def test_generate_empty_text_batch(self):
+        self.assertEqual(generate_text_batch(self.rng, 10, 0, 0), [''] * 10)
+
+    def test_generate_address_batch(self):
+        regex = re.compile(r'[A-Z][a-z]{2,13}, district [A-Z][a-z]{4,13}, city [A-Z][a-z]{4,7}, street (?:[A-Z][a-z]'
+                           r'{2,9}(?: [A-Z][a-z]{2,9}){0,2}|(?:[1-9]|[1-9][0-9]|100) (?:street|avenue)), building '
+                           r'(?:[1-9]|[1-9][0-9]|[1-4][0-9]{2}|500)')
+
+        self.assertAllMatch(regex, generate_address_batch(self.rng, self.size))
+
+    def test_generate_date_batch(self):
+        dates = generate_date_batch(self.rng, self.size)
+
+        self.assertAllMatch(re.compile(r'[12]\d{3}-\d{2}-\d{2}'), dates)
+        for date in dates:
+            try:
+                datetime.date(*map(int, date.split('-')))
+            except ValueError:
+                self.fail("Date is not valid")
+
+    def test_batch_is_reproducible_with_same_seed(self):
+        first = generate_text_batch(np.random.default_rng(1), 10, self.minimal, self.maximal)
+        second = generate_text_batch(np.random.default_rng(1), 10, self.minimal, self.maximal)
+
+        self.assertEqual(first, second)
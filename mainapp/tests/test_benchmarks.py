@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase, SimpleTestCase
+
+from ..benchmarks import benchmark_compression, get_representative_columns, benchmark_data_types, \
+    benchmark_schemas, compare_results, get_wide_columns, benchmark_write_buffers, get_write_syscalls, SampleContent
+from ..data_generators import compression
+from ..data_generators.compression import get_available_compressions, open_compressed
+from ..models import Column, SourceData, DataSet, Schema
+from .test_file_generation import list_data_sets_files
+
+
+class TestBenchmarkCompression(TestCase):
+    def test_representative_columns_without_source_data(self):
+        data_types = {column.data_type for column in get_representative_columns()}
+
+        self.assertNotIn(Column.DataType.FULL_NAME, data_types)
+        self.assertNotIn(Column.DataType.JOB, data_types)
+        self.assertIn(Column.DataType.INTEGER, data_types)
+
+    def test_representative_columns_with_source_data(self):
+        SourceData.objects.create(source_type='jobs', source_data='farmer')
+
+        self.assertIn(Column.DataType.JOB, {column.data_type for column in get_representative_columns()})
+
+    def test_benchmark_compression(self):
+        results = benchmark_compression(get_representative_columns(), 1000, ['', 'gz'])
+
+        self.assertEqual([result['compression'] for result in results], ['none', 'gz'])
+        self.assertEqual(results[0]['ratio'], 1)
+        self.assertLess(results[1]['size'], results[0]['size'])
+
+    def test_sample_content_is_repeated(self):
+        content = SampleContent(get_representative_columns(), 1050, chunk_size=100, sample_rows=200)
+        chunks = list(content)
+
+        self.assertEqual(len(content.chunks), 2)
+        self.assertEqual(sum(chunk.count(b'\r\n') for chunk in chunks), 1051)
+        self.assertEqual(sum(map(len, chunks)), content.size)
+        # Only sample is kept, larger file is made by repeating of its chunks
+        self.assertEqual(chunks[1], chunks[3])
+        self.assertNotEqual(chunks[1], chunks[2])
+
+    def test_bench_compression_command(self):
+        out = StringIO()
+        call_command('bench_compression', rows=100, stdout=out)
+
+        for codec in ['none', *get_available_compressions()]:
+            self.assertIn(f'\n{codec} ', out.getvalue())
+
+    def test_benchmark_write_buffers(self):
+        results = benchmark_write_buffers(get_representative_columns(), 1000, [1024, 1024 ** 2], ['', 'gz'])
+
+        self.assertEqual([(result['compression'], result['buffer_size']) for result in results],
+                         [(codec, size) for codec in ('none', 'gz') for size in (1024, 1024 ** 2)])
+        if get_write_syscalls() is not None:
+            # Compressed output is written by small pieces, which are gathered by large buffer
+            self.assertLess(results[3]['write_syscalls'], results[2]['write_syscalls'])
+
+    def test_bench_compression_command_with_buffer_sizes(self):
+        out = StringIO()
+        call_command('bench_compression', rows=100, buffer_sizes=[8, 64], stdout=out)
+
+        self.assertIn('buffer, KB', out.getvalue())
+        self.assertIn('\ngz               8 ', out.getvalue())
+
+    def test_zstd_not_available_without_package(self):
+        with mock.patch.object(compression, 'zstandard', None):
+            self.assertNotIn('zst', get_available_compressions())
+            with self.assertRaises(ValueError):
+                with open_compressed('data_set.csv.zst', 'zst'):
+                    pass
+
+
+class TestBenchmarkGeneration(TestCase):
+    def test_benchmark_data_types(self):
+        columns = get_representative_columns()
+        results = benchmark_data_types(columns, 100, repeat=2)
+
+        self.assertEqual([(result['name'], result['path']) for result in results],
+                         [(column.data_type, path) for column in columns for path in ('row', 'batch')])
+        for result in results:
+            self.assertEqual(result['rows'], 100)
+            self.assertGreater(result['rows_per_second'], 0)
+            self.assertGreater(result['megabytes_per_second'], 0)
+
+    def test_wide_columns(self):
+        columns = get_wide_columns(get_representative_columns()[:2], 5)
+
+        self.assertEqual(len(columns), 5)
+        self.assertEqual(len({column.name for column in columns}), 5)
+        self.assertEqual(columns[0].data_type, columns[2].data_type)
+
+    def test_benchmark_schemas_leave_nothing(self):
+        files_before = list_data_sets_files()
+
+        results = benchmark_schemas(get_representative_columns(), widths=[1, 3], rows_amounts=[10, 20], repeat=1)
+
+        self.assertEqual([(result['columns'], result['rows'], result['path']) for result in results],
+                         [(width, rows, path) for width in (1, 3) for rows in (10, 20)
+                          for path in ('row', 'batch', 'file')])
+        self.assertFalse(Schema.objects.exists())
+        self.assertFalse(DataSet.objects.exists())
+        self.assertEqual(list_data_sets_files(), files_before)
+
+    def test_bench_generation_command_output_and_comparison(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'results.json')
+            options = {'type_rows': 10, 'widths': [2], 'rows': [10], 'repeat': 1, 'no_files': True,
+                       'stdout': StringIO()}
+
+            call_command('bench_generation', output=output, **options)
+
+            with open(output) as file:
+                results = json.load(file)
+            self.assertIn('python', results['environment'])
+            self.assertEqual({result['benchmark'] for result in results['results']}, {'data_type', 'schema'})
+
+            # Baseline, which is much faster than any real run
+            for result in results['results']:
+                result['rows_per_second'] *= 1000
+            with open(output, 'w') as file:
+                json.dump(results, file)
+
+            with self.assertRaises(CommandError):
+                call_command('bench_generation', compare=output, **options)
+
+
+class TestCompareResults(SimpleTestCase):
+    @staticmethod
+    def get_result(rows_per_second, name='INT'):
+        return {'benchmark': 'data_type', 'name': name, 'path': 'batch', 'columns': 1, 'rows': 100,
+                'rows_per_second': rows_per_second}
+
+    def test_regressions_found(self):
+        baseline = [self.get_result(100), self.get_result(100, 'DTE'), self.get_result(100, 'EML')]
+        results = [self.get_result(85), self.get_result(95, 'DTE'), self.get_result(50, 'TXT')]
+
+        regressions = compare_results(baseline, results, threshold=0.1)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0]['name'], 'INT')
+        self.assertAlmostEqual(regressions[0]['change'], -0.15)
@@ -33,3 +33,10 @@ class TestDataGenerators(TestCase):
         out = StringIO()
         call_command('load_data_source', 'static/source/test.json', 'static/source/test2.json', stdout=out)
         self.assertEqual(SourceData.objects.count(), 6)
+
+    def test_load_data_source_with_weights(self):
+        out = StringIO()
+        call_command('load_data_source', 'static/source/test_weights.json', stdout=out)
+
+        self.assertEqual(dict(SourceData.objects.values_list('source_data', 'weight')), {'a': 5, 'b': 1, 'c': 0})
+        self.assertEqual(SourceData.get_cached_values('letters').weights, [5, 1, 0])
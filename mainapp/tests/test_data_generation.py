@@ -1,11 +1,14 @@
 import datetime
+import random
 import re
+from collections import Counter
 
 from django.test import SimpleTestCase
 
 from ..data_generators.data_generation import generate_word, generate_sentence, generate_integer, generate_full_name, \
     generate_job, generate_email, generate_domain_name, generate_phone_number, generate_company_name, generate_text, \
     generate_address, generate_date
+from ..data_generators.text_synthesis import random_letters, random_lengths, random_words, random_sentences
 
 
 class TestDummyDataGeneration(SimpleTestCase):
@@ -105,3 +108,42 @@ class TestDummyDataGeneration(SimpleTestCase):
                 datetime.date(*map(int, date.split('-')))
             except ValueError:
                 self.fail("Date is not valid")
+
+
+class TestTextSynthesis(SimpleTestCase):
+    def test_random_letters(self):
+        letters = random_letters(26000)
+
+        self.assertEqual(len(letters), 26000)
+        self.assertEqual(random_letters(0), '')
+        counts = Counter(letters)
+        self.assertEqual(set(counts), set('abcdefghijklmnopqrstuvwxyz'))
+        # Every letter is equally likely: expected count is 1000, with standard deviation about 31
+        self.assertTrue(all(800 < count < 1200 for count in counts.values()))
+
+    def test_seeded_letters_are_reproducible(self):
+        random.seed(42)
+        letters = random_letters(100)
+        random.seed(42)
+
+        self.assertEqual(random_letters(100), letters)
+
+    def test_random_lengths(self):
+        lengths = random_lengths(1000, 3, 5)
+
+        self.assertEqual(len(lengths), 1000)
+        self.assertEqual(set(lengths), {3, 4, 5})
+        self.assertEqual(random_lengths(0, 5, 3), [])
+        with self.assertRaises(ValueError):
+            random_lengths(1, 5, 3)
+
+    def test_random_words(self):
+        words = random_words([1, 3, 0, 2], separator='-')
+
+        self.assertTrue(re.fullmatch(r'[a-z]-[a-z]{3}--[a-z]{2}', words))
+        self.assertEqual(random_words([]), '')
+
+    def test_random_sentences(self):
+        self.assertTrue(re.fullmatch(r'[A-Z][a-z]{2} [a-z]{3}\. \. [A-Z][a-z]{2}\.', random_sentences([2, 0, 1], 3)))
+        self.assertEqual(random_sentences([2], 0), ' .')
+        self.assertEqual(random_sentences([], 3), '')
@@ -22,6 +22,19 @@ class TestDataGenerators(TestCase):
 
             self.assertTrue(self.minimal_test_value <= int(data) <= self.maximal_test_value)
 
+    def test_generating_cell_data_batch(self):
+        generator = CellDataGenerator(
+            data_type=Column.DataType.INTEGER,
+            have_limits=True,
+            minimal=self.minimal_test_value,
+            maximal=self.maximal_test_value,
+        )
+
+        data = generator.generate_batch(1000)
+
+        self.assertEqual(len(data), 1000)
+        self.assertTrue(all(self.minimal_test_value <= int(value) <= self.maximal_test_value for value in data))
+
     def test_generating_row_data(self):
         user = User.objects.create_user(
             username='dummy_test_user',
@@ -64,3 +77,15 @@ class TestDataGenerators(TestCase):
             self.assertEqual(set(data.keys()), column_names)
             self.assertTrue(all(map(lambda v: isinstance(v, str), data.values())))
             self.assertTrue(all(data.values()))
+
+        self.assertEqual(generator.column_names, [column.name for column in columns])
+        self.assertEqual(generator.data_types, [column.data_type for column in columns])
+        self.assertEqual(generator.value_options, [None, None, None, None, tuple(source_data['jobs'])])
+
+        data = generator.generate_columns(1000)
+
+        self.assertEqual(len(data), len(columns))
+        for values in data:
+            self.assertEqual(len(values), 1000)
+            self.assertTrue(all(map(lambda v: isinstance(v, str), values)))
+            self.assertTrue(all(values))
@@ -16,6 +16,15 @@ class TestGenerationManager(TestCase):
         self.assertTrue(callable(func))
         self.assertEqual(func.__name__, 'generate_word')
 
+    def test_get_batch_generation_method_returns_right_batch_function(self):
+        func = GenerationManager.get_batch_generation_method('FULL_NAME')
+
+        self.assertTrue(callable(func))
+        self.assertEqual(func.__name__, 'generate_full_name_batch')
+
+    def test_get_batch_generation_method_returns_None_if_not_exists(self):
+        self.assertIsNone(GenerationManager.get_batch_generation_method('Word'))
+
     def test_get_generation_kwargs_returns_kwargs_dict(self):
         kwargs = GenerationManager.get_generation_kwargs(
             have_limits=True,
@@ -0,0 +1,179 @@
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, SimpleTestCase
+
+from ..data_generators.file_cache import GeneratedFileCache
+from ..models import Separator, Schema, Column, DataSet, SourceData
+from schemas.settings import DATA_GENERATION_SETTINGS
+
+
+def use_temporary_file_cache(test_case) -> GeneratedFileCache:
+    """
+    Replaces cache of generated files with empty one in temporary directory till the end of test,
+    so tests neither leave files in cache of MEDIA_ROOT, nor take files, left there by other runs.
+    """
+    directory = tempfile.TemporaryDirectory()
+    test_case.addCleanup(directory.cleanup)
+    cache = GeneratedFileCache(directory.name, max_size=10 ** 6)
+    for target in ('mainapp.data_generators.file_generation.generated_file_cache',
+                   'mainapp.management.commands.generation_cache_stats.generated_file_cache'):
+        patcher = mock.patch(target, cache)
+        patcher.start()
+        test_case.addCleanup(patcher.stop)
+    return cache
+
+
+class TestGeneratedFileCache(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = GeneratedFileCache(os.path.join(self.directory.name, 'cache'), max_size=25)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def create_file(self, name, content=b'0123456789'):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'wb') as file:
+            file.write(content)
+        return path
+
+    def test_get_missing_file(self):
+        self.assertFalse(self.cache.get('missing', os.path.join(self.directory.name, 'destination')))
+
+    def test_put_and_get(self):
+        self.cache.put('fingerprint', self.create_file('source'))
+        destination = os.path.join(self.directory.name, 'destination')
+
+        self.assertTrue(self.cache.get('fingerprint', destination))
+        with open(destination, 'rb') as file:
+            self.assertEqual(file.read(), b'0123456789')
+
+    def test_deleting_linked_file_does_not_affect_cache(self):
+        source = self.create_file('source')
+        self.cache.put('fingerprint', source)
+        os.remove(source)
+
+        self.assertTrue(self.cache.get('fingerprint', os.path.join(self.directory.name, 'destination')))
+
+    def test_least_recently_used_evicted(self):
+        for i, fingerprint in enumerate(('first', 'second')):
+            self.cache.put(fingerprint, self.create_file(f'source_{i}'))
+            used = time.time() - 100 + i
+            os.utime(os.path.join(self.cache.directory, GeneratedFileCache.MARKERS_DIRECTORY, fingerprint),
+                     (used, used))
+
+        # Using of first file makes second one least recently used
+        self.cache.get('first', os.path.join(self.directory.name, 'destination'))
+        self.cache.put('third', self.create_file('source_3'))
+
+        self.assertEqual({os.path.basename(path) for path, _ in self.cache.get_entries()}, {'first', 'third'})
+        self.assertEqual(sorted(os.listdir(os.path.join(self.cache.directory, GeneratedFileCache.MARKERS_DIRECTORY))),
+                         ['first', 'third'])
+
+    def test_getting_does_not_change_linked_files(self):
+        source = self.create_file('source')
+        modified = time.time() - 100
+        os.utime(source, (modified, modified))
+        self.cache.put('fingerprint', source)
+        stat = os.stat(source)
+
+        self.cache.get('fingerprint', os.path.join(self.directory.name, 'destination'))
+
+        # Files of data sets, taken from cache before, keep their ETag and Last-Modified
+        self.assertEqual(os.stat(source).st_mtime_ns, stat.st_mtime_ns)
+        self.assertEqual(os.stat(os.path.join(self.directory.name, 'destination')).st_mtime_ns, stat.st_mtime_ns)
+
+
+class TestCachedGeneration(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.user = User.objects.create_user(username='dummy_test_user', password='32145', email='dummy@gmail.com')
+        delimiter = Separator.objects.create(name='dot', char='.')
+        quotechar = Separator.objects.create(name='double-quote', char='"')
+        cls.schema = Schema.objects.create(name='test_schema', owner=cls.user, delimiter=delimiter,
+                                           quotechar=quotechar)
+        cls.column = Column.objects.create(name='integer', minimal=1, maximal=10, data_type=Column.DataType.INTEGER,
+                                           schema=cls.schema)
+        Column.objects.create(name='job', data_type=Column.DataType.JOB, schema=cls.schema, order=2)
+        SourceData.objects.bulk_create([SourceData(source_type='jobs', source_data=job)
+                                        for job in ('farmer', 'plumber')])
+
+    def setUp(self):
+        self.cache = use_temporary_file_cache(self)
+
+    def tearDown(self):
+        for data_set in DataSet.objects.all():
+            if data_set.file:
+                data_set.file.delete()
+
+    def test_fingerprint_changes(self):
+        data_set = DataSet(schema=self.schema, seed=1)
+        fingerprint = data_set.get_fingerprint(100)
+
+        self.assertEqual(DataSet(schema=self.schema, seed=1).get_fingerprint(100), fingerprint)
+        self.assertNotEqual(DataSet(schema=self.schema, seed=2).get_fingerprint(100), fingerprint)
+        self.assertNotEqual(data_set.get_fingerprint(101), fingerprint)
+
+        self.column.maximal = 11
+        self.column.save()
+        self.assertNotEqual(data_set.get_fingerprint(100), fingerprint)
+        fingerprint = data_set.get_fingerprint(100)
+
+        SourceData.objects.create(source_type='jobs', source_data='driver')
+        self.assertNotEqual(data_set.get_fingerprint(100), fingerprint)
+        fingerprint = data_set.get_fingerprint(100)
+
+        self.assertNotEqual(data_set.get_fingerprint(100, chunk_size=10), fingerprint)
+
+    def test_fingerprint_depends_only_on_content_settings(self):
+        data_set = DataSet(schema=self.schema, seed=1)
+        fingerprint = data_set.get_fingerprint(100)
+
+        with mock.patch.dict(DATA_GENERATION_SETTINGS["QUEUE"], WORKERS=10), \
+                mock.patch.dict(DATA_GENERATION_SETTINGS["DOWNLOAD"], OFFLOAD_URL='/other/'):
+            self.assertEqual(data_set.get_fingerprint(100), fingerprint)
+        with mock.patch.dict(DATA_GENERATION_SETTINGS["EML"], MAX_EMAIL_NAME_LENGTH=20):
+            self.assertNotEqual(data_set.get_fingerprint(100), fingerprint)
+
+    def test_same_seeded_data_set_taken_from_cache(self):
+        data_set = DataSet.objects.create(schema=self.schema, seed=1)
+        data_set.generate_file(100)
+        cached_data_set = DataSet.objects.create(schema=self.schema, seed=1)
+        cached_data_set.generate_file(100)
+
+        self.assertFalse(data_set.from_cache)
+        self.assertTrue(cached_data_set.from_cache)
+        self.assertEqual(cached_data_set.rows_written, 100)
+        self.assertEqual(cached_data_set.bytes_written, os.path.getsize(cached_data_set.file.path))
+        self.assertEqual(data_set.fingerprint, cached_data_set.fingerprint)
+        self.assertNotEqual(data_set.file.name, cached_data_set.file.name)
+        with open(data_set.file.path, 'rb') as file, open(cached_data_set.file.path, 'rb') as cached_file:
+            self.assertEqual(file.read(), cached_file.read())
+
+    def test_not_seeded_data_set_not_cached(self):
+        data_set = DataSet.objects.create(schema=self.schema)
+        data_set.generate_file(100)
+        second_data_set = DataSet.objects.create(schema=self.schema)
+        second_data_set.generate_file(100)
+
+        self.assertFalse(second_data_set.fingerprint)
+        self.assertFalse(second_data_set.from_cache)
+
+    def test_generation_cache_stats_command(self):
+        for _ in range(4):
+            DataSet.objects.create(schema=self.schema, seed=1).generate_file(100)
+
+        out = StringIO()
+        call_command('generation_cache_stats', stdout=out)
+
+        self.assertIn("Seeded data sets: 4", out.getvalue())
+        self.assertIn("Taken from cache: 3 (75.0%)", out.getvalue())
+        self.assertIn("Cached files: 1", out.getvalue())
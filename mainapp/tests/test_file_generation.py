@@ -1,12 +1,38 @@
+import bz2
 import csv
+import gzip
+import io
+import lzma
 import os
 import re
+from io import StringIO
+from unittest import mock
 
+import pyarrow as pa
+import pyarrow.ipc
+import pyarrow.parquet
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.management import call_command
+from django.test import TestCase, SimpleTestCase
 
-from ..data_generators.file_generation import generate_csv_file
+from ..data_generators import columnar_generation
+from ..data_generators.data_generators import RowDataGenerator
+
+from ..data_generators.file_generation import generate_csv_file, format_csv_rows, iter_csv_chunks, split_to_shards, \
+    iter_sized_csv_chunks, allocate_data_set_file, get_data_set_file_path, limit_chunk_size, DATA_SETS_DIRECTORY
 from ..models import Separator, Schema, Column, DataSet, SourceData
+from schemas.settings import MEDIA_ROOT
+
+
+def list_data_sets_files() -> set[str]:
+    """Returns paths of all files of data sets, relative to MEDIA_ROOT, except cached ones."""
+    paths = set()
+    for directory, directories, filenames in os.walk(os.path.join(MEDIA_ROOT, DATA_SETS_DIRECTORY)):
+        if directory == os.path.join(MEDIA_ROOT, DATA_SETS_DIRECTORY) and 'cache' in directories:
+            directories.remove('cache')
+        paths.update(os.path.relpath(os.path.join(directory, filename), MEDIA_ROOT) for filename in filenames)
+    return paths
 
 
 class TestGenerateCSVFile(TestCase):
@@ -84,3 +110,411 @@ class TestGenerateCSVFile(TestCase):
             self.fail("invalid file")
         finally:
             data_set.file.delete()
+
+    def test_file_generating_by_small_chunks(self):
+        data_set = DataSet.objects.create(schema=self.schema)
+
+        generate_csv_file(data_set=data_set, rows_amount=1000, chunk_size=7)
+
+        try:
+            with open(os.path.abspath(data_set.file.path), newline='') as csvfile:
+                reader = csv.DictReader(csvfile, delimiter=self.delimiter.char, quotechar=self.quotechar.char)
+                self.assertEqual(reader.fieldnames, [self.column_1.name, self.column_2.name])
+                self.assertEqual(len(list(reader)), 1000)
+        finally:
+            data_set.file.delete()
+
+    def test_file_generating_by_shards(self):
+        data_set = DataSet.objects.create(schema=self.schema)
+        files_before = list_data_sets_files()
+
+        generate_csv_file(data_set=data_set, rows_amount=1000, chunk_size=100, workers=3, min_shard_rows=100)
+
+        self.assertTrue(data_set.finished)
+        self.assertTrue(data_set.file)
+
+        try:
+            with open(os.path.abspath(data_set.file.path), newline='') as csvfile:
+                rows = list(csv.reader(csvfile, delimiter=self.delimiter.char, quotechar=self.quotechar.char))
+
+            self.assertEqual(rows[0], [self.column_1.name, self.column_2.name])
+            self.assertEqual(len(rows), 1001)
+            self.assertNotIn(rows[0], rows[1:])
+            self.assertEqual(list_data_sets_files() - files_before, {data_set.file.name})
+        finally:
+            data_set.file.delete()
+
+    def test_same_seed_gives_same_file(self):
+        data_sets = [DataSet.objects.create(schema=self.schema, seed=42) for _ in range(3)]
+        other_seed_data_set = DataSet.objects.create(schema=self.schema, seed=43)
+
+        generate_csv_file(data_set=data_sets[0], rows_amount=1000, chunk_size=100)
+        generate_csv_file(data_set=data_sets[1], rows_amount=1000, chunk_size=100)
+        generate_csv_file(data_set=data_sets[2], rows_amount=1000, chunk_size=100, workers=3, min_shard_rows=100)
+        generate_csv_file(data_set=other_seed_data_set, rows_amount=1000, chunk_size=100)
+
+        try:
+            contents = []
+            for data_set in data_sets + [other_seed_data_set]:
+                with open(data_set.file.path, 'rb') as csvfile:
+                    contents.append(csvfile.read())
+
+            self.assertEqual(contents[0], contents[1])
+            self.assertEqual(contents[0], contents[2])
+            self.assertNotEqual(contents[0], contents[3])
+        finally:
+            for data_set in data_sets + [other_seed_data_set]:
+                data_set.file.delete()
+
+    def test_compressed_file_generating(self):
+        data_set = DataSet.objects.create(schema=self.schema, seed=42)
+        generate_csv_file(data_set=data_set, rows_amount=1000, chunk_size=100)
+        compressed_data_sets = []
+
+        try:
+            with open(data_set.file.path, 'rb') as csvfile:
+                content = csvfile.read()
+
+            for compression, decompress in ((DataSet.Compression.GZIP, gzip.decompress),
+                                            (DataSet.Compression.BZIP2, bz2.decompress),
+                                            (DataSet.Compression.LZMA, lzma.decompress)):
+                for workers in (1, 3):
+                    with self.subTest(compression=compression, workers=workers):
+                        compressed_data_set = DataSet.objects.create(schema=self.schema, seed=42,
+                                                                     compression=compression)
+                        compressed_data_sets.append(compressed_data_set)
+
+                        generate_csv_file(data_set=compressed_data_set, rows_amount=1000, chunk_size=100,
+                                          workers=workers, min_shard_rows=100)
+
+                        self.assertTrue(compressed_data_set.file.name.endswith(f'.csv.{compression}'))
+                        with open(compressed_data_set.file.path, 'rb') as compressed_file:
+                            self.assertEqual(decompress(compressed_file.read()), content)
+        finally:
+            for generated_data_set in [data_set] + compressed_data_sets:
+                generated_data_set.file.delete()
+
+    def test_columnar_files_generating(self):
+        Column.objects.create(name='job', data_type=Column.DataType.JOB, schema=self.schema, order=3)
+        Column.objects.create(name='date', data_type=Column.DataType.DATE, schema=self.schema, order=4)
+        csv_data_set = DataSet.objects.create(schema=self.schema, seed=42)
+        parquet_data_set = DataSet.objects.create(schema=self.schema, seed=42, file_format=DataSet.FileFormat.PARQUET)
+        arrow_data_set = DataSet.objects.create(schema=self.schema, seed=42, file_format=DataSet.FileFormat.ARROW)
+
+        for data_set in (csv_data_set, parquet_data_set, arrow_data_set):
+            generate_csv_file(data_set=data_set, rows_amount=1000, chunk_size=300, workers=3, min_shard_rows=100)
+
+        try:
+            self.assertTrue(parquet_data_set.file.name.endswith('.parquet'))
+            self.assertTrue(arrow_data_set.file.name.endswith('.arrow'))
+
+            parquet_file = pa.parquet.ParquetFile(parquet_data_set.file.path)
+            self.assertEqual(parquet_file.metadata.num_rows, 1000)
+            # Every chunk is written as separate row group
+            self.assertEqual(parquet_file.metadata.num_row_groups, 4)
+
+            with pa.ipc.open_file(arrow_data_set.file.path) as reader:
+                arrow_table = reader.read_all()
+                self.assertEqual(reader.num_record_batches, 4)
+
+            parquet_table = parquet_file.read()
+            self.assertTrue(parquet_table.equals(arrow_table))
+            self.assertEqual(arrow_table.schema.types, [pa.int64(), pa.string(),
+                                                        pa.dictionary(pa.int32(), pa.string()), pa.date32()])
+
+            # Seeded files of different formats contain the same data
+            with open(csv_data_set.file.path, newline='') as csvfile:
+                rows = list(csv.reader(csvfile, delimiter=self.delimiter.char, quotechar=self.quotechar.char))
+            self.assertEqual(rows[0], arrow_table.column_names)
+            self.assertEqual(rows[1:], [[str(value) for value in row.values()] for row in arrow_table.to_pylist()])
+        finally:
+            for data_set in (csv_data_set, parquet_data_set, arrow_data_set):
+                data_set.file.delete()
+
+    def test_columnar_file_not_generated_without_pyarrow(self):
+        data_set = DataSet.objects.create(schema=self.schema, file_format=DataSet.FileFormat.PARQUET)
+
+        with mock.patch.object(columnar_generation, 'pa', None), \
+                self.assertLogs('mainapp.data_generators.file_generation', 'ERROR'):
+            generate_csv_file(data_set=data_set, rows_amount=10)
+
+        self.assertTrue(data_set.finished)
+        self.assertFalse(data_set.file)
+        self.assertEqual(data_set.error, 'ValueError: Format parquet is not available')
+
+    def test_progress_saved(self):
+        for workers, file_format in ((1, 'csv'), (3, 'csv'), (1, 'parquet')):
+            with self.subTest(workers=workers, file_format=file_format):
+                data_set = DataSet.objects.create(schema=self.schema, rows_amount=1000, file_format=file_format)
+                try:
+                    generate_csv_file(data_set=data_set, rows_amount=1000, chunk_size=100, workers=workers,
+                                      min_shard_rows=100, progress_interval=0)
+
+                    data_set.refresh_from_db()
+                    self.assertEqual(data_set.rows_written, 1000)
+                    self.assertGreater(data_set.bytes_written, 0)
+                    self.assertGreater(data_set.rows_per_second, 0)
+                    self.assertIsNotNone(data_set.time_progress)
+                    self.assertEqual(data_set.percent_complete, 100)
+                finally:
+                    data_set.file.delete()
+
+    def test_progress_is_throttled(self):
+        data_set = DataSet.objects.create(schema=self.schema)
+
+        with mock.patch.object(DataSet, 'save_progress', autospec=True) as save_progress:
+            generate_csv_file(data_set=data_set, rows_amount=1000, chunk_size=10, progress_interval=60)
+        data_set.file.delete()
+
+        # The only final report
+        save_progress.assert_called_once()
+        self.assertEqual(save_progress.call_args.args[1], 1000)
+
+    def test_failed_shard_cleans_up_all_parts(self):
+        # Limits are not validated on save, so generating of this column fails
+        Column.objects.create(name='broken_column', minimal=10, maximal=1, data_type=Column.DataType.INTEGER,
+                              schema=self.schema, order=3)
+        data_set = DataSet.objects.create(schema=self.schema)
+        files_before = list_data_sets_files()
+
+        with self.assertLogs('mainapp.data_generators.file_generation', 'ERROR'):
+            generate_csv_file(data_set=data_set, rows_amount=1000, chunk_size=100, workers=3, min_shard_rows=100)
+
+        self.assertTrue(data_set.finished)
+        self.assertFalse(data_set.file)
+        self.assertEqual(list_data_sets_files(), files_before)
+        data_set.refresh_from_db()
+        self.assertTrue(data_set.error.startswith('ValueError'))
+        self.assertIsNotNone(data_set.time_finished)
+
+    def test_file_appears_only_when_complete(self):
+        data_set = DataSet.objects.create(schema=self.schema)
+        absolute_path = os.path.join(MEDIA_ROOT, get_data_set_file_path(data_set))
+        final_files_sizes = []
+
+        def save_progress(data_set, *args):
+            # Final file is only allocated while content is written
+            final_files_sizes.append(os.path.getsize(absolute_path))
+
+        with mock.patch.object(DataSet, 'save_progress', autospec=True, side_effect=save_progress):
+            generate_csv_file(data_set=data_set, rows_amount=1000, chunk_size=10, progress_interval=0)
+        self.addCleanup(data_set.file.delete)
+
+        self.assertTrue(final_files_sizes)
+        self.assertEqual(final_files_sizes[:-1], [0] * (len(final_files_sizes) - 1))
+        self.assertGreater(os.path.getsize(data_set.file.path), 0)
+        self.assertFalse(os.path.exists(f'{data_set.file.path}.tmp'))
+        self.assertEqual(data_set.error, '')
+
+    def test_file_synced_by_batches(self):
+        data_set = DataSet.objects.create(schema=self.schema)
+
+        with mock.patch('mainapp.data_generators.file_generation.os.fsync', wraps=os.fsync) as fsync:
+            generate_csv_file(data_set=data_set, rows_amount=1000, chunk_size=100, fsync_bytes=1)
+        self.addCleanup(data_set.file.delete)
+
+        # Every chunk, the whole file before renaming, and its directory after renaming
+        self.assertEqual(fsync.call_count, 10 + 2)
+
+
+class TestAllocateDataSetFile(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username='dummy_test_user', password='32145')
+        separator = Separator.objects.create(name='comma', char=',')
+        cls.schema = Schema.objects.create(name='test_schema', owner=user, delimiter=separator, quotechar=separator)
+
+    def allocate(self, data_set):
+        path = allocate_data_set_file(data_set)
+        self.addCleanup(os.remove, os.path.join(MEDIA_ROOT, path))
+        return path
+
+    def test_path_by_pk(self):
+        data_set = DataSet.objects.create(schema=self.schema, compression=DataSet.Compression.GZIP)
+
+        path = self.allocate(data_set)
+
+        self.assertEqual(path, get_data_set_file_path(data_set))
+        self.assertEqual(os.path.basename(path), f'test_schema_data_set_{data_set.pk}.csv.gz')
+        self.assertEqual(os.path.dirname(path), os.path.join(DATA_SETS_DIRECTORY, f'{data_set.pk % 256:02x}'))
+        self.assertEqual(os.path.getsize(os.path.join(MEDIA_ROOT, path)), 0)
+
+    def test_existing_file_is_not_taken(self):
+        data_set = DataSet.objects.create(schema=self.schema)
+
+        first_path = self.allocate(data_set)
+        second_path = self.allocate(data_set)
+
+        self.assertNotEqual(first_path, second_path)
+        self.assertEqual(os.path.dirname(first_path), os.path.dirname(second_path))
+        self.assertTrue(os.path.basename(second_path).startswith(f'test_schema_data_set_{data_set.pk}_'))
+
+    def test_data_set_without_pk_gets_random_name(self):
+        data_set = DataSet(schema=self.schema)
+
+        self.assertNotEqual(self.allocate(data_set), self.allocate(data_set))
+
+    def test_name_of_schema_is_cleaned(self):
+        for name, prefix in (('../../../x', 'x_'), ('a/b', 'ab_'), ('Схема данных', ''), ('My schéma 1', 'my-schema-1_')):
+            with self.subTest(name=name):
+                data_set = DataSet.objects.create(schema=self.schema, compression=DataSet.Compression.GZIP)
+                data_set.schema.name = name
+
+                path = self.allocate(data_set)
+
+                self.assertEqual(path, get_data_set_file_path(data_set))
+                self.assertEqual(os.path.dirname(path), os.path.join(DATA_SETS_DIRECTORY, f'{data_set.pk % 256:02x}'))
+                self.assertEqual(os.path.basename(path), f'{prefix}data_set_{data_set.pk}.csv.gz')
+
+    def test_path_outside_of_directory(self):
+        data_set = DataSet.objects.create(schema=self.schema)
+
+        for path in ('x.csv', os.path.join(DATA_SETS_DIRECTORY, '..', '..', 'x.csv')):
+            with self.subTest(path=path), \
+                    mock.patch('mainapp.data_generators.file_generation.get_data_set_file_path', return_value=path), \
+                    mock.patch('mainapp.data_generators.file_generation.os.makedirs') as makedirs:
+                with self.assertRaises(SuspiciousFileOperation):
+                    allocate_data_set_file(data_set)
+                makedirs.assert_not_called()
+
+    def test_relocate_command(self):
+        old_path = os.path.join(DATA_SETS_DIRECTORY, 'test_schema_data_set(1).csv')
+        with open(os.path.join(MEDIA_ROOT, old_path), 'w') as file:
+            file.write('content')
+        data_set = DataSet.objects.create(schema=self.schema, file=old_path, finished=True)
+        missing_data_set = DataSet.objects.create(schema=self.schema, file='csv_files/missing.csv', finished=True)
+
+        out = StringIO()
+        call_command('relocate_data_set_files', dry_run=True, stdout=out, stderr=StringIO())
+        self.assertIn('Files to move: 1, missing: 1', out.getvalue())
+        self.assertTrue(os.path.isfile(os.path.join(MEDIA_ROOT, old_path)))
+
+        out = StringIO()
+        call_command('relocate_data_set_files', stdout=out, stderr=StringIO())
+        data_set.refresh_from_db()
+        self.addCleanup(data_set.file.delete)
+        self.assertIn('Moved files: 1, missing: 1', out.getvalue())
+        self.assertEqual(data_set.file.name, get_data_set_file_path(data_set))
+        self.assertFalse(os.path.exists(os.path.join(MEDIA_ROOT, old_path)))
+        with data_set.file.open('r') as file:
+            self.assertEqual(file.read(), 'content')
+        missing_data_set.refresh_from_db()
+        self.assertEqual(missing_data_set.file.name, 'csv_files/missing.csv')
+
+        # Relocated files are not moved again
+        out = StringIO()
+        call_command('relocate_data_set_files', stdout=out, stderr=StringIO())
+        self.assertIn('Moved files: 0, missing: 1', out.getvalue())
+
+
+class TestSplitToShards(SimpleTestCase):
+    def test_one_worker_gives_one_shard(self):
+        self.assertEqual(split_to_shards(1000, workers=1, min_shard_rows=10, chunk_size=100), [1000])
+
+    def test_too_few_rows_for_sharding(self):
+        self.assertEqual(split_to_shards(1000, workers=4, min_shard_rows=600, chunk_size=100), [1000])
+
+    def test_shards_consist_of_whole_chunks(self):
+        self.assertEqual(split_to_shards(1050, workers=4, min_shard_rows=100, chunk_size=100), [300, 300, 300, 150])
+        self.assertEqual(split_to_shards(1000, workers=3, min_shard_rows=100, chunk_size=300), [600, 400])
+
+    def test_not_more_shards_than_chunks(self):
+        self.assertEqual(split_to_shards(150, workers=8, min_shard_rows=1, chunk_size=100), [100, 50])
+
+
+class TestLimitChunkSize(SimpleTestCase):
+    def test_chunk_of_large_rows_is_limited(self):
+        data_generator = FixedDataGenerator(['id', 'text'], [('1', 'a' * 996)])
+
+        self.assertEqual(limit_chunk_size(data_generator, 10000, 5000, ',', '"', entropy=0, chunk_bytes=100000,
+                                          probe_rows=10), 100)
+        self.assertEqual(limit_chunk_size(data_generator, 10000, 5000, ',', '"', entropy=0, chunk_bytes=100,
+                                          probe_rows=10), 1)
+
+    def test_chunk_of_small_rows_is_not_changed(self):
+        data_generator = FixedDataGenerator(['id'], [('1',)])
+
+        self.assertEqual(limit_chunk_size(data_generator, 10000, 5000, ',', '"', entropy=0, chunk_bytes=100000,
+                                          probe_rows=10), 5000)
+        # Limit is off
+        data_generator = FixedDataGenerator(['text'], [('a' * 1000,)])
+        self.assertEqual(limit_chunk_size(data_generator, 10000, 5000, ',', '"', entropy=0, chunk_bytes=0), 5000)
+        # No rows to probe
+        self.assertEqual(limit_chunk_size(data_generator, 0, 5000, ',', '"', entropy=0), 5000)
+
+    def test_seeded_chunk_size_is_the_same(self):
+        columns = [Column(name='text', data_type=Column.DataType.TEXT, minimal=1, maximal=50, order=1)]
+        chunk_sizes = set()
+        for _ in range(3):
+            data_generator = RowDataGenerator(columns)
+            chunk_sizes.add(limit_chunk_size(data_generator, 10000, 5000, ',', '"', entropy=7, chunk_bytes=100000))
+
+        self.assertEqual(len(chunk_sizes), 1)
+        self.assertLess(chunk_sizes.pop(), 5000)
+
+
+class FixedDataGenerator:
+    """Generator of rows, which repeats given rows in cycle."""
+    def __init__(self, column_names, rows):
+        self.column_names = column_names
+        self.rows = rows
+        self.rows_generated = 0
+
+    def prepare_unique(self, rows_amount, seed_sequence):
+        pass
+
+    def reseed(self, seed_sequence):
+        pass
+
+    def generate_columns(self, size, start=0):
+        rows = [self.rows[(self.rows_generated + i) % len(self.rows)] for i in range(size)]
+        self.rows_generated += size
+        return [list(column) for column in zip(*rows)]
+
+
+class TestCSVFormatting(SimpleTestCase):
+    column_names = ['first', 'second', 'third']
+
+    def assertSameAsDictWriter(self, column_names, rows, delimiter, quotechar):
+        expected = io.StringIO()
+        writer = csv.DictWriter(expected, fieldnames=column_names, delimiter=delimiter, quotechar=quotechar,
+                                quoting=csv.QUOTE_MINIMAL)
+        writer.writeheader()
+        for _ in range(3):
+            for row in rows:
+                writer.writerow(dict(zip(column_names, row)))
+
+        chunks = iter_csv_chunks(FixedDataGenerator(column_names, rows), rows_amount=len(rows) * 3,
+                                 delimiter=delimiter, quotechar=quotechar, chunk_size=2)
+
+        self.assertEqual(''.join(chunks), expected.getvalue())
+
+    def test_rows_without_quoting(self):
+        rows = [('1', 'Alice Smith', 'text. more text.'), ('2', '', 'a@gmail.com')]
+
+        self.assertSameAsDictWriter(self.column_names, rows, delimiter=',', quotechar='"')
+
+    def test_rows_with_delimiter_and_quotechar(self):
+        rows = [('1', 'Alice, Smith', 'text'), ('2', 'say "hi"', 'line\nbreak'), ('3', 'plain', 'plain')]
+
+        self.assertSameAsDictWriter(self.column_names, rows, delimiter=',', quotechar='"')
+        self.assertSameAsDictWriter(self.column_names, rows, delimiter=' ', quotechar="'")
+
+    def test_single_column_with_empty_value(self):
+        self.assertSameAsDictWriter(['only'], [('a',), ('',)], delimiter=';', quotechar='"')
+
+    def test_format_rows_without_quoting_joins_directly(self):
+        self.assertEqual(format_csv_rows([['1', '2'], ['a', 'b']], delimiter='.', quotechar='"'), '1.a\r\n2.b\r\n')
+
+
+class TestSizedCSVChunks(SimpleTestCase):
+    def test_chunks_sized_by_bytes(self):
+        rows = [('1', 'Alice Smith'), ('2', 'Bob Johnson')]
+        data_generator = FixedDataGenerator(['id', 'name'], rows)
+
+        chunks = list(iter_sized_csv_chunks(data_generator, rows_amount=10000, delimiter=',', quotechar='"',
+                                            chunk_bytes=1000))
+
+        self.assertEqual(chunks[0], 'id,name\r\n')
+        self.assertEqual(sum(chunk.count('\r\n') for chunk in chunks[1:]), 10000)
+        self.assertTrue(all(len(chunk) <= 1100 for chunk in chunks[2:]))
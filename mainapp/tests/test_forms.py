@@ -125,6 +125,29 @@ class TestColumnFormSet(TestCase):
 
         self.assertFalse(formset.is_valid())
 
+    def test_unique_for_type_without_unique_values(self):
+        data = {
+            'columns-TOTAL_FORMS': 2,
+            'columns-INITIAL_FORMS': 0,
+            'columns-MIN_NUM': 0,
+            'columns-MAX_NUM_FORMS': 1000,
+            'columns-0-name': 'Column1',
+            'columns-0-data_type': Column.DataType.FULL_NAME,
+            'columns-0-unique': 'on',
+            'columns-0-ORDER': 1,
+            'columns-1-name': 'Column2',
+            'columns-1-minimal': 0,
+            'columns-1-maximal': 10,
+            'columns-1-data_type': Column.DataType.INTEGER,
+            'columns-1-unique': 'on',
+            'columns-1-ORDER': 2,
+        }
+        formset = ColumnFormSet(data=data)
+
+        self.assertFalse(formset.is_valid())
+        self.assertTrue(formset.forms[0].errors)
+        self.assertFalse(formset.forms[1].errors)
+
     def test_no_limits_where_needs(self):
         data = {
             'columns-TOTAL_FORMS': 2,
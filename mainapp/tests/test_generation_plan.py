@@ -0,0 +1,160 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, SimpleTestCase
+
+from schemas.settings import DATA_GENERATION_SETTINGS
+from ..data_generators.data_generation import generate_email, generate_text
+from ..data_generators.data_generators import CellDataGenerator
+from ..data_generators.generation_plan import GenerationPlanCache
+from ..data_generators.managers import GenerationManager
+from ..forms import ColumnFormSet
+from ..models import Separator, Schema, Column, SourceData
+
+
+class TestGenerationPlanCache(SimpleTestCase):
+    def setUp(self):
+        self.cache = GenerationPlanCache(max_size=2)
+        self.compilations = 0
+        self.source_versions = {'jobs': '1'}
+
+    def compile_plan(self):
+        self.compilations += 1
+        return object(), dict(self.source_versions)
+
+    def get_plan(self, schema_pk=1, columns_version='1'):
+        return self.cache.get_plan(schema_pk, columns_version, compile_plan=self.compile_plan,
+                                   get_source_version=self.source_versions.get)
+
+    def test_plan_compiled_once_for_version(self):
+        plan = self.get_plan()
+
+        self.assertIs(self.get_plan(), plan)
+        self.assertEqual(self.compilations, 1)
+
+    def test_plan_compiled_again_on_columns_version_change(self):
+        self.get_plan()
+        self.get_plan(columns_version='2')
+
+        self.assertEqual(self.compilations, 2)
+
+    def test_plan_compiled_again_on_source_version_change(self):
+        self.get_plan()
+        self.source_versions['jobs'] = '2'
+        self.get_plan()
+
+        self.assertEqual(self.compilations, 2)
+
+    def test_least_recently_used_plan_evicted(self):
+        self.get_plan(schema_pk=1)
+        self.get_plan(schema_pk=2)
+        self.get_plan(schema_pk=1)
+        self.get_plan(schema_pk=3)
+        self.assertEqual(self.compilations, 3)
+
+        self.get_plan(schema_pk=1)
+        self.assertEqual(self.compilations, 3)
+        self.get_plan(schema_pk=2)
+        self.assertEqual(self.compilations, 4)
+
+
+class TestSettingsBinding(SimpleTestCase):
+    def test_get_settings_kwargs_returns_only_parameters_of_method(self):
+        kwargs = GenerationManager.get_settings_kwargs('TEXT', generate_text)
+
+        self.assertEqual(set(kwargs), {'min_word_length', 'min_sentence_length', 'max_sentence_length'})
+
+    def test_get_settings_kwargs_for_data_type_without_settings(self):
+        self.assertEqual(GenerationManager.get_settings_kwargs('JOB', generate_email), {})
+
+    def test_bound_settings_are_used(self):
+        email = generate_email(min_email_name_length=2, max_email_name_length=2, email_domains=['test.com'])
+
+        self.assertRegex(email, r'^[a-z]{2}@test\.com$')
+
+    def test_settings_bound_to_batch_generation(self):
+        with mock.patch.dict(DATA_GENERATION_SETTINGS["EML"], MIN_EMAIL_NAME_LENGTH=2, MAX_EMAIL_NAME_LENGTH=2,
+                             EMAIL_DOMAINS=['test.com']):
+            generator = CellDataGenerator(Column.DataType.EMAIL, have_limits=False)
+
+        # Settings are taken, when generator is created, not on every batch
+        for email in generator.generate_batch(100):
+            self.assertRegex(email, r'^[a-z]{2}@test\.com$')
+
+
+class TestSchemaGenerationPlan(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='dummy_test_user', password='32145', email='dummy@gmail.com')
+        delimiter = Separator.objects.create(name='dot', char='.')
+        quotechar = Separator.objects.create(name='double-quote', char='"')
+        self.schema = Schema.objects.create(name='test_schema', owner=user, delimiter=delimiter, quotechar=quotechar)
+        self.column = Column.objects.create(name='integer', minimal=1, maximal=10, data_type=Column.DataType.INTEGER,
+                                            schema=self.schema)
+        Column.objects.create(name='job', data_type=Column.DataType.JOB, schema=self.schema, order=2)
+        SourceData.objects.bulk_create([SourceData(source_type='jobs', source_data=job)
+                                        for job in ('farmer', 'plumber')])
+
+    def test_plan_is_cached(self):
+        plan = self.schema.get_generation_plan()
+
+        # Versions of columns and of source data are checked only
+        with self.assertNumQueries(2):
+            self.assertIs(self.schema.get_generation_plan(), plan)
+        self.assertEqual(plan.column_names, ['integer', 'job'])
+
+    def test_data_generators_share_plan(self):
+        first_generator = self.schema.get_data_generator()
+        second_generator = self.schema.get_data_generator()
+
+        self.assertIs(first_generator.plan, second_generator.plan)
+        self.assertEqual(set(first_generator()), {'integer', 'job'})
+        self.assertNotEqual(first_generator.generate_columns(100), second_generator.generate_columns(100))
+
+    def test_plan_compiled_again_on_column_change(self):
+        plan = self.schema.get_generation_plan()
+
+        self.column.name = 'renamed'
+        self.column.save()
+
+        self.assertEqual(self.schema.get_generation_plan().column_names, ['renamed', 'job'])
+        self.assertIsNot(self.schema.get_generation_plan(), plan)
+
+    def test_plan_compiled_again_on_bulk_changes(self):
+        self.schema.get_generation_plan()
+        Column.objects.bulk_create([Column(name='date', data_type=Column.DataType.DATE, schema=self.schema, order=3)])
+        self.assertEqual(self.schema.get_generation_plan().column_names, ['integer', 'job', 'date'])
+
+        Column.objects.filter(name='date').update(name='day')
+        self.assertEqual(self.schema.get_generation_plan().column_names, ['integer', 'job', 'day'])
+
+    def test_plan_compiled_again_on_column_formset_save(self):
+        self.schema.get_generation_plan()
+        columns = list(self.schema.columns.all())
+        data = {
+            'columns-TOTAL_FORMS': 2,
+            'columns-INITIAL_FORMS': 2,
+            'columns-MIN_NUM': 0,
+            'columns-MAX_NUM_FORMS': 1000,
+            'columns-0-id': columns[0].pk,
+            'columns-0-name': 'integer',
+            'columns-0-data_type': Column.DataType.INTEGER,
+            'columns-0-minimal': 1,
+            'columns-0-maximal': 10,
+            'columns-0-ORDER': 2,
+            'columns-1-id': columns[1].pk,
+            'columns-1-name': 'job',
+            'columns-1-data_type': Column.DataType.JOB,
+            'columns-1-ORDER': 1,
+        }
+        formset = ColumnFormSet(data=data, instance=self.schema)
+        self.assertTrue(formset.is_valid())
+        formset.save()
+
+        self.assertEqual(self.schema.get_generation_plan().column_names, ['job', 'integer'])
+
+    def test_plan_compiled_again_on_source_data_change(self):
+        self.schema.get_generation_plan()
+
+        SourceData.objects.create(source_type='jobs', source_data='driver')
+
+        self.assertEqual(self.schema.get_data_generator().value_options[1], ('farmer', 'plumber', 'driver'))
@@ -0,0 +1,239 @@
+import json
+import os
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from .test_file_cache import use_temporary_file_cache
+from ..generation_queue import enqueue_data_set, claim_next_data_set, recover_orphaned_data_sets, run_worker, \
+    enqueue_data_sets, clean_generation_options, heartbeat
+from ..data_generators.file_generation import allocate_data_set_file, get_data_set_file_path
+from ..models import Separator, Schema, Column, DataSet
+from schemas.settings import MEDIA_ROOT
+
+
+class TestGenerationQueue(TestCase):
+    dummy_username = 'dummy_test_user'
+    dummy_password = '32145'
+    dummy_email = 'dummy@gmail.com'
+
+    schema_name = 'test_schema'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.user = User.objects.create_user(
+            username=cls.dummy_username,
+            password=cls.dummy_password,
+            email=cls.dummy_email,
+        )
+        cls.second_user = User.objects.create_user(
+            username='second_user',
+            password='54321',
+            email='seconduser@gmail.com',
+        )
+
+        cls.delimiter = Separator.objects.create(name='dot', char='.')
+        cls.quotechar = Separator.objects.create(name='double-quote', char='"')
+
+        cls.schema = Schema.objects.create(
+            name=cls.schema_name,
+            owner=cls.user,
+            delimiter=cls.delimiter,
+            quotechar=cls.quotechar,
+        )
+        cls.second_schema = Schema.objects.create(
+            name='second_schema',
+            owner=cls.second_user,
+            delimiter=cls.delimiter,
+            quotechar=cls.quotechar,
+        )
+
+        for schema in (cls.schema, cls.second_schema):
+            Column.objects.create(
+                name='first_column_queue_test',
+                minimal=1,
+                maximal=10,
+                data_type=Column.DataType.INTEGER,
+                schema=schema,
+            )
+
+    def setUp(self):
+        use_temporary_file_cache(self)
+
+    def tearDown(self):
+        for data_set in DataSet.objects.all():
+            if data_set.file:
+                data_set.file.delete()
+
+    def test_enqueue_data_set(self):
+        data_set = enqueue_data_set(self.schema, 10)
+
+        self.assertFalse(data_set.finished)
+        self.assertIsNone(data_set.time_started)
+        self.assertEqual(data_set.rows_amount, 10)
+
+    def test_claim_oldest_data_set(self):
+        first = enqueue_data_set(self.schema, 10)
+        second = enqueue_data_set(self.schema, 10)
+
+        self.assertEqual(claim_next_data_set(max_jobs_per_user=5), first)
+        self.assertEqual(claim_next_data_set(max_jobs_per_user=5), second)
+        self.assertIsNone(claim_next_data_set(max_jobs_per_user=5))
+
+        first.refresh_from_db()
+        self.assertIsNotNone(first.time_started)
+
+    def test_claim_respects_max_jobs_per_user(self):
+        first = enqueue_data_set(self.schema, 10)
+        enqueue_data_set(self.schema, 10)
+        other_user_data_set = enqueue_data_set(self.second_schema, 10)
+
+        self.assertEqual(claim_next_data_set(max_jobs_per_user=1), first)
+        self.assertEqual(claim_next_data_set(max_jobs_per_user=1), other_user_data_set)
+        self.assertIsNone(claim_next_data_set(max_jobs_per_user=1))
+
+    def test_recover_orphaned_data_sets(self):
+        orphaned = DataSet.objects.create(schema=self.schema, rows_amount=10, time_started=timezone.now())
+        legacy = DataSet.objects.create(schema=self.schema)
+        finished = DataSet.objects.create(schema=self.schema, rows_amount=10, time_started=timezone.now(),
+                                          finished=True)
+        in_processing = DataSet.objects.create(schema=self.schema, rows_amount=10, time_started=timezone.now())
+        DataSet.objects.exclude(pk=in_processing.pk).update(time_update=timezone.now() - timedelta(seconds=301))
+
+        self.assertEqual(recover_orphaned_data_sets(stale_after=300), (1, 1))
+
+        orphaned.refresh_from_db()
+        legacy.refresh_from_db()
+        finished.refresh_from_db()
+        in_processing.refresh_from_db()
+
+        self.assertIsNone(orphaned.time_started)
+        self.assertFalse(orphaned.finished)
+        self.assertTrue(legacy.finished)
+        self.assertIsNotNone(legacy.time_finished)
+        self.assertIn('interrupted', legacy.error)
+        self.assertIsNotNone(finished.time_started)
+        # Data set, updated by heartbeat of its worker recently, is not taken from running worker
+        self.assertIsNotNone(in_processing.time_started)
+        self.assertFalse(in_processing.finished)
+
+    def test_recover_removes_left_files(self):
+        orphaned = DataSet.objects.create(schema=self.schema, rows_amount=10, time_started=timezone.now())
+        DataSet.objects.update(time_update=timezone.now() - timedelta(seconds=301))
+        path = os.path.join(MEDIA_ROOT, get_data_set_file_path(orphaned))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        stem = path.removesuffix('.csv')
+        left_files = {path: '', f'{path}.tmp': 'content', f'{path}.tmp.part0': 'content', f'{path}.link': '',
+                      f'{stem}_0123abcd.csv': ''}
+        # Complete file could belong to data set of other db with the same pk, other file is of other data set
+        kept_files = {f'{stem}_89abcdef.csv': 'content', f'{stem}0.csv': ''}
+        for file_path, content in {**left_files, **kept_files}.items():
+            with open(file_path, 'w') as file:
+                file.write(content)
+        for file_path in kept_files:
+            self.addCleanup(os.remove, file_path)
+
+        recover_orphaned_data_sets(stale_after=300)
+
+        self.assertFalse(any(os.path.exists(file_path) for file_path in left_files))
+        self.assertTrue(all(os.path.exists(file_path) for file_path in kept_files))
+
+        # Requeued data set gets file by its pk again
+        path = allocate_data_set_file(orphaned)
+        self.addCleanup(os.remove, os.path.join(MEDIA_ROOT, path))
+        self.assertEqual(path, get_data_set_file_path(orphaned))
+
+    def test_heartbeat_updates_data_set(self):
+        with mock.patch.object(DataSet.objects, 'filter') as data_sets_filter, \
+                mock.patch('mainapp.generation_queue.connections'):
+            with heartbeat(42, interval=0.01):
+                time.sleep(0.1)
+            calls = data_sets_filter.call_count
+            time.sleep(0.05)
+
+        self.assertGreater(calls, 1)
+        # Heartbeat stops with context
+        self.assertEqual(data_sets_filter.call_count, calls)
+        data_sets_filter.assert_called_with(pk=42, finished=False)
+
+    def test_burst_worker_generates_all_queued(self):
+        data_sets = [enqueue_data_set(self.schema, 10), enqueue_data_set(self.second_schema, 20)]
+
+        run_worker(burst=True)
+
+        for data_set in data_sets:
+            data_set.refresh_from_db()
+            self.assertTrue(data_set.finished)
+            self.assertTrue(data_set.file)
+
+    def test_generation_worker_command(self):
+        data_set = enqueue_data_set(self.schema, 10)
+
+        call_command('generation_worker', workers=1, burst=True, stdout=StringIO())
+
+        data_set.refresh_from_db()
+        self.assertTrue(data_set.finished)
+        self.assertTrue(data_set.file)
+
+    def test_clean_generation_options(self):
+        self.assertEqual(clean_generation_options('10', '', None, ''),
+                         {'rows_amount': 10, 'seed': None, 'compression': '', 'file_format': 'csv'})
+        self.assertEqual(clean_generation_options(5, 7, 'gz')['seed'], 7)
+
+        for options in (('0',), ('a',), (10, 2 ** 63), (10, None, 'rar'), (10, None, 'gz', 'parquet'),
+                        (10, None, '', 'xlsx')):
+            with self.subTest(options=options):
+                with self.assertRaises(ValueError):
+                    clean_generation_options(*options)
+
+    def test_enqueue_data_sets_in_order_of_jobs(self):
+        jobs = [(self.second_schema, clean_generation_options(10)), (self.schema, clean_generation_options(20)),
+                (self.second_schema, clean_generation_options(30, 1))]
+
+        with self.assertNumQueries(1):
+            data_sets = enqueue_data_sets(jobs)
+
+        self.assertEqual([(data_set.schema, data_set.rows_amount) for data_set in data_sets],
+                         [(schema, options['rows_amount']) for schema, options in jobs])
+        # Data sets of the same schema are queued one after another
+        self.assertEqual(list(DataSet.objects.order_by('pk').values_list('rows_amount', flat=True)), [20, 10, 30])
+
+    def test_generate_data_sets_command(self):
+        jobs = [{'schema': self.schema.slug, 'rows': 10}, {'schema': self.second_schema.slug, 'rows': 5, 'seed': 1}]
+        with tempfile.TemporaryDirectory() as directory:
+            jobs_file = os.path.join(directory, 'jobs.json')
+            with open(jobs_file, 'w') as file:
+                json.dump({'jobs': jobs}, file)
+
+            out = StringIO()
+            call_command('generate_data_sets', jobs_file, workers=1, stdout=out)
+
+            data_sets = [DataSet.objects.get(pk=pk) for pk in json.loads(out.getvalue())]
+            self.assertEqual([data_set.rows_amount for data_set in data_sets], [10, 5])
+            self.assertTrue(all(data_set.finished and data_set.file for data_set in data_sets))
+
+            # Workers of command neither take data sets of other jobs, nor recover data sets of other workers
+            other_queued = enqueue_data_set(self.second_schema, 10)
+            in_processing = DataSet.objects.create(schema=self.schema, rows_amount=10, time_started=timezone.now())
+            DataSet.objects.filter(pk=in_processing.pk).update(time_update=timezone.now() - timedelta(days=1))
+            call_command('generate_data_sets', jobs_file, workers=1, stdout=StringIO())
+
+            other_queued.refresh_from_db()
+            in_processing.refresh_from_db()
+            self.assertIsNone(other_queued.time_started)
+            self.assertIsNotNone(in_processing.time_started)
+            self.assertFalse(in_processing.finished)
+
+            with open(jobs_file, 'w') as file:
+                json.dump([{'schema': 'not-existing', 'rows': 10}], file)
+            with self.assertRaises(CommandError):
+                call_command('generate_data_sets', jobs_file, stdout=StringIO())
@@ -53,8 +53,8 @@ class TestModels(TestCase):
         self.assertEqual(
             self.column._get_source_data(),
             {
-                'first_names': ['Alice', 'Bob', 'John', 'Jack', 'Piter'],
-                'last_names': ["Kapahu", "Kapanke", "Kapaun", "Kapelke", "Kaper"],
+                'first_names': ('Alice', 'Bob', 'John', 'Jack', 'Piter'),
+                'last_names': ("Kapahu", "Kapanke", "Kapaun", "Kapelke", "Kaper"),
             },
         )
 
@@ -75,6 +75,21 @@ class TestModels(TestCase):
             self.column.minimal = 100
             self.column.clean()
 
+    def test_column_text_maximal_bounded(self):
+        self.column.data_type = Column.DataType.TEXT
+        self.column.minimal = 1
+        self.column.maximal = 1001
+
+        with self.assertRaisesMessage(ValidationError, 'To should not be more than 1000'):
+            self.column.clean()
+
+        self.column.maximal = 1000
+        self.column.clean()
+        # Integers are not bounded
+        self.column.data_type = Column.DataType.INTEGER
+        self.column.maximal = 2 ** 31 - 1
+        self.column.clean()
+
     def test_column_minimal_and_maximal_forcibly_set_None_if_not_having_limits(self):
         self.column.minimal = 12
         self.column.maximal = 15
@@ -95,6 +110,15 @@ class TestModels(TestCase):
 
         self.assertTrue(isinstance(data_generator, RowDataGenerator))
 
+    def test_getting_row_data_generator_loads_source_data_once(self):
+        for i in range(5):
+            Column.objects.create(name=f'name_{i}', data_type=Column.DataType.FULL_NAME, schema=self.schema)
+        self.schema.get_data_generator()
+
+        # Columns and versions of first and last names
+        with self.assertNumQueries(3):
+            self.schema.get_data_generator()
+
     def test_getting_column_headers(self):
         Column.objects.create(name='second', data_type=Column.DataType.EMAIL, schema=self.schema)
         Column.objects.create(name='third', data_type=Column.DataType.EMAIL, schema=self.schema)
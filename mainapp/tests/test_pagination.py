@@ -0,0 +1,58 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from ..models import Separator, Schema, DataSet
+from ..pagination import paginate_by_keyset, encode_cursor, decode_cursor
+
+
+class TestKeysetPagination(TestCase):
+    ordering = ('-time_create', '-id')
+
+    def setUp(self):
+        user = User.objects.create_user(username='dummy_test_user', password='32145', email='dummy@gmail.com')
+        separator = Separator.objects.create(name='dot', char='.')
+        self.schema = Schema.objects.create(name='test_schema', owner=user, delimiter=separator, quotechar=separator)
+        DataSet.objects.bulk_create([DataSet(schema=self.schema) for _ in range(7)])
+        # Several data sets are created the same day, so id decides their order
+        DataSet.objects.filter(pk__in=list(DataSet.objects.values_list('pk', flat=True)[:3])).\
+            update(time_create=datetime.date(2023, 1, 1))
+        self.expected = list(DataSet.objects.order_by(*self.ordering))
+
+    def test_pages_go_one_after_another(self):
+        pages = []
+        cursor = None
+        while True:
+            data_sets, cursor = paginate_by_keyset(DataSet.objects.all(), self.ordering, 3, cursor)
+            pages.append(data_sets)
+            if cursor is None:
+                break
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([data_set for page in pages for data_set in page], self.expected)
+
+    def test_page_costs_one_query(self):
+        cursor = encode_cursor(self.expected[2], self.ordering)
+
+        with self.assertNumQueries(1):
+            data_sets, _ = paginate_by_keyset(DataSet.objects.all(), self.ordering, 3, cursor)
+        self.assertEqual(data_sets, self.expected[3:6])
+
+    def test_exact_pages_have_no_next_cursor(self):
+        data_sets, cursor = paginate_by_keyset(DataSet.objects.all(), self.ordering, 7)
+
+        self.assertEqual(len(data_sets), 7)
+        self.assertIsNone(cursor)
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor(self.expected[0], self.ordering)
+
+        self.assertEqual(decode_cursor(cursor, self.ordering),
+                         [self.expected[0].time_create.isoformat(), self.expected[0].pk])
+
+    def test_invalid_cursor(self):
+        for cursor in ('not base64!', encode_cursor(self.expected[0], ('id',)), 'WyJ4IiwgMV0='):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(ValueError):
+                    paginate_by_keyset(DataSet.objects.all(), self.ordering, 3, cursor)
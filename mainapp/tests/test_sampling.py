@@ -0,0 +1,79 @@
+import pickle
+import random
+from collections import Counter
+
+import numpy as np
+from django.test import TestCase, SimpleTestCase
+
+from ..data_generators.batch_generation import generate_job_batch
+from ..data_generators.data_generation import generate_job
+from ..data_generators.sampling import SourceValues, build_alias_tables, choose_values
+from ..models import SourceData
+
+
+class TestAliasTables(SimpleTestCase):
+    def test_tables_give_weights(self):
+        weights = [5, 1, 0, 2, 2]
+        probabilities, aliases = build_alias_tables(weights)
+
+        # Probability of index is probability to keep it, plus probabilities of columns, which give it as alias
+        result = probabilities.copy()
+        for i, alias in enumerate(aliases):
+            result[alias] += 1 - probabilities[i]
+        np.testing.assert_allclose(result / len(weights), np.array(weights) / sum(weights))
+
+
+class TestSourceValues(SimpleTestCase):
+    def setUp(self):
+        self.values = SourceValues(['often', 'rarely', 'never'], [9, 1, 0])
+
+    def assertFrequencies(self, values, expected):
+        counts = Counter(values)
+        self.assertEqual(set(counts), {value for value, frequency in expected.items() if frequency})
+        for value, frequency in expected.items():
+            self.assertAlmostEqual(counts[value] / len(values), frequency, delta=0.02)
+
+    def test_choice_by_weights(self):
+        self.assertFrequencies([self.values.choice() for _ in range(10000)],
+                               {'often': 0.9, 'rarely': 0.1, 'never': 0})
+
+    def test_batch_by_weights(self):
+        self.assertFrequencies(self.values.choose_batch(np.random.default_rng(), 10000),
+                               {'often': 0.9, 'rarely': 0.1, 'never': 0})
+
+    def test_equal_weights_are_uniform(self):
+        values = SourceValues(['a', 'b', 'c'], [2, 2, 2])
+
+        self.assertIsNone(values.weights)
+        self.assertEqual(values, ('a', 'b', 'c'))
+        # The same values, as for plain tuple, so files of unweighted source data do not change
+        self.assertEqual(choose_values(np.random.default_rng(1), 100, values),
+                         choose_values(np.random.default_rng(1), 100, ('a', 'b', 'c')))
+        random.seed(1)
+        chosen = [generate_job(values) for _ in range(100)]
+        random.seed(1)
+        self.assertEqual([generate_job(('a', 'b', 'c')) for _ in range(100)], chosen)
+
+    def test_invalid_weights(self):
+        for weights in ([1, 2], [1, -1, 1], [0, 0, 0]):
+            with self.subTest(weights=weights):
+                with self.assertRaises(ValueError):
+                    SourceValues(['a', 'b', 'c'], weights)
+
+    def test_pickling(self):
+        values = pickle.loads(pickle.dumps(self.values))
+
+        self.assertEqual(values, self.values)
+        self.assertEqual(values.weights, [9, 1, 0])
+        self.assertNotIn('never', generate_job_batch(np.random.default_rng(), 1000, values))
+
+
+class TestWeightedSourceData(TestCase):
+    def test_cached_values_with_weights(self):
+        SourceData.objects.bulk_create([SourceData(source_type='jobs', source_data='farmer', weight=3),
+                                        SourceData(source_type='jobs', source_data='plumber')])
+
+        values = SourceData.get_cached_values('jobs')
+
+        self.assertEqual(values, ('farmer', 'plumber'))
+        self.assertEqual(values.weights, [3, 1])
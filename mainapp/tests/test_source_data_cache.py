@@ -0,0 +1,89 @@
+from django.test import TestCase, SimpleTestCase
+
+from ..data_generators.source_data_cache import SourceDataCache
+from ..models import SourceData, SourceDataVersion
+
+
+class TestSourceDataCache(SimpleTestCase):
+    def setUp(self):
+        self.cache = SourceDataCache()
+        self.loads = 0
+
+    def load_values(self):
+        self.loads += 1
+        return ['a', 'b', 'c']
+
+    def test_values_loaded_once_for_version(self):
+        for _ in range(3):
+            values = self.cache.get_values('letters', version='1', load_values=self.load_values)
+
+        self.assertEqual(values, ('a', 'b', 'c'))
+        self.assertEqual(self.loads, 1)
+
+    def test_values_reloaded_on_version_change(self):
+        self.cache.get_values('letters', version='1', load_values=self.load_values)
+        self.cache.get_values('letters', version='2', load_values=self.load_values)
+
+        self.assertEqual(self.loads, 2)
+
+    def test_clear(self):
+        self.cache.get_values('letters', version='1', load_values=self.load_values)
+        self.cache.clear()
+        self.cache.get_values('letters', version='1', load_values=self.load_values)
+
+        self.assertEqual(self.loads, 2)
+
+
+class TestCachedSourceData(TestCase):
+    def setUp(self):
+        SourceData.objects.bulk_create([SourceData(source_type='jobs', source_data=job)
+                                        for job in ('farmer', 'plumber')])
+
+    def test_cached_values_do_not_query_source_data(self):
+        self.assertEqual(SourceData.get_cached_values('jobs'), ('farmer', 'plumber'))
+
+        # Only version of source data is checked
+        with self.assertNumQueries(1):
+            self.assertEqual(SourceData.get_cached_values('jobs'), ('farmer', 'plumber'))
+
+    def test_bulk_create_changes_version(self):
+        version = SourceDataVersion.get_version('jobs')
+        SourceData.get_cached_values('jobs')
+
+        SourceData.objects.bulk_create([SourceData(source_type='jobs', source_data='driver')])
+
+        self.assertNotEqual(SourceDataVersion.get_version('jobs'), version)
+        self.assertEqual(SourceData.get_cached_values('jobs'), ('farmer', 'plumber', 'driver'))
+
+    def test_save_changes_version(self):
+        SourceData.get_cached_values('jobs')
+
+        SourceData.objects.create(source_type='jobs', source_data='driver')
+
+        self.assertEqual(SourceData.get_cached_values('jobs'), ('farmer', 'plumber', 'driver'))
+
+    def test_delete_changes_version(self):
+        SourceData.get_cached_values('jobs')
+
+        SourceData.objects.get(source_data='farmer').delete()
+        self.assertEqual(SourceData.get_cached_values('jobs'), ('plumber',))
+
+        SourceData.objects.filter(source_type='jobs').delete()
+        self.assertEqual(SourceData.get_cached_values('jobs'), ())
+
+    def test_bulk_delete_changes_version_once(self):
+        SourceData.objects.bulk_create([SourceData(source_type='first_names', source_data=name)
+                                        for name in ('Alice', 'Bob')])
+        SourceData.get_cached_values('jobs')
+
+        # Types of deleted rows, deletion by one query and one bump of version of every type
+        with self.assertNumQueries(4):
+            SourceData.objects.all().delete()
+        self.assertEqual(SourceData.get_cached_values('jobs'), ())
+
+    def test_update_changes_version(self):
+        SourceData.get_cached_values('jobs')
+
+        SourceData.objects.filter(source_data='farmer').update(source_data='driver')
+
+        self.assertEqual(SourceData.get_cached_values('jobs'), ('driver', 'plumber'))
@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from .test_view_base_and_mixins import TestView
+from ..models import DataSet
+from ..status_events import DataSetStatusHub, get_schema_statuses, iter_status_events
+
+
+class TestDataSetStatusHub(SimpleTestCase):
+    def setUp(self):
+        self.queries = 0
+        self.hub = DataSetStatusHub(get_changes=self.get_changes, interval=60)
+
+    def get_changes(self, schema_pk, since):
+        self.queries += 1
+        return {'info': {self.queries: {'file_generated': True}}, 'progress': {}}
+
+    async def test_subscribers_of_schema_share_watcher(self):
+        first_queue = self.hub.subscribe(1)
+        second_queue = self.hub.subscribe(1)
+        self.assertEqual(self.hub.get_subscribers_amount(1), 2)
+        first_statuses = await asyncio.wait_for(first_queue.get(), 1)
+        self.assertEqual(first_statuses, await asyncio.wait_for(second_queue.get(), 1))
+
+        self.hub.notify(1)
+
+        statuses = await asyncio.wait_for(first_queue.get(), 1)
+        self.assertEqual(statuses, await asyncio.wait_for(second_queue.get(), 1))
+        # Queries are done once for all subscribers: the first one, and one after notifying
+        self.assertEqual(self.queries, 2)
+
+        self.hub.unsubscribe(1, first_queue)
+        self.hub.unsubscribe(1, second_queue)
+        self.assertEqual(self.hub.get_subscribers_amount(1), 0)
+
+    async def test_other_schema_is_not_woken(self):
+        queue = self.hub.subscribe(1)
+        await asyncio.wait_for(queue.get(), 1)
+
+        self.hub.notify(2)
+        await asyncio.sleep(0.05)
+
+        self.assertTrue(queue.empty())
+        self.hub.unsubscribe(1, queue)
+
+
+class TestSchemaStatuses(TestView):
+    url_name = 'data-sets-events'
+
+    def test_only_changes_returned(self):
+        finished = DataSet.objects.create(schema=self.schema, finished=True)
+        processing = DataSet.objects.create(schema=self.schema, rows_amount=100)
+        since = timezone.now()
+
+        self.assertEqual(get_schema_statuses(self.schema.pk, since=since), {'info': {}, 'progress': {}})
+
+        processing.save_progress(10, 100, 5.0)
+        self.assertEqual(set(get_schema_statuses(self.schema.pk, since=since)['progress']), {processing.pk})
+
+        DataSet.objects.filter(pk=finished.pk).update(finished=True)
+        statuses = get_schema_statuses(self.schema.pk, ids=[finished.pk], since=since)
+        self.assertEqual(statuses, {'info': {finished.pk: {'file_generated': False}}, 'progress': {}})
+
+    def test_GET_not_under_asgi(self):
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+        response = self.client.get(self.url, data={'schema': self.schema.slug})
+
+        self.assertEqual(response.status_code, 503)
+
+    def test_GET_not_authenticated(self):
+        response = self.client.get(self.url, data={'schema': self.schema.slug})
+
+        self.assertEqual(response.status_code, 404)
+
+    async def test_GET_events(self):
+        data_set = await DataSet.objects.acreate(schema=self.schema, rows_amount=100)
+        await sync_to_async(self.async_client.force_login)(self.user)
+
+        response = await self.async_client.get(self.url, data={'schema': self.schema.slug})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = aiter(response.streaming_content)
+        try:
+            event = (await anext(events)).decode()
+        finally:
+            await events.aclose()
+        self.assertTrue(event.startswith('data: '))
+        self.assertIn(str(data_set.pk), json.loads(event[len('data: '):])['progress'])
+
+
+class TestStatusEvents(TestCase):
+    async def test_stream_ends_after_max_seconds(self):
+        hub = DataSetStatusHub(get_changes=lambda *args, **kwargs: {'info': {}, 'progress': {}}, interval=60)
+
+        events = [event async for event in iter_status_events(0, hub, heartbeat_interval=0.01, max_seconds=0.05)]
+
+        self.assertEqual(events[0], 'data: {"info": {}, "progress": {}}\n\n')
+        self.assertIn(': heartbeat\n\n', events)
+        self.assertEqual(hub.get_subscribers_amount(0), 0)
@@ -0,0 +1,163 @@
+import csv
+import os
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import TestCase, SimpleTestCase
+
+from schemas.settings import DATA_GENERATION_SETTINGS
+from ..data_generators.data_generators import CellDataGenerator
+from ..data_generators.file_generation import generate_csv_file
+from ..data_generators.unique_generation import FeistelPermutation, generate_integer_unique, generate_email_unique, \
+    generate_domain_name_unique, get_integer_unique_capacity
+from ..models import Separator, Schema, Column, DataSet
+
+
+class TestFeistelPermutation(SimpleTestCase):
+    def test_permutation_is_bijection(self):
+        for size in (1, 2, 7, 26, 1000, 4096, 5000):
+            with self.subTest(size=size):
+                values = FeistelPermutation(size, np.random.SeedSequence(size))(np.arange(size, dtype=np.uint64))
+                self.assertEqual(sorted(values.tolist()), list(range(size)))
+
+    def test_permutation_depends_on_seed(self):
+        positions = np.arange(1000, dtype=np.uint64)
+        first = FeistelPermutation(1000, np.random.SeedSequence(1))(positions).tolist()
+
+        self.assertEqual(first, FeistelPermutation(1000, np.random.SeedSequence(1))(positions).tolist())
+        self.assertNotEqual(first, FeistelPermutation(1000, np.random.SeedSequence(2))(positions).tolist())
+        self.assertNotEqual(first, sorted(first))
+
+    def test_permutation_of_part_of_positions(self):
+        permutation = FeistelPermutation(10 ** 12, np.random.SeedSequence(3))
+        whole = permutation(np.arange(10 ** 12 - 1000, 10 ** 12, dtype=np.uint64)).tolist()
+
+        self.assertEqual(whole[500:], permutation(np.arange(10 ** 12 - 500, 10 ** 12, dtype=np.uint64)).tolist())
+        self.assertEqual(len(set(whole)), 1000)
+        self.assertTrue(all(value < 10 ** 12 for value in whole))
+
+    def test_invalid_size(self):
+        for size in (0, 2 ** 63 + 1):
+            with self.assertRaises(ValueError):
+                FeistelPermutation(size, np.random.SeedSequence(0))
+
+
+class TestUniqueValues(SimpleTestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.seed_sequence = np.random.SeedSequence(0)
+
+    def generate_by_batches(self, generate, rows_amount, batch_size, **kwargs):
+        values = []
+        for start in range(0, rows_amount, batch_size):
+            positions = np.arange(start, min(start + batch_size, rows_amount), dtype=np.uint64)
+            values += generate(self.rng, positions, rows_amount, self.seed_sequence, **kwargs)
+        return values
+
+    def test_integers_fill_whole_range(self):
+        values = self.generate_by_batches(generate_integer_unique, 1001, 100, minimal=5, maximal=1005)
+
+        self.assertEqual(sorted(map(int, values)), list(range(5, 1006)))
+        self.assertEqual(get_integer_unique_capacity(5, 1005), 1001)
+        self.assertEqual(get_integer_unique_capacity(5, 4), 0)
+
+    def test_emails_are_distinct(self):
+        settings = DATA_GENERATION_SETTINGS["EML"]
+        values = self.generate_by_batches(generate_email_unique, 20000, 3000)
+
+        self.assertEqual(len(set(values)), 20000)
+        for value in values[:1000]:
+            name, domain = value.split('@')
+            self.assertTrue(settings["MIN_EMAIL_NAME_LENGTH"] <= len(name) <= settings["MAX_EMAIL_NAME_LENGTH"])
+            self.assertIn(domain, settings["EMAIL_DOMAINS"])
+
+    def test_domain_names_are_distinct(self):
+        settings = DATA_GENERATION_SETTINGS["DMN"]
+        values = self.generate_by_batches(generate_domain_name_unique, 20000, 3000)
+
+        self.assertEqual(len(set(values)), 20000)
+        for value in values[:1000]:
+            second_level, top_level = value.split('.')
+            self.assertTrue(
+                settings["MIN_DOMAIN_NAME_LENGTH"] <= len(second_level) <= settings["MAX_DOMAIN_NAME_LENGTH"])
+            self.assertIn(top_level, settings["TOP_LEVEL_DOMAINS"])
+
+
+class TestUniqueCellDataGenerator(SimpleTestCase):
+    def test_not_prepared_generator(self):
+        generator = CellDataGenerator(Column.DataType.INTEGER, True, 1, 100, unique=True)
+
+        with self.assertRaises(RuntimeError):
+            generator.generate_batch(10)
+
+    def test_too_small_range(self):
+        generator = CellDataGenerator(Column.DataType.INTEGER, True, 1, 100, unique=True)
+
+        with self.assertRaisesMessage(ValueError, 'Column id can have only 100 distinct values'):
+            generator.prepare_unique(101, np.random.SeedSequence(0), 'id')
+        generator.prepare_unique(100, np.random.SeedSequence(0), 'id')
+        self.assertEqual(sorted(map(int, generator.generate_batch(100))), list(range(1, 101)))
+
+    def test_type_without_unique_values(self):
+        with self.assertRaises(ValueError):
+            CellDataGenerator(Column.DataType.JOB, False, source_data={'jobs': ['a', 'b']}, unique=True)
+
+
+class TestUniqueColumns(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username='dummy_test_user', password='32145', email='dummy@gmail.com')
+        cls.delimiter = Separator.objects.create(name='comma', char=',')
+        cls.quotechar = Separator.objects.create(name='double-quote', char='"')
+        cls.schema = Schema.objects.create(name='unique_schema', owner=user, delimiter=cls.delimiter,
+                                           quotechar=cls.quotechar)
+        Column.objects.bulk_create([
+            Column(name='id', data_type=Column.DataType.INTEGER, minimal=1, maximal=100000, unique=True,
+                   schema=cls.schema, order=1),
+            Column(name='email', data_type=Column.DataType.EMAIL, unique=True, schema=cls.schema, order=2),
+            Column(name='site', data_type=Column.DataType.DOMAIN_NAME, unique=True, schema=cls.schema, order=3),
+            Column(name='number', data_type=Column.DataType.INTEGER, minimal=1, maximal=10, schema=cls.schema,
+                   order=4),
+        ])
+
+    def read_columns(self, data_set):
+        try:
+            with open(os.path.abspath(data_set.file.path), newline='') as csvfile:
+                rows = list(csv.reader(csvfile, delimiter=self.delimiter.char, quotechar=self.quotechar.char))
+        finally:
+            data_set.file.delete()
+        self.assertEqual(rows[0], ['id', 'email', 'site', 'number'])
+        return list(zip(*rows[1:]))
+
+    def test_values_are_distinct_in_all_shards(self):
+        data_sets = [DataSet.objects.create(schema=self.schema, seed=7) for _ in range(2)]
+
+        generate_csv_file(data_set=data_sets[0], rows_amount=10000, chunk_size=300)
+        generate_csv_file(data_set=data_sets[1], rows_amount=10000, chunk_size=300, workers=3, min_shard_rows=1000)
+
+        columns = self.read_columns(data_sets[0])
+        self.assertEqual(columns, self.read_columns(data_sets[1]))
+        for column in columns[:3]:
+            self.assertEqual(len(set(column)), 10000)
+        # Not unique column has repeated values
+        self.assertLessEqual(len(set(columns[3])), 10)
+
+    def test_too_few_values_for_rows(self):
+        data_set = DataSet.objects.create(schema=self.schema)
+
+        with self.assertRaisesMessage(ValueError, 'Column id can have only 100000 distinct values'):
+            self.schema.check_unique_capacity(100001)
+        with self.assertLogs('mainapp.data_generators.file_generation', 'ERROR'):
+            generate_csv_file(data_set=data_set, rows_amount=100001)
+
+        data_set.refresh_from_db()
+        self.assertFalse(data_set.file)
+        self.assertIn('can have only 100000 distinct values', data_set.error)
+
+    def test_unique_only_for_supported_types(self):
+        column = Column(name='job', data_type=Column.DataType.JOB, unique=True, schema=self.schema)
+
+        with self.assertRaises(ValidationError):
+            column.clean()
+        self.assertEqual(column.get_unique_capacity(), 0)
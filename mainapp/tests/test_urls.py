@@ -2,7 +2,8 @@ from django.test import SimpleTestCase
 from django.urls import reverse, resolve
 
 from ..views import UserLoginView, logout_user, SchemasView, CreateSchemaView, EditSchemaView, SchemaDataSets, \
-    download, delete_schema, generate_data_set, get_finished_data_sets_info, UserRegisterView
+    download, delete_schema, generate_data_set, get_finished_data_sets_info, UserRegisterView, stream_data_set, \
+    generate_data_sets
 
 
 class TestUrls(SimpleTestCase):
@@ -38,6 +39,10 @@ class TestUrls(SimpleTestCase):
         url = reverse('download')
         self.assertEqual(resolve(url).func, download)
 
+    def test_stream_url_resolves(self):
+        url = reverse('stream')
+        self.assertEqual(resolve(url).func, stream_data_set)
+
     def test_delete_schema_url_resolves(self):
         url = reverse('delete-schema')
         self.assertEqual(resolve(url).func, delete_schema)
@@ -49,3 +54,7 @@ class TestUrls(SimpleTestCase):
     def test_get_finished_data_sets_info_url_resolves(self):
         url = reverse('get-finished-data-sets-info')
         self.assertEqual(resolve(url).func, get_finished_data_sets_info)
+
+    def test_data_sets_start_generating_url_resolves(self):
+        url = reverse('data-sets-start-generating')
+        self.assertEqual(resolve(url).func, generate_data_sets)
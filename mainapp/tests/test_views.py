@@ -1,13 +1,24 @@
+import csv
+import gzip
+import io
 import json
+import os
+from unittest import mock
 
+from asgiref.sync import sync_to_async
 from django.contrib import auth
 from django.contrib.auth.models import User
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import FileResponse
+from django.test import SimpleTestCase, RequestFactory, AsyncRequestFactory
 from django.urls import reverse
+from django.utils import timezone
 
 from .test_view_base_and_mixins import TestView, AuthorisedNotOwnerMixin, AuthorisedMixin, NotAuthorisedMixin, \
     JsonPostErrorResponsesMixin
+from .. import file_serving
+from ..data_generators.file_generation import FILE_SETTINGS
 from ..forms import SchemaForm, ColumnFormSet
 from ..models import Schema, Column, DataSet
 
@@ -105,6 +116,27 @@ class TestSchemasView(NotAuthorisedMixin, AuthorisedMixin, TestView):
 
         self.assertQuerysetEqual(response.context.get('schemas'), self.user.schemas.all(), ordered=False)
 
+    def test_GET_first_page_and_next_pages(self):
+        Schema.objects.bulk_create([Schema(name=f'schema_{i}', slug=f'schema-{i}', owner=self.user,
+                                           delimiter=self.delimiter, quotechar=self.quotechar) for i in range(60)])
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.context['schemas']), 50)
+        self.assertIsNotNone(response.context['next_cursor'])
+
+        response = self.client.get(reverse('schemas-page'), data={'cursor': response.context['next_cursor']})
+        content = json.loads(response.content)
+        self.assertEqual(content['rows'].count('<tr'), 11)
+        self.assertIsNone(content['next_cursor'])
+
+    def test_GET_page_not_authenticated_and_invalid_cursor(self):
+        self.assertEqual(self.client.get(reverse('schemas-page')).status_code, 404)
+
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+        self.assertEqual(self.client.get(reverse('schemas-page'), data={'cursor': 'invalid'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, data={'cursor': 'invalid'}).status_code, 404)
+
 
 class TestCreateSchemaView(NotAuthorisedMixin, AuthorisedMixin, TestView):
     url_name = 'create-schema'
@@ -256,6 +288,21 @@ class TestSchemaDataSets(NotAuthorisedMixin, AuthorisedMixin, AuthorisedNotOwner
 
         self.assertEqual(response.context.get('schema'), self.schema)
 
+    def test_GET_newest_first_by_pages(self):
+        data_sets = DataSet.objects.bulk_create([DataSet(schema=self.schema) for _ in range(55)])
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+
+        response = self.client.get(self.url)
+        self.assertEqual([data_set.pk for data_set in response.context['object_list']],
+                         [data_set.pk for data_set in data_sets[::-1][:50]])
+
+        response = self.client.get(reverse('data-sets-page'),
+                                   data={'schema': self.schema.slug, 'cursor': response.context['next_cursor']})
+        content = json.loads(response.content)
+        self.assertEqual(content['rows'].count('<tr'), 5)
+        self.assertIn(f'processing-data-set-badge-id-{data_sets[0].pk}"', content['rows'])
+        self.assertIsNone(content['next_cursor'])
+
 
 class TestDownload(AuthorisedNotOwnerMixin, TestView):
     url_name = 'download'
@@ -287,6 +334,307 @@ class TestDownload(AuthorisedNotOwnerMixin, TestView):
         finally:
             data_set.file.delete()
 
+    def test_GET_compressed_file_downloads_as_is(self):
+        test_gzip_file = SimpleUploadedFile('test.csv.gz', gzip.compress(b'123gjgh'))
+        data_set = DataSet.objects.create(schema=self.schema, file=test_gzip_file,
+                                          compression=DataSet.Compression.GZIP)
+
+        try:
+            self.client.login(username=self.dummy_username, password=self.dummy_password)
+            response = self.client.get(self.url, data={'data_set': data_set.pk}, HTTP_ACCEPT_ENCODING='gzip;q=0')
+
+            self.assertEqual(response.get('Content-Disposition'), f"attachment; filename=\"test.csv.gz\"")
+            self.assertEqual(response.get('Content-Type'), 'application/gzip')
+            self.assertFalse(response.has_header('Content-Encoding'))
+            self.assertIn('Accept-Encoding', response.get('Vary'))
+        finally:
+            data_set.file.delete()
+
+    def test_GET_compressed_file_downloads_with_content_encoding(self):
+        test_gzip_file = SimpleUploadedFile('test.csv.gz', gzip.compress(b'123gjgh'))
+        data_set = DataSet.objects.create(schema=self.schema, file=test_gzip_file,
+                                          compression=DataSet.Compression.GZIP)
+
+        try:
+            self.client.login(username=self.dummy_username, password=self.dummy_password)
+            response = self.client.get(self.url, data={'data_set': data_set.pk},
+                                       HTTP_ACCEPT_ENCODING='deflate, gzip;q=1.0, br')
+
+            self.assertEqual(response.get('Content-Disposition'), f"attachment; filename=\"test.csv\"")
+            self.assertEqual(response.get('Content-Type'), 'text/csv')
+            self.assertEqual(response.get('Content-Encoding'), 'gzip')
+            self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b'123gjgh')
+        finally:
+            data_set.file.delete()
+
+
+    def get_file(self, **headers):
+        return self.client.get(self.url, data={'data_set': self.data_set.pk}, headers=headers)
+
+    def create_downloadable_data_set(self):
+        self.data_set = DataSet.objects.create(schema=self.schema, file=SimpleUploadedFile('test.csv', b'0123456789'))
+        self.addCleanup(self.data_set.file.delete)
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+
+    def test_GET_file_headers(self):
+        self.create_downloadable_data_set()
+
+        response = self.get_file()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertTrue(response.has_header('Last-Modified'))
+        self.assertRegex(response['ETag'], r'^"[0-9a-f]+-a"$')
+
+    def test_GET_not_modified(self):
+        self.create_downloadable_data_set()
+        etag = self.get_file()['ETag']
+
+        self.assertEqual(self.get_file(if_none_match=etag).status_code, 304)
+        self.assertEqual(self.get_file(if_none_match='"other"').status_code, 200)
+
+    def test_GET_range(self):
+        self.create_downloadable_data_set()
+
+        for header, content, content_range in (('bytes=2-5', b'2345', 'bytes 2-5/10'),
+                                               ('bytes=7-', b'789', 'bytes 7-9/10'),
+                                               ('bytes=-3', b'789', 'bytes 7-9/10'),
+                                               ('bytes=8-100', b'89', 'bytes 8-9/10')):
+            with self.subTest(header=header):
+                response = self.get_file(range=header)
+
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(b''.join(response.streaming_content), content)
+                self.assertEqual(response['Content-Length'], str(len(content)))
+                self.assertEqual(response['Content-Range'], content_range)
+
+    def test_GET_range_not_satisfiable(self):
+        self.create_downloadable_data_set()
+
+        for header in ('bytes=10-', 'bytes=-0'):
+            with self.subTest(header=header):
+                response = self.get_file(range=header)
+
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    def test_GET_if_range(self):
+        self.create_downloadable_data_set()
+        response = self.get_file()
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        self.assertEqual(self.get_file(range='bytes=2-5', if_range=etag).status_code, 206)
+        self.assertEqual(self.get_file(range='bytes=2-5', if_range=last_modified).status_code, 206)
+        # File changed since part of it was downloaded, so it is sent from the start
+        response = self.get_file(range='bytes=2-5', if_range='"changed"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+        self.assertEqual(self.get_file(range='bytes=2-5', if_range=f'W/{etag}').status_code, 200)
+        self.assertEqual(self.get_file(range='bytes=2-5', if_range='Sat, 01 Jan 2000 00:00:00 GMT').status_code, 200)
+
+    def test_HEAD(self):
+        self.create_downloadable_data_set()
+
+        response = self.client.head(self.url, data={'data_set': self.data_set.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="test.csv"')
+        self.assertEqual(response.content, b'')
+
+        response = self.client.head(self.url, data={'data_set': self.data_set.pk}, headers={'range': 'bytes=5-'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Length'], '5')
+        self.assertEqual(response['Content-Range'], 'bytes 5-9/10')
+
+    def test_GET_range_of_compressed_file(self):
+        content = gzip.compress(b'0123456789' * 100)
+        data_set = DataSet.objects.create(schema=self.schema, file=SimpleUploadedFile('test.csv.gz', content),
+                                          compression=DataSet.Compression.GZIP)
+        self.addCleanup(data_set.file.delete)
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+
+        parts = []
+        for accept_encoding in ('gzip', 'identity'):
+            response = self.client.get(self.url, data={'data_set': data_set.pk},
+                                       headers={'accept-encoding': accept_encoding, 'range': 'bytes=10-'})
+            self.assertEqual(response.status_code, 206)
+            parts.append((response['ETag'], b''.join(response.streaming_content)))
+
+        self.assertEqual(parts[0][1], content[10:])
+        self.assertEqual(parts[1][1], content[10:])
+        # Representations with and without content encoding have different ETags
+        self.assertNotEqual(parts[0][0], parts[1][0])
+
+    def test_GET_several_ranges_give_whole_file(self):
+        self.create_downloadable_data_set()
+
+        response = self.get_file(range='bytes=0-1,4-5')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+
+    def test_GET_offloaded_to_web_server(self):
+        self.create_downloadable_data_set()
+
+        with mock.patch.dict(file_serving.DOWNLOAD_SETTINGS, OFFLOAD='x-accel-redirect',
+                             OFFLOAD_URL='/protected-media/'):
+            response = self.get_file()
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.data_set.file.name}')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="test.csv"')
+        self.assertEqual(response.content, b'')
+
+        with mock.patch.dict(file_serving.DOWNLOAD_SETTINGS, OFFLOAD='x-sendfile'):
+            response = self.get_file()
+        self.assertEqual(response['X-Sendfile'], self.data_set.file.path)
+
+    def test_GET_offloaded_path_is_percent_encoded(self):
+        self.create_downloadable_data_set()
+        old_path = self.data_set.file.path
+        self.data_set.file.name = os.path.join(os.path.dirname(self.data_set.file.name), 'схема 1%.csv')
+        os.rename(old_path, self.data_set.file.path)
+        self.data_set.save()
+        encoded_basename = '%D1%81%D1%85%D0%B5%D0%BC%D0%B0%201%25.csv'
+
+        with mock.patch.dict(file_serving.DOWNLOAD_SETTINGS, OFFLOAD='x-accel-redirect',
+                             OFFLOAD_URL='/protected-media/'):
+            response = self.get_file()
+        self.assertEqual(response['X-Accel-Redirect'],
+                         '/protected-media/' + os.path.join(os.path.dirname(self.data_set.file.name), encoded_basename))
+
+        with mock.patch.dict(file_serving.DOWNLOAD_SETTINGS, OFFLOAD='x-sendfile'):
+            response = self.get_file()
+        self.assertEqual(response['X-Sendfile'], os.path.join(os.path.dirname(self.data_set.file.path), encoded_basename))
+
+
+class TestAdaptStreamingResponse(SimpleTestCase):
+    async def test_streamed_by_parts_under_asgi(self):
+        response = FileResponse(io.BytesIO(b'0123456789' * 100))
+
+        response = file_serving.adapt_streaming_response(AsyncRequestFactory().get('/'), response)
+
+        self.assertTrue(response.is_async)
+        self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), b'0123456789' * 100)
+
+    async def test_iter_async_reads_parts(self):
+        parts = [part async for part in file_serving.iter_async([b'ab', b'', b'cd', b'e'], part_bytes=3)]
+
+        self.assertEqual(parts, [b'abcd', b'e'])
+
+    def test_not_changed_under_wsgi(self):
+        response = FileResponse(io.BytesIO(b'0123456789'))
+
+        response = file_serving.adapt_streaming_response(RequestFactory().get('/'), response)
+
+        self.assertFalse(response.is_async)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+
+
+class TestStreamDataSet(TestView):
+    url_name = 'stream'
+
+    dummy_2_username = 'second_user'
+    dummy_2_password = '54321'
+    dummy_2_email = 'seconduser@gmail.com'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.second_user = User.objects.create_user(
+            username=cls.dummy_2_username,
+            password=cls.dummy_2_password,
+            email=cls.dummy_2_email,
+        )
+
+    def read_rows(self, content):
+        return list(csv.reader(io.StringIO(content.decode(), newline=''),
+                               delimiter=self.delimiter.char, quotechar=self.quotechar.char))
+
+    def test_POST_method_not_allowed(self):
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+        response = self.client.post(self.url, {'schema': self.schema.slug, 'rows': 10})
+
+        self.assertEqual(response.status_code, 405)
+
+    def test_GET_not_authenticated(self):
+        response = self.client.get(self.url, data={'schema': self.schema.slug, 'rows': 10})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_GET_authenticated_not_owner(self):
+        self.client.login(username=self.dummy_2_username, password=self.dummy_2_password)
+        response = self.client.get(self.url, data={'schema': self.schema.slug, 'rows': 10})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_GET_rows_not_valid(self):
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+
+        self.assertEqual(self.client.get(self.url, data={'schema': self.schema.slug}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, data={'schema': self.schema.slug, 'rows': 0}).status_code, 400)
+
+    def test_GET_rows_more_than_maximum(self):
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+
+        with mock.patch.dict(FILE_SETTINGS, MAX_STREAM_ROWS=100):
+            self.assertEqual(self.client.get(self.url, data={'schema': self.schema.slug, 'rows': 100}).status_code,
+                             200)
+            response = self.client.get(self.url, data={'schema': self.schema.slug, 'rows': 101})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content)['error'], 'Rows amount must be not more than 100')
+
+    async def test_GET_streamed_by_async_iterator_under_asgi(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+
+        response = await self.async_client.get(self.url, data={'schema': self.schema.slug, 'rows': 1000})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(self.read_rows(content)), 1001)
+
+    def test_GET_name_with_special_characters(self):
+        Schema.objects.filter(pk=self.schema.pk).update(name='"Дані"')
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+
+        response = self.client.get(self.url, data={'schema': self.schema.slug, 'rows': 10})
+
+        self.assertEqual(response.get('Content-Disposition'),
+                         "attachment; filename*=utf-8''%22%D0%94%D0%B0%D0%BD%D1%96%22_data_set.csv")
+
+    def test_GET_streams_csv(self):
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+        response = self.client.get(self.url, data={'schema': self.schema.slug, 'rows': 5000})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response.get('Content-Disposition'), f'attachment; filename="{self.schema.name}_data_set.csv"')
+
+        rows = self.read_rows(b''.join(response.streaming_content))
+        self.assertEqual(rows[0], self.schema.column_headers)
+        self.assertEqual(len(rows), 5001)
+
+    def test_GET_streams_gzip(self):
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+        response = self.client.get(self.url, data={'schema': self.schema.slug, 'rows': 100, 'gzip': 1})
+
+        self.assertEqual(response.get('Content-Type'), 'application/gzip')
+        self.assertTrue(response.get('Content-Disposition').endswith('.csv.gz"'))
+
+        rows = self.read_rows(gzip.decompress(b''.join(response.streaming_content)))
+        self.assertEqual(len(rows), 101)
+
+    def test_GET_unique_column(self):
+        Column.objects.filter(pk=self.column_1.pk).update(unique=True)
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+
+        response = self.client.get(self.url, data={'schema': self.schema.slug, 'rows': 10})
+        rows = self.read_rows(b''.join(response.streaming_content))
+        self.assertEqual(sorted(int(row[0]) for row in rows[1:]), list(range(1, 11)))
+
+        response = self.client.get(self.url, data={'schema': self.schema.slug, 'rows': 11})
+        self.assertEqual(response.status_code, 400)
+
 
 class TestDeleteSchema(JsonPostErrorResponsesMixin, TestView):
     url_name = 'delete-schema'
@@ -318,7 +666,7 @@ class TestStartGenerating(JsonPostErrorResponsesMixin, TestView):
 
         self.assertEqual(response.status_code, 400)
 
-    def test_POST_file_generated_successfully(self):
+    def test_POST_data_set_queued(self):
         self.client.login(username=self.dummy_username, password=self.dummy_password)
         response = self.client.post(self.url, {'schema': self.schema.slug, 'rows': 5})
 
@@ -329,14 +677,109 @@ class TestStartGenerating(JsonPostErrorResponsesMixin, TestView):
         except:
             self.fail("DataSet object was not created")
 
-        self.assertTrue(data_set.file)
+        self.assertFalse(data_set.finished)
+        self.assertIsNone(data_set.time_started)
+        self.assertEqual(data_set.rows_amount, 5)
+        self.assertIsNone(data_set.seed)
+        self.assertFalse(data_set.file)
 
-        try:
-            file_generated_message = json.loads(response.content).get('file_generated')
-        except:
-            self.fail("Something wrong with response")
+    def test_POST_data_set_with_seed_queued(self):
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+        response = self.client.post(self.url, {'schema': self.schema.slug, 'rows': 5, 'seed': 42})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(DataSet.objects.get(pk=json.loads(response.content).get('data_set_id')).seed, 42)
+
+    def test_POST_seed_not_valid(self):
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+
+        for seed in ('abc', -1, 2 ** 63):
+            response = self.client.post(self.url, {'schema': self.schema.slug, 'rows': 5, 'seed': seed})
+            self.assertEqual(response.status_code, 400)
+
+    def test_POST_data_set_with_compression_queued(self):
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+        response = self.client.post(self.url, {'schema': self.schema.slug, 'rows': 5, 'compression': 'bz2'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(DataSet.objects.get(pk=json.loads(response.content).get('data_set_id')).compression,
+                         DataSet.Compression.BZIP2)
 
-        self.assertTrue(file_generated_message)
+    def test_POST_data_set_with_file_format_queued(self):
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+        response = self.client.post(self.url, {'schema': self.schema.slug, 'rows': 5, 'file_format': 'parquet'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(DataSet.objects.get(pk=json.loads(response.content).get('data_set_id')).file_format,
+                         DataSet.FileFormat.PARQUET)
+
+    def test_POST_file_format_not_valid(self):
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+
+        for data in ({'file_format': 'xlsx'}, {'file_format': 'arrow', 'compression': 'gz'}):
+            response = self.client.post(self.url, {'schema': self.schema.slug, 'rows': 5, **data})
+            self.assertEqual(response.status_code, 400)
+
+    def test_POST_compression_not_valid(self):
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+        response = self.client.post(self.url, {'schema': self.schema.slug, 'rows': 5, 'compression': 'rar'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_POST_too_many_rows_for_unique_column(self):
+        Column.objects.filter(pk=self.column_1.pk).update(unique=True)
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+
+        self.assertEqual(self.client.post(self.url, {'schema': self.schema.slug, 'rows': 10}).status_code, 200)
+        response = self.client.post(self.url, {'schema': self.schema.slug, 'rows': 11})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('distinct values', json.loads(response.content)['error'])
+
+
+class TestStartGeneratingMany(TestView):
+    url_name = 'data-sets-start-generating'
+
+    def post_jobs(self, jobs):
+        return self.client.post(self.url, data=json.dumps({'jobs': jobs}), content_type='application/json')
+
+    def test_GET_method_not_allowed(self):
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+    def test_POST_not_authenticated(self):
+        self.assertEqual(self.post_jobs([{'schema': self.schema.slug, 'rows': 10}]).status_code, 404)
+
+    def test_POST_jobs_queued(self):
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+        jobs = [{'schema': self.schema.slug, 'rows': 10}, {'schema': self.schema.slug, 'rows': 20, 'seed': 5,
+                                                            'file_format': 'parquet'}]
+
+        response = self.post_jobs(jobs)
+
+        self.assertEqual(response.status_code, 200)
+        data_sets = [DataSet.objects.get(pk=pk) for pk in json.loads(response.content)['data_set_ids']]
+        self.assertEqual([(data_set.rows_amount, data_set.seed, data_set.file_format) for data_set in data_sets],
+                         [(10, None, 'csv'), (20, 5, 'parquet')])
+        self.assertFalse(any(data_set.finished for data_set in data_sets))
+
+    def test_POST_invalid_jobs(self):
+        other_user = User.objects.create_user(username='other', password='54321', email='other@gmail.com')
+        other_schema = Schema.objects.create(name='other_schema', owner=other_user, delimiter=self.delimiter,
+                                             quotechar=self.quotechar)
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+
+        self.assertEqual(self.client.post(self.url, data='jobs', content_type='application/json').status_code, 400)
+        self.assertEqual(self.post_jobs([]).status_code, 400)
+        self.assertEqual(self.post_jobs([{'schema': self.schema.slug, 'rows': 10}] * 101).status_code, 400)
+
+        response = self.post_jobs([{'schema': self.schema.slug, 'rows': 10}, {'schema': self.schema.slug, 'rows': 0}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content)['job'], 1)
+
+        response = self.post_jobs([{'schema': other_schema.slug, 'rows': 10}])
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(DataSet.objects.exists())
 
 
 class TestGetGeneratingStatuses(TestView):
@@ -393,3 +836,47 @@ class TestGetGeneratingStatuses(TestView):
 
         finally:
             d1.file.delete()
+
+    def test_GET_progress_of_not_finished(self):
+        DataSet.objects.create(schema=self.schema, finished=False)
+        data_set = DataSet.objects.create(schema=self.schema, finished=False, rows_amount=1000, rows_written=250,
+                                          bytes_written=5000, rows_per_second=50, time_progress=timezone.now())
+
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+        response = self.client.get(self.url, data={'schema': self.schema.slug})
+
+        progress = json.loads(response.content)['progress']
+        self.assertEqual(len(progress), 2)
+        self.assertEqual(progress[str(data_set.pk)]['percent'], 25)
+        self.assertAlmostEqual(progress[str(data_set.pk)]['eta'], 15, delta=1)
+        self.assertEqual(progress[str(data_set.pk)]['bytes_written'], 5000)
+        self.assertNotIn(str(data_set.pk), json.loads(response.content)['info'])
+
+    def test_GET_only_tracked_and_changed(self):
+        tracked = DataSet.objects.create(schema=self.schema, rows_amount=1000)
+        DataSet.objects.create(schema=self.schema, rows_amount=1000)
+        DataSet.objects.bulk_create([DataSet(schema=self.schema, finished=True) for _ in range(5)])
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+
+        response = self.client.get(self.url, data={'schema': self.schema.slug, 'ids': f'{tracked.pk}'})
+        content = json.loads(response.content)
+        self.assertEqual(list(content['progress']), [str(tracked.pk)])
+        self.assertEqual(content['info'], {})
+
+        response = self.client.get(self.url, data={'schema': self.schema.slug, 'ids': f'{tracked.pk}',
+                                                   'since': content['cursor']})
+        content = json.loads(response.content)
+        self.assertEqual(content['progress'], {})
+
+        DataSet.objects.filter(pk=tracked.pk).update(finished=True)
+        response = self.client.get(self.url, data={'schema': self.schema.slug, 'ids': f'{tracked.pk}',
+                                                   'since': content['cursor']})
+        self.assertEqual(json.loads(response.content)['info'], {str(tracked.pk): {'file_generated': False}})
+
+    def test_GET_invalid_ids_and_cursor(self):
+        self.client.login(username=self.dummy_username, password=self.dummy_password)
+
+        for data in ({'ids': '1,a'}, {'since': 'yesterday'}, {'since': '2023-13-45T00:00:00'}):
+            with self.subTest(**data):
+                response = self.client.get(self.url, data={'schema': self.schema.slug, **data})
+                self.assertEqual(response.status_code, 400)
@@ -1,7 +1,8 @@
 from django.urls import path
 
 from mainapp.views import UserLoginView, logout_user, SchemasView, CreateSchemaView, EditSchemaView, SchemaDataSets, \
-    download, delete_schema, generate_data_set, get_finished_data_sets_info, UserRegisterView
+    download, delete_schema, generate_data_set, get_finished_data_sets_info, UserRegisterView, stream_data_set, \
+    data_sets_events, get_schemas_page, get_data_sets_page, generate_data_sets
 
 urlpatterns = [
     path('register/', UserRegisterView.as_view(), name='register'),
@@ -12,7 +13,12 @@ urlpatterns = [
     path('edit/<slug:schema_slug>/', EditSchemaView.as_view(), name='edit-schema'),
     path('data-sets/<slug:schema_slug>/', SchemaDataSets.as_view(), name='schema-data-sets'),
     path('download/', download, name='download'),
+    path('stream/', stream_data_set, name='stream'),
     path('delete-schema/', delete_schema, name='delete-schema'),
     path('start-generating/', generate_data_set, name='data-set-start-generating'),
+    path('start-generating-many/', generate_data_sets, name='data-sets-start-generating'),
     path('get-finished-data-sets-info/', get_finished_data_sets_info, name='get-finished-data-sets-info'),
+    path('schemas-page/', get_schemas_page, name='schemas-page'),
+    path('data-sets-page/', get_data_sets_page, name='data-sets-page'),
+    path('data-sets-events/', data_sets_events, name='data-sets-events'),
 ]
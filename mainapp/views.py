@@ -1,18 +1,38 @@
+import json
+import os
+
 from django.contrib.auth import logout, login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import LoginView
-from django.db.models import ExpressionWrapper, Q, BooleanField
-from django.http import HttpResponseRedirect, Http404, FileResponse, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponseRedirect, Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, get_object_or_404
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy
-from django.views.decorators.http import require_GET
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.dateparse import parse_datetime
+from django.utils.http import content_disposition_header
+from django.views.decorators.http import require_GET, require_POST, require_safe
 from django.views.generic import ListView, CreateView, UpdateView
 from django.views.generic.detail import SingleObjectMixin
 
-from .base_views import base_view_for_ajax
+from .base_views import base_view_for_ajax, KeysetPaginationMixin
+from .data_generators.columnar_generation import get_available_columnar_formats
+from .data_generators.compression import HTTP_CONTENT_ENCODINGS, get_available_compressions
+from .data_generators.file_generation import iter_sized_csv_chunks, gzip_chunks, FILE_SETTINGS
+from .file_serving import serve_file, adapt_streaming_response
 from .forms import RegisterUserForm, LoginUserForm, SchemaForm, ColumnFormSet
+from .generation_queue import enqueue_data_set, enqueue_data_sets, clean_generation_options, QUEUE_SETTINGS
 from .models import Schema, DataSet, Column
+from .pagination import paginate_by_keyset
+from .status_events import get_schema_statuses, iter_status_events
+
+
+SCHEMAS_ORDERING = ('id',)
+# The newest data sets first, date of creation is not unique, so id is the last
+DATA_SETS_ORDERING = ('-time_create', '-id')
 
 
 class UserRegisterView(CreateView):
@@ -48,11 +68,12 @@ def logout_user(request):
     return redirect('login')
 
 
-class SchemasView(LoginRequiredMixin, ListView):
-    """View for page with user's schemas."""
+class SchemasView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
+    """View for page with the first page of user's schemas, next pages are loaded by get_schemas_page."""
     model = Schema
     template_name = 'mainapp/schemas.html'
     context_object_name = 'schemas'
+    keyset_ordering = SCHEMAS_ORDERING
 
     def get_queryset(self):
         return self.model.objects.filter(owner=self.request.user)
@@ -62,7 +83,6 @@ class SchemasView(LoginRequiredMixin, ListView):
         context.update({
             'title': 'Data Schemas',
             'current_section': 'schemas',
-            'schema_slugs': [schema.slug for schema in context[self.context_object_name]],
         })
         return context
 
@@ -149,13 +169,15 @@ class EditSchemaView(LoginRequiredMixin, UpdateView):
         return context
 
 
-class SchemaDataSets(LoginRequiredMixin, SingleObjectMixin, ListView):
+class SchemaDataSets(LoginRequiredMixin, KeysetPaginationMixin, SingleObjectMixin, ListView):
     """
-    View for page with list of previously generated data sets of specific schema.
+    View for page with list of previously generated data sets of specific schema, the newest first.
+    Only the first page of list is rendered, next pages are loaded by get_data_sets_page.
     Also on this page user can generate new data sets of this schema, download generated schemas or delete them.
     """
     template_name = 'mainapp/schema_data_sets.html'
     slug_url_kwarg = 'schema_slug'
+    keyset_ordering = DATA_SETS_ORDERING
 
     def get(self, request, *args, **kwargs):
         self.object = get_object_or_404(
@@ -174,14 +196,50 @@ class SchemaDataSets(LoginRequiredMixin, SingleObjectMixin, ListView):
         context.update({
             'title': 'Data sets',
             'schema': self.object,
+            'compressions': [(compression, label) for compression, label in DataSet.Compression.choices
+                             if not compression or compression in get_available_compressions()],
+            'file_formats': [(file_format, label) for file_format, label in DataSet.FileFormat.choices
+                             if file_format in [DataSet.FileFormat.CSV, *get_available_columnar_formats()]],
         })
         return context
 
 
+def _get_page_response(request, queryset, ordering: tuple[str, ...], template_name: str, context_object_name: str):
+    try:
+        object_list, next_cursor = paginate_by_keyset(queryset, ordering, KeysetPaginationMixin.page_size,
+                                                      request.GET.get('cursor'))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid cursor'}, status=400)
+
+    rows = render_to_string(template_name, {context_object_name: object_list}, request)
+    return JsonResponse({'rows': rows, 'next_cursor': next_cursor})
+
+
 @require_GET
+def get_schemas_page(request):
+    """View for loading next page of user's schemas by ajax, as rendered rows of table and cursor of next page."""
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Not Founded'}, status=404)
+
+    return _get_page_response(request, Schema.objects.filter(owner=request.user), SCHEMAS_ORDERING,
+                              'mainapp/schema_rows.html', 'schemas')
+
+
+@base_view_for_ajax(allowed_method='GET')
+def get_data_sets_page(request, schema):
+    """View for loading next page of data sets of schema by ajax, as rendered rows of table and cursor of next page."""
+    return _get_page_response(request, schema.data_sets.all(), DATA_SETS_ORDERING, 'mainapp/data_set_rows.html',
+                              'object_list')
+
+
+@require_safe
 @login_required
 def download(request):
-    """View for processing downloads generated data sets."""
+    """
+    View for processing downloads generated data sets.
+    File is sent by web server, if offload is set in settings, else by Django, supporting resuming of downloads
+    and HEAD requests, so download managers can fetch parts of file in parallel.
+    """
     data_set = get_object_or_404(DataSet.objects.select_related('schema__owner'), pk=request.GET.get('data_set'))
     if data_set.schema.owner != request.user:
         raise Http404
@@ -189,7 +247,77 @@ def download(request):
     if not data_set.file:
         raise Http404
 
-    return FileResponse(data_set.file.open(), as_attachment=True, filename=data_set.file.name)
+    # Compressed file is sent as csv, if browser can decompress it by itself
+    content_encoding = HTTP_CONTENT_ENCODINGS.get(data_set.compression)
+    filename = os.path.basename(data_set.file.name)
+    if content_encoding and _accepts_encoding(request, content_encoding):
+        response = serve_file(request, data_set.file.path, filename.removesuffix(f'.{data_set.compression}'),
+                              content_type='text/csv', content_encoding=content_encoding)
+    else:
+        response = serve_file(request, data_set.file.path, filename)
+
+    if content_encoding:
+        patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+def _accepts_encoding(request, encoding: str) -> bool:
+    """Checks, if encoding is listed in header Accept-Encoding of request, and is not refused by zero quality."""
+    for accepted in request.headers.get('Accept-Encoding', '').split(','):
+        name, *params = [part.strip() for part in accepted.split(';')]
+        if name.lower() != encoding:
+            continue
+
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+@base_view_for_ajax(allowed_method='GET')
+def stream_data_set(request, schema):
+    """
+    View for downloading csv file of schema, which is generated on the fly and is not stored.
+    File is compressed with gzip, if parameter gzip is set.
+    """
+    try:
+        rows_amount = int(request.GET.get('rows'))
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'Rows amount is not set'}, status=400)
+
+    if rows_amount < 1:
+        return JsonResponse({'error': 'Rows amount must be positive'}, status=400)
+
+    if rows_amount > FILE_SETTINGS["MAX_STREAM_ROWS"]:
+        return JsonResponse({'error': f'Rows amount must be not more than {FILE_SETTINGS["MAX_STREAM_ROWS"]}'},
+                            status=400)
+
+    try:
+        schema.check_unique_capacity(rows_amount)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    chunks = iter_sized_csv_chunks(
+        schema.get_data_generator(),
+        rows_amount=rows_amount,
+        delimiter=schema.delimiter.char,
+        quotechar=schema.quotechar.char,
+    )
+    filename = f'{schema.name}_data_set.csv'
+
+    if request.GET.get('gzip'):
+        response = StreamingHttpResponse(gzip_chunks(chunks), content_type='application/gzip')
+        filename += '.gz'
+    else:
+        response = StreamingHttpResponse(chunks, content_type='text/csv')
+
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    return adapt_streaming_response(request, response)
 
 
 @base_view_for_ajax(allowed_method='POST')
@@ -202,18 +330,61 @@ def delete_schema(request, schema):
 
 @base_view_for_ajax(allowed_method='POST')
 def generate_data_set(request, schema):
-    """View for generating new data set on ajax request."""
+    """
+    View for generating new data set on ajax request.
+    Data set is only queued here, its file is generated by workers (see command 'generation_worker').
+    """
     try:
-        rows_amount = int(request.POST.get('rows'))
-    except (TypeError, ValueError):
-        return JsonResponse({'file_generated': False}, status=400)
+        options = clean_generation_options(request.POST.get('rows'), request.POST.get('seed'),
+                                           request.POST.get('compression'), request.POST.get('file_format'))
+        schema.check_unique_capacity(options['rows_amount'])
+    except ValueError as e:
+        return JsonResponse({'file_generated': False, 'error': str(e)}, status=400)
 
-    if rows_amount < 1:
-        return JsonResponse({'file_generated': False}, status=400)
+    data_set = enqueue_data_set(schema, **options)
+    return JsonResponse({'file_generated': False, 'data_set_id': data_set.pk})
+
+
+@require_POST
+def generate_data_sets(request):
+    """
+    View for queueing of many data sets at once, maybe of different schemas of user.
+    Body is json {"jobs": [{"schema": slug, "rows": amount, "seed": seed, "file_format": format,
+    "compression": compression}, ...]}, seed, format and compression are optional.
+    Returns ids of queued data sets in order of jobs, files are generated by workers.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Not Founded'}, status=404)
 
-    data_set = DataSet.objects.create(schema=schema)
-    data_set.generate_file(rows_amount)
-    return JsonResponse({'file_generated': bool(data_set.file), 'data_set_id': data_set.pk})
+    try:
+        jobs = json.loads(request.body)['jobs']
+        if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+            raise ValueError
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': 'Body must be json with list of jobs'}, status=400)
+
+    if not 0 < len(jobs) <= QUEUE_SETTINGS["MAX_BULK_JOBS"]:
+        return JsonResponse({'error': f'Amount of jobs must be from 1 to {QUEUE_SETTINGS["MAX_BULK_JOBS"]}'},
+                            status=400)
+
+    schemas = Schema.objects.filter(owner=request.user, slug__in={job.get('schema') for job in jobs}).\
+        in_bulk(field_name='slug')
+
+    cleaned_jobs = []
+    for i, job in enumerate(jobs):
+        schema = schemas.get(job.get('schema'))
+        if schema is None:
+            return JsonResponse({'error': 'Not Founded', 'job': i}, status=404)
+        try:
+            options = clean_generation_options(job.get('rows'), job.get('seed'), job.get('compression'),
+                                               job.get('file_format'))
+            schema.check_unique_capacity(options['rows_amount'])
+        except ValueError as e:
+            return JsonResponse({'error': str(e), 'job': i}, status=400)
+        cleaned_jobs.append((schema, options))
+
+    data_sets = enqueue_data_sets(cleaned_jobs)
+    return JsonResponse({'data_set_ids': [data_set.pk for data_set in data_sets]})
 
 
 @base_view_for_ajax(allowed_method='GET')
@@ -221,12 +392,44 @@ def get_finished_data_sets_info(request, schema):
     """
     View for monitoring current statuses of generating data sets.
     Needs if user disconnected from server and then connects again before generation of file ended.
+    For data sets, which are not finished, progress is returned: percent complete and ETA in seconds (or null).
+    Statuses can be limited to data sets with ids (comma separated), which client tracks,
+    and to data sets, updated since cursor, returned by the previous request.
     """
-    data_sets = DataSet.objects.filter(schema=schema).\
-        annotate(file_generated=ExpressionWrapper(~Q(file=''), output_field=BooleanField())).\
-        values('id', 'finished', 'file_generated')
+    ids = None
+    if request.GET.get('ids'):
+        try:
+            ids = [int(pk) for pk in request.GET['ids'].split(',')]
+        except ValueError:
+            return JsonResponse({'error': 'Invalid ids'}, status=400)
+
+    since = None
+    if request.GET.get('since'):
+        try:
+            since = parse_datetime(request.GET['since'])
+        except ValueError:
+            pass
+        if since is None:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+
+    # Cursor is taken before query, so updates during it are returned next time too
+    cursor = timezone.now()
+    statuses = get_schema_statuses(schema.pk, ids, since)
+    statuses['cursor'] = cursor.isoformat()
+    return JsonResponse(statuses)
 
-    info = {data_set['id']: {'file_generated': data_set['file_generated']}
-            for data_set in data_sets if data_set['finished']}
 
-    return JsonResponse({'info': info})
+@base_view_for_ajax(allowed_method='GET')
+def data_sets_events(request, schema):
+    """
+    View for server-sent events of statuses of data sets of schema, pushed only when data sets progress or finish.
+    Events are streamed only under ASGI, else 503 is returned, and page falls back to polling.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'error': 'Events are available only under ASGI'}, status=503)
+
+    response = StreamingHttpResponse(iter_status_events(schema.pk), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Disabling buffering of nginx, so events are not delayed
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -160,6 +160,8 @@ DATA_GENERATION_SETTINGS = {
         "MAX_WORD_LENGTH": 10,
         "MIN_SENTENCE_LENGTH": 3,
         "MAX_SENTENCE_LENGTH": 10,
+        # Upper bound of limits of Text column (amount of sentences), so one cell can not take too much memory
+        "MAX_SENTENCES_AMOUNT": 1000,
     },
     "ADR": {
         "MIN_COUNTRY_NAME_LENGTH": 3,
@@ -179,6 +181,65 @@ DATA_GENERATION_SETTINGS = {
         "START_DATE": datetime.date(1000, 1, 1),
         "END_DATE": datetime.date(2100, 12, 31),
     },
+    "FILE": {
+        "CHUNK_SIZE": 50000,
+        # Maximal estimated size of csv text of chunk, rows of large cells are generated by smaller chunks,
+        # size of rows is estimated by CHUNK_PROBE_ROWS rows (0 - chunks have CHUNK_SIZE rows)
+        "CHUNK_BYTES": 8 * 1024 ** 2,
+        "CHUNK_PROBE_ROWS": 100,
+        "SHARD_WORKERS": 1,
+        "MIN_SHARD_ROWS": 1000000,
+        "STREAM_CHUNK_BYTES": 256 * 1024,
+        "STREAM_GZIP_LEVEL": 6,
+        # Maximal rows amount of file, generated on the fly, larger files must be generated by workers
+        "MAX_STREAM_ROWS": 1000000,
+        # Minimal seconds between writes of progress of generating file to db
+        "PROGRESS_INTERVAL": 1,
+        # Size of buffer of written files, so they are written to OS by large writes
+        "WRITE_BUFFER_BYTES": 4 * 1024 ** 2,
+        # Bytes written between syncs of generated file to disk (0 - file is synced only when it is complete)
+        "FSYNC_BYTES": 64 * 1024 ** 2,
+        # Amount of subdirectories of csv_files, files of data sets are spread to by their pk
+        "DIRECTORY_SHARDS": 256,
+        # Levels of compression of generated files, by extensions of compressed files
+        "COMPRESSION_LEVELS": {
+            "gz": 6,
+            "bz2": 9,
+            "xz": 6,
+            "zst": 3,
+        },
+    },
+    "FILE_CACHE": {
+        "DIRECTORY": 'cache',
+        "MAX_SIZE": 10 * 1024 ** 3,
+    },
+    "QUEUE": {
+        "WORKERS": 2,
+        "MAX_JOBS_PER_USER": 2,
+        "POLL_INTERVAL": 1,
+        # Seconds between updates of data set in processing by its worker, and seconds without updates,
+        # after which data set is considered to be left by crashed worker and is recovered
+        "HEARTBEAT_INTERVAL": 30,
+        "STALE_AFTER": 300,
+        # Maximal amount of data sets, queued by one request of bulk generation
+        "MAX_BULK_JOBS": 100,
+    },
+    "DOWNLOAD": {
+        # Sending of files by web server: '' (files are sent by Django), 'x-accel-redirect' (nginx)
+        # or 'x-sendfile' (Apache mod_xsendfile, lighttpd)
+        "OFFLOAD": os.environ.get('DOWNLOAD_OFFLOAD', ''),
+        # Internal location of nginx, which is alias of MEDIA_ROOT
+        "OFFLOAD_URL": '/protected-media/',
+        # Under ASGI content of downloads is read in thread by parts of this size, and sent by async iterator
+        "ASYNC_PART_BYTES": 256 * 1024,
+    },
+    # Server-sent events of statuses of data sets
+    "EVENTS": {
+        # Seconds between queries of statuses of data sets of watched schema
+        "WATCH_INTERVAL": 1,
+        "HEARTBEAT_INTERVAL": 15,
+        "MAX_CONNECTION_SECONDS": 300,
+    },
 }
 
 if DEBUG:
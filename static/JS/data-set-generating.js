@@ -11,16 +11,39 @@ $(document).on('submit', '#post-form', function(event) {
             csrfmiddlewaretoken:$('input[name=csrfmiddlewaretoken]').val(),
             schema: schemaSlug,
             rows: $('#rows-amount').val(),
+            file_format: $('#file-format').val(),
+            compression: $('#compression').val(),
         },
         beforeSend: function() {
             insertIntoHTMLNewDataSetRow(dataSetRow);
         },
         success: function(response) {
-            updateDataSetStatus(dataSetRow, response.file_generated, response.data_set_id);
+            markDataSetProcessing(dataSetRow, response.data_set_id);
+        },
+        error: function() {
+            updateDataSetStatus(dataSetRow, false);
         },
     })
 })
 
+$(document).on('change', '#file-format', function() {
+    // Only csv files can be compressed
+    const isCSV = $(this).val() === 'csv';
+    if (!isCSV) {
+        $('#compression').val('');
+    }
+    $('#compression').prop('disabled', !isCSV);
+})
+
+function markDataSetProcessing(row, dataSetId) {
+    // Data set is generated in background, so it is tracked as well as ones, which were processing on page load
+    const status = row.querySelector('td:nth-child(3) span');
+    status.setAttribute('id', `processing-data-set-badge-id-${dataSetId}`);
+    status.classList.add('processing-data-set-badge');
+
+    trackProcessingStatuses();
+}
+
 function updateDataSetStatus(row, generated, dataSetId) {
     // Adding download link
     if (generated) {
@@ -52,7 +75,6 @@ function createNewDataSetRow() {
     const dataSetRow = document.createElement('tr');
 
     const rowStart = document.createElement('th');
-    rowStart.textContent = document.querySelectorAll('th.data-set-row').length + 1;
     rowStart.setAttribute('scope', 'row');
     rowStart.setAttribute('class', 'data-set-row');
 
@@ -77,8 +99,10 @@ function createNewDataSetRow() {
 }
 
 function insertIntoHTMLNewDataSetRow(block) {
+    // Data sets are listed from the newest one
     const tableBody = document.getElementById('data-sets-table-body');
-    tableBody.appendChild(block);
+    tableBody.prepend(block);
+    numberTableRows(tableBody);
 }
 
 function getTodayDate() {
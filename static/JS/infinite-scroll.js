@@ -0,0 +1,53 @@
+// Script is loading next pages of table, when user scrolls to its end.
+// Element #next-page keeps url of pages, id of table body and cursor of next page (empty, if there is no next page)
+
+const nextPage = document.getElementById('next-page');
+var nextPageLoading = false;
+
+if (nextPage !== null && nextPage.dataset.cursor) {
+    const nextPageObserver = new IntersectionObserver(function(entries) {
+        if (entries[0].isIntersecting) {
+            loadNextPage(nextPageObserver);
+        }
+    });
+    nextPageObserver.observe(nextPage);
+}
+
+function loadNextPage(observer) {
+    if (nextPageLoading || !nextPage.dataset.cursor) {
+        return;
+    }
+    nextPageLoading = true;
+
+    $.ajax({
+        type: 'GET',
+        url: nextPage.dataset.url,
+        data: {
+            cursor: nextPage.dataset.cursor,
+        },
+        success: function(response) {
+            const tableBody = document.getElementById(nextPage.dataset.table);
+            tableBody.insertAdjacentHTML('beforeend', response.rows);
+            numberTableRows(tableBody);
+            nextPage.dataset.cursor = response.next_cursor || '';
+
+            // Other scripts handle rows of loaded page as well
+            document.dispatchEvent(new Event('next-page-loaded'));
+        },
+        complete: function() {
+            nextPageLoading = false;
+            // Observing again, so next page is loaded, if end of table is still visible
+            observer.unobserve(nextPage);
+            if (nextPage.dataset.cursor) {
+                observer.observe(nextPage);
+            }
+        }
+    });
+}
+
+function numberTableRows(tableBody) {
+    const rowNumbers = tableBody.querySelectorAll('tr > th:first-child');
+    for (let i = 0; i < rowNumbers.length; i++) {
+        rowNumbers[i].textContent = i + 1;
+    }
+}
@@ -1,14 +1,57 @@
-// Script is tracking all data sets statuses, which was processing on moment when page was load
-// Data sets, which user creates on this page, after it was load - tracks script for creating those data sets
+// Script is tracking statuses of all processing data sets - ones, which was processing on moment when page was load,
+// and ones, which user creates on this page after it was load (script for creating those data sets restarts tracking)
+// Statuses are pushed by server-sent events, and only if events are unavailable - statuses are polled every second
+
+var periodicallyUpdate = null;
+var statusesCursor = null;
+var statusEvents = null;
+var statusEventsUnavailable = typeof EventSource === 'undefined';
 
 trackProcessingStatuses();
+document.addEventListener('next-page-loaded', trackProcessingStatuses);
 
 function trackProcessingStatuses() {
-    var periodicallyUpdate = setInterval(function() {
+    if (periodicallyUpdate !== null || statusEvents !== null || getAllProcessingDataSetIds().length === 0) {
+        return;
+    }
+
+    if (statusEventsUnavailable) {
+        pollProcessingStatuses();
+    } else {
+        listenProcessingStatuses();
+    }
+}
+
+function listenProcessingStatuses() {
+    statusEvents = new EventSource(dataSetsEventsUrl+`?schema=${schemaSlug}`);
+
+    statusEvents.onmessage = function(event) {
+        const statuses = JSON.parse(event.data);
+        setProcessingStatuses(getAllProcessingDataSetIds(), statuses.info, statuses.progress);
+
+        if (getAllProcessingDataSetIds().length === 0) {
+            statusEvents.close();
+            statusEvents = null;
+        }
+    };
+
+    statusEvents.onerror = function() {
+        // Browser reconnects by itself, unless server refused events (for example, it is not running under ASGI)
+        if (statusEvents.readyState === EventSource.CLOSED) {
+            statusEvents = null;
+            statusEventsUnavailable = true;
+            pollProcessingStatuses();
+        }
+    };
+}
+
+function pollProcessingStatuses() {
+    periodicallyUpdate = setInterval(function() {
         const processingDataSetIds = getAllProcessingDataSetIds()
 
         if (processingDataSetIds.length === 0) {
             clearInterval(periodicallyUpdate);
+            periodicallyUpdate = null;
         } else {
             updateProcessingStatusesFromServer(processingDataSetIds);
         }
@@ -16,16 +59,22 @@ function trackProcessingStatuses() {
 }
 
 function updateProcessingStatusesFromServer(processingIds) {
+    // Only statuses of tracked data sets, changed since the previous request, are returned
+    let url = getGeneratingDataSetIdsUrl+`?schema=${schemaSlug}&ids=${processingIds.join(',')}`;
+    if (statusesCursor !== null) {
+        url += `&since=${encodeURIComponent(statusesCursor)}`;
+    }
     $.ajax({
         type: 'GET',
-        url: getGeneratingDataSetIdsUrl+`?schema=${schemaSlug}`,
+        url: url,
         success: function(response) {
-            setProcessingStatuses(processingIds, response.info);
+            statusesCursor = response.cursor;
+            setProcessingStatuses(processingIds, response.info, response.progress);
         }
     });
 }
 
-function setProcessingStatuses(processingIds, finishedDataSetsServerData) {
+function setProcessingStatuses(processingIds, finishedDataSetsServerData, progressServerData) {
     for (let i = 0; i < processingIds.length; i++) {
         console.log(finishedDataSetsServerData)
         if ([processingIds[i]] in finishedDataSetsServerData) {
@@ -43,10 +92,26 @@ function setProcessingStatuses(processingIds, finishedDataSetsServerData) {
                 processingBadge.setAttribute('class', "badge text-bg-danger");
                 processingBadge.textContent = "Failed";
             }
+        } else if (progressServerData && [processingIds[i]] in progressServerData) {
+            let processingBadge = document.getElementById(`processing-data-set-badge-id-${processingIds[i]}`);
+            processingBadge.textContent = formatProgress(progressServerData[processingIds[i]]);
         }
     }
 }
 
+function formatProgress(progress) {
+    // Progress is known only after generating started, and ETA - after the first progress update
+    if (progress.percent === null || progress.rows_written === 0) {
+        return "Processing";
+    }
+    let text = `Processing ${Math.floor(progress.percent)}%`;
+    if (progress.eta !== null) {
+        const eta = Math.ceil(progress.eta);
+        text += eta >= 60 ? `, ${Math.floor(eta / 60)}m ${eta % 60}s left` : `, ${eta}s left`;
+    }
+    return text;
+}
+
 function getAllProcessingDataSetIds() {
     const processingBadges = document.querySelectorAll(".processing-data-set-badge");
     var dataSetIds = [];